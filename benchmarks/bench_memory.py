@@ -0,0 +1,58 @@
+"""
+measure the memory used per DataNode, in a session with 1 collector and several validators
+
+usage: python -m benchmarks.bench_memory [nr of data nodes] [nr of validators] [1 to use columnar results]
+
+for reference, 100k DataNodes & 3 validators on Python 3.11, in bytes per DataNode / incl. results:
+  before __slots__ & the indexes:  462 / 1454
+  now:                             327 / 1045, 327 / 561 with columnar results
+"""
+
+import sys
+import gc
+import logging
+import tracemalloc
+
+from datafix.core import Session, Collector, Validator
+
+
+class CollectNumbers(Collector):
+    count = 100_000
+
+    def collect(self):
+        return range(self.count)
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+def measure(count=100_000, validators=3, columnar_results=False) -> dict:
+    """returns the bytes allocated per DataNode, after collection and after validation"""
+    gc.collect()
+    tracemalloc.start()
+    session = Session()
+    session.columnar_results = bool(columnar_results)
+    collector = CollectNumbers(parent=session)
+    collector.count = count
+    for _ in range(validators):
+        ValidateEven(parent=session)
+
+    start = tracemalloc.get_traced_memory()[0]
+    collector.run()
+    collected = tracemalloc.get_traced_memory()[0]
+    session.run()
+    validated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "bytes per DataNode": (collected - start) / count,
+        "bytes per DataNode, incl. results": (validated - start) / count,
+    }
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)  # half the data fails, don't measure the logging
+    args = [int(arg) for arg in sys.argv[1:]]
+    for key, value in measure(*args).items():
+        print(f"{key}: {value:.0f}")
@@ -0,0 +1,284 @@
+"""
+benchmark the core engine on synthetic sessions, and compare the results to a saved baseline
+
+measures per scenario: the throughput of a session run (validations per second), the peak memory of a run,
+and the time to create the report. a scenario is a session with N DataNodes and M validators,
+with or without adapters, and a ratio of failing validations
+
+usage:
+python -m benchmarks.suite run [--preset quick|full] [--save NAME] [--repeat 3] [--no-memory]
+python -m benchmarks.suite compare BASELINE [CURRENT] [--threshold 10] [--repeat 3]
+
+baselines are saved in benchmarks/baselines/NAME.json, BASELINE & CURRENT are names or paths of saved results.
+compare exits with code 1 if a metric regressed more than the threshold percentage
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import datetime
+import tracemalloc
+from typing import NamedTuple
+
+from datafix.core import Session, Collector, Validator, Adapter
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# metric -> True if higher is better
+METRICS = {
+    "throughput": True,  # validations per second in a session run
+    "run_time": False,  # seconds
+    "report_time": False,  # seconds to create session.report()
+    "peak_memory": False,  # bytes allocated at the peak of a run, incl. the collected DataNodes & results
+}
+
+
+class Scenario(NamedTuple):
+    data_nodes: int
+    validators: int
+    adapters: bool = False  # if True, validators adapt the collected data to the type they validate
+    fail_ratio: float = 0.0  # the ratio of validations that fail
+
+    @property
+    def name(self) -> str:
+        name = f"{self.data_nodes}x{self.validators}"
+        if self.adapters:
+            name += "-adapters"
+        return f"{name}-fail{self.fail_ratio:g}"
+
+
+PRESETS = {
+    "quick": [
+        Scenario(1_000, 1),
+        Scenario(1_000, 10),
+        Scenario(1_000, 10, adapters=True),
+        Scenario(1_000, 10, fail_ratio=0.5),
+        Scenario(10_000, 1),
+        Scenario(10_000, 10, adapters=True, fail_ratio=0.1),
+    ],
+}
+PRESETS["full"] = PRESETS["quick"] + [
+    Scenario(1_000, 100),
+    Scenario(1_000, 100, adapters=True, fail_ratio=0.5),
+    Scenario(100_000, 10),
+    Scenario(100_000, 10, adapters=True, fail_ratio=0.1),
+    Scenario(1_000_000, 1),
+    Scenario(1_000_000, 1, adapters=True, fail_ratio=0.5),
+]
+
+
+class Item:
+    """collected data that needs an adapter to validate it"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class ItemToInt(Adapter):
+    input_types = [Item]
+    type_output = int
+
+    def adapt(self, data):
+        return data.value
+
+
+class CollectItems(Collector):
+    count = 1000
+    adapters = False
+
+    def collect(self):
+        if self.adapters:
+            return [Item(value) for value in range(self.count)]
+        return range(self.count)
+
+
+class ValidateItems(Validator):
+    required_type = int
+    fail_below = 0  # data fails if data % 1000 is below this
+
+    def validate(self, data):
+        assert data % 1000 >= self.fail_below
+
+
+def create_session(scenario: Scenario) -> Session:
+    session = Session()
+    if scenario.adapters:
+        session.register_adapter(ItemToInt())
+    collector = session.append(CollectItems)
+    collector.count = scenario.data_nodes
+    collector.adapters = scenario.adapters
+    for _ in range(scenario.validators):
+        validator = session.append(ValidateItems)
+        validator.fail_below = round(scenario.fail_ratio * 1000)
+    return session
+
+
+def measure(scenario: Scenario, repeat: int = 3, memory: bool = True) -> dict:
+    """run the scenario, returns the metrics. times are the fastest of several runs, to reduce noise"""
+    run_times = []
+    report_times = []
+    for _ in range(repeat):
+        session = create_session(scenario)
+        gc.collect()
+        start = time.perf_counter()
+        session.run()
+        run_times.append(time.perf_counter() - start)
+        validations = _count_validations(session)
+        start = time.perf_counter()
+        session.report()
+        report_times.append(time.perf_counter() - start)
+        del session
+
+    metrics = {
+        # the validations that ran, not the expected nr. e.g. a version without adapters doesn't validate
+        # the data of an adapter scenario, which isn't faster
+        "validations": validations,
+        "throughput": validations / min(run_times),
+        "run_time": min(run_times),
+        "report_time": min(report_times),
+    }
+    if memory:
+        # tracemalloc slows the run down, so measure memory in a separate run
+        session = create_session(scenario)
+        gc.collect()
+        tracemalloc.start()
+        session.run()
+        metrics["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return metrics
+
+
+def _count_validations(session: Session) -> int:
+    """the nr of results the validators created in a session run"""
+    return sum(len(node.children) for node in session.children if isinstance(node, Validator))
+
+
+def run(scenarios: "list[Scenario]", repeat: int = 3, memory: bool = True, output=None) -> dict:
+    """measure all scenarios, returns the results to save as a baseline"""
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = metrics = measure(scenario, repeat=repeat, memory=memory)
+        print(f"{scenario.name}: {_format_metrics(metrics)}", file=output)
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 10.0, output=None) -> "list[str]":
+    """
+    compare the metrics of the scenarios in both results, and print the change of each metric.
+    returns the regressions: metrics that got worse by more than threshold percent
+    """
+    regressions = []
+    for name, metrics in current["scenarios"].items():
+        baseline_metrics = baseline["scenarios"].get(name)
+        if baseline_metrics is None:
+            print(f"{name}: not in the baseline", file=output)
+            continue
+        validations = metrics.get("validations")
+        baseline_validations = baseline_metrics.get("validations")
+        if validations is not None and baseline_validations is not None and validations != baseline_validations:
+            # e.g. adapter scenarios in a version without adapters, the times measure different work
+            print(
+                f"{name}: not comparable, {validations} validations, {baseline_validations} in the baseline",
+                file=output,
+            )
+            continue
+        changes = []
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or not baseline_metrics.get(metric):
+                continue
+            change = (metrics[metric] / baseline_metrics[metric] - 1) * 100
+            changes.append(f"{metric} {change:+.1f}%")
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+        print(f"{name}: {', '.join(changes)}", file=output)
+    return regressions
+
+
+def _format_metrics(metrics: dict) -> str:
+    txt = f"{metrics['throughput']:,.0f} validations/s, run {metrics['run_time']:.3f}s, "
+    txt += f"report {metrics['report_time']:.3f}s"
+    if "peak_memory" in metrics:
+        txt += f", peak memory {metrics['peak_memory'] / 2**20:.1f} MiB"
+    return txt
+
+
+def _results_path(name_or_path: str) -> str:
+    if os.path.exists(name_or_path) or name_or_path.endswith(".json"):
+        return name_or_path
+    return os.path.join(BASELINE_DIR, name_or_path + ".json")
+
+
+def load(name_or_path: str) -> dict:
+    with open(_results_path(name_or_path)) as file:
+        return json.load(file)
+
+
+def save(results: dict, name_or_path: str) -> str:
+    path = _results_path(name_or_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    return path
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    run_parser.add_argument("--save", metavar="NAME", help="save the results as a baseline")
+    run_parser.add_argument("--repeat", type=int, default=3, help="nr of runs per scenario, the fastest counts")
+    run_parser.add_argument("--no-memory", action="store_true", help="don't measure the peak memory, it's slow")
+    compare_parser = commands.add_parser("compare", help="compare results to a baseline")
+    compare_parser.add_argument("baseline", help="name or path of the baseline")
+    compare_parser.add_argument("current", nargs="?", help="name or path of the results, runs the benchmarks if empty")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="max regression in percent")
+    compare_parser.add_argument("--repeat", type=int, default=3, help="nr of runs per scenario, if it runs them")
+    args = parser.parse_args(args)
+
+    logging.disable(logging.CRITICAL)  # failing validations log errors, don't measure the logging
+    try:
+        return _run_command(args)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run_command(args) -> int:
+    if args.command == "run":
+        results = run(PRESETS[args.preset], repeat=args.repeat, memory=not args.no_memory)
+        if args.save:
+            print(f"saved {save(results, args.save)}")
+        return 0
+
+    baseline = load(args.baseline)
+    if args.current:
+        current = load(args.current)
+    else:
+        # run the scenarios in the baseline
+        presets = {scenario.name: scenario for scenarios in PRESETS.values() for scenario in scenarios}
+        scenarios = [presets[name] for name in baseline["scenarios"] if name in presets]
+        memory = any("peak_memory" in metrics for metrics in baseline["scenarios"].values())
+        current = run(scenarios, repeat=args.repeat, memory=memory)
+    regressions = compare(baseline, current, threshold=args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressions: " + ", ".join(regressions))
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,3 +6,12 @@ from datafix.core.resultnode import ResultNode
 from datafix.core.datanode import DataNode
 from datafix.core.action import Action
 from datafix.core.adapter import Adapter
+from datafix.core.executor import Executor, ThreadExecutor, ProcessExecutor
+from datafix.core.scheduler import DependencyCycleError
+from datafix.core.cache import ResultCache, SqliteResultCache, AdaptedDataCache
+from datafix.core.resultstore import ResultStore, ResultList
+from datafix.core.async_nodes import AsyncCollector, AsyncValidator
+from datafix.core.profile import Profile, NodeProfile
+from datafix.core.trace import Tracer
+from datafix.core.report import ReportWriter
+from datafix.core.failure import ValidationError, FailureRecord, FailureTable
@@ -6,12 +6,10 @@ class Action(Node):
     An Action is a Node that can run a method, and saves the result
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ()
 
-        # hack remove from parent children, to prevent infinite recursion bug
-        if self.parent:
-            self.parent.children.remove(self)
+    # an action isn't added to the parent's children, to prevent infinite recursion bug
+    _is_child = False
 
     def run(self):
         with self.node_state_setter():
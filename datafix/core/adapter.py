@@ -35,6 +35,8 @@
 # from datafix.datanode import DataNode
 # from datafix.resultnode import ResultNode
 
+import collections
+
 
 class Adapter:
     # when we run on another node, sometimes we expect input of a certain type.
@@ -49,12 +51,61 @@ class Adapter:
         """the logic that adapts the data to another type, override this"""
         raise NotImplementedError()
 
+    def adapt_many(self, datas: list) -> list:
+        """
+        optional, override this to adapt many data in 1 go, e.g. load 1000 files or query a DCC in 1 call.
+        returns a list with the adapted data, in the same order. by default calls adapt() for each data
+        """
+        return [self.adapt(data) for data in datas]
+
     def run(self, data):
         return self.adapt(data)
 
+    def run_many(self, datas: list) -> list:
+        adapted_datas = list(self.adapt_many(datas))
+        if len(adapted_datas) != len(datas):
+            raise ValueError(f"adapt_many returned {len(adapted_datas)} results for {len(datas)} data")
+        return adapted_datas
+
     # input: instance(wrapper?)
     # output: int
 
 
+def find_adapter_chain(adapters: "list[Adapter]", input_type: type, output_type: type) -> "tuple[Adapter]|None":
+    """
+    find the shortest chain of adapters that converts data of input_type to output_type, e.g. str -> int -> Mesh
+    an adapter also adapts subclasses of its input types, adapters of the most specific type are preferred.
+    returns an empty tuple if the data doesn't need adapting, or None if there is no chain
+    """
+    if issubclass(input_type, output_type):
+        return ()
+    chains = {input_type: ()}  # type -> shortest chain from input_type to this type
+    queue = collections.deque([input_type])  # breadth first, so the first chain found is the shortest
+    while queue:
+        data_type = queue.popleft()
+        for adapter in _iter_matching_adapters(adapters, data_type):
+            adapted_type = adapter.type_output
+            if adapted_type is None or adapted_type in chains:
+                continue
+            chain = chains[data_type] + (adapter,)
+            if issubclass(adapted_type, output_type):
+                return chain
+            chains[adapted_type] = chain
+            queue.append(adapted_type)
+    return None
+
+
+def _iter_matching_adapters(adapters: "list[Adapter]", data_type: type):
+    """yield the adapters that accept data_type, adapters of the most specific type in its MRO first"""
+    mro = data_type.__mro__
+    matches = []
+    for order, adapter in enumerate(adapters):
+        ranks = [mro.index(input_type) for input_type in adapter.input_types or () if input_type in mro]
+        if ranks:
+            matches.append((min(ranks), order, adapter))
+    for rank, order, adapter in sorted(matches, key=lambda match: match[:2]):
+        yield adapter
+
+
 # class AdapterBrain(object):
 #     def __init__(self):
@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from datafix.core.collector import Collector
+from datafix.core.datanode import DataNode
+from datafix.core.validator import Validator, _PENDING, _SKIPPED
+
+
+def _run_sync(coroutine):
+    """run a coroutine from sync code, in another thread if this thread already runs an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+def _get_semaphore(node) -> asyncio.Semaphore:
+    """a semaphore for a node that runs on its own, limited by the session's max_concurrency"""
+    return asyncio.Semaphore(getattr(node.session, "max_concurrency", 100))
+
+
+class AsyncCollector(Collector):
+    """
+    a collector with an async collect(), e.g. to query a server without blocking the other nodes.
+    await session.arun() collects concurrently with the other async nodes, session.run() waits for it
+    """
+
+    async def collect(self):
+        """
+        returns a list of data, each list item is then automatically stored in a DataNode
+        can also be an async generator that yields the data
+        """
+        raise NotImplementedError  # override this with your implementation
+
+    def _iter_run(self, *args, **kwargs):
+        _run_sync(self._arun())
+        yield from self.data_nodes
+
+    async def _arun(self, semaphore: "Optional[asyncio.Semaphore]" = None):
+        semaphore = semaphore or _get_semaphore(self)
+        self.delete_children()
+        with self.node_state_setter():
+            async with semaphore:
+                result = self.collect()
+                if inspect.isawaitable(result):
+                    result = await result
+                if hasattr(result, "__aiter__"):
+                    result = [data_item async for data_item in result]
+            for data_item in result:
+                DataNode(data=data_item, parent=self, name=data_item)
+
+
+class AsyncValidator(Validator):
+    """
+    a validator with an async validate(), e.g. to check files on a server.
+    validates all DataNodes concurrently, up to the session's max_concurrency at the same time.
+    results are still saved in collection order, and failures behave the same as a serial run
+    """
+
+    async def validate(self, data):
+        """the logic to validate the data, override this"""
+        raise NotImplementedError()
+
+    def run(self):
+        _run_sync(self._arun())
+
+    def _adapt_and_validate_data_node(self, data_node):
+        adapted_data = self.session.adapt_data_node(data_node, self.required_type)
+        return _run_sync(self.validate(adapted_data))
+
+    async def _aget_validation_error(self, data_node, semaphore: asyncio.Semaphore):
+        """validate the data in a DataNode, returns the raised exception, or None if it passed"""
+        async with semaphore:
+            if self._is_stopped:
+                return _SKIPPED
+            try:
+                adapted_data = self.session.adapt_data_node(data_node, self.required_type)
+                await self.validate(adapted_data)
+            except Exception as e:
+                self._stop_if_fail_fast()
+                return e
+        return None
+
+    async def _arun(self, semaphore: "Optional[asyncio.Semaphore]" = None):
+        semaphore = semaphore or _get_semaphore(self)
+        self.delete_children()
+        entries = [(data_node, self._get_cached_outcome(data_node)) for data_node in self._iter_data_nodes()]
+        outcomes = await asyncio.gather(
+            *(
+                self._aget_validation_error(data_node, semaphore)
+                for data_node, outcome in entries
+                if outcome is _PENDING
+            )
+        )
+        for result_node in self._iter_result_nodes(entries, outcomes):
+            ...
+        self._set_state_from_results()
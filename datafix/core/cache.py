@@ -0,0 +1,285 @@
+import time
+import json
+import hashlib
+import collections
+import inspect
+import sqlite3
+import threading
+from typing import Optional, TYPE_CHECKING
+from datafix.core.node import NodeState
+from datafix.core.failure import FailureRecord
+
+if TYPE_CHECKING:
+    from datafix.core.validator import Validator
+    from datafix.core.datanode import DataNode
+
+
+_source_hashes = {}  # validator class -> hash of its source code
+
+
+def _get_source_hash(validator_class) -> "Optional[str]":
+    """hash the source code of a validator class, so cached results are ignored when the code changes"""
+    if validator_class not in _source_hashes:
+        try:
+            source = inspect.getsource(validator_class)
+            _source_hashes[validator_class] = hashlib.sha1(source.encode()).hexdigest()
+        except (OSError, TypeError):
+            # e.g. a class defined in an interactive session
+            _source_hashes[validator_class] = None
+    return _source_hashes[validator_class]
+
+
+class ResultCache:
+    """
+    remembers the state & failure record of previous validations, keyed by the validator class, version &
+    source code, and the fingerprint of the DataNode,
+    so an incremental session run can skip DataNodes that didn't change since the last run.
+
+    DataNodes without a fingerprint are never cached.
+    the default cache is stored in memory, see SqliteResultCache to reuse results in a new process.
+    """
+
+    def __init__(self):
+        self._states = {}  # key -> (state, failure record or None)
+        self._lock = threading.Lock()  # validators can run in parallel
+        self.hits = 0  # nr of results served from the cache, since the last reset_stats
+        self.misses = 0
+
+    @staticmethod
+    def key(validator: "Validator", data_node: "DataNode") -> "Optional[tuple]":
+        """returns the cache key of a validation, or None if the DataNode has no fingerprint"""
+        fingerprint = data_node.fingerprint
+        if fingerprint is None:
+            return None
+        validator_class = type(validator)
+        return (
+            f"{validator_class.__module__}.{validator_class.__qualname__}",
+            validator_class.version,
+            _get_source_hash(validator_class),
+            fingerprint,
+        )
+
+    def get(self, validator: "Validator", data_node: "DataNode") -> "Optional[NodeState]":
+        """returns the cached state of the validation, or None if it's not cached"""
+        result = self.get_result(validator, data_node)
+        return None if result is None else result[0]
+
+    def get_result(
+        self, validator: "Validator", data_node: "DataNode"
+    ) -> "Optional[tuple[NodeState, Optional[FailureRecord]]]":
+        """returns the cached (state, failure record) of the validation, or None if it's not cached"""
+        key = self.key(validator, data_node)
+        if key is None:
+            return None
+        with self._lock:
+            result = self._get_result(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def set(
+        self, validator: "Validator", data_node: "DataNode", state: NodeState, failure: "Optional[FailureRecord]" = None
+    ):
+        """cache the state of a validation, and why it failed, see ResultNode.failure"""
+        key = self.key(validator, data_node)
+        if key is None:
+            return
+        with self._lock:
+            self._set_result(key, state, failure)
+
+    def _get_result(self, key) -> "Optional[tuple[NodeState, Optional[FailureRecord]]]":
+        """override to store the cache elsewhere"""
+        return self._states.get(key)
+
+    def _set_result(self, key, state: NodeState, failure: "Optional[FailureRecord]"):
+        """override to store the cache elsewhere"""
+        self._states[key] = state, failure
+
+    def flush(self):
+        """save any pending changes, called at the end of a session run"""
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self._states)
+
+
+class SqliteResultCache(ResultCache):
+    """
+    a result cache saved in a SQLite database, so a new process (CI job, restarted DCC) can reuse results.
+    several processes can safely share the same database file.
+
+    path: the database file, created if it doesn't exist
+    max_age: remove results older than this, in seconds. None keeps results forever
+    max_entries: keep only the newest results. None keeps all results
+
+    the payload of a failure record is saved as JSON, e.g. a tuple is loaded as a list,
+    values that JSON doesn't support are saved as their repr
+    """
+
+    timeout = 30  # seconds to wait for another process that's writing to the database
+
+    def __init__(self, path, max_age: "Optional[float]" = None, max_entries: "Optional[int]" = None):
+        super().__init__()
+        self.path = str(path)
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._pending = {}  # results are written in 1 transaction on flush, instead of 1 per result
+
+        # we lock ourselves, so the connection can be shared between threads
+        self._connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+        )
+        # write-ahead logging lets other processes read while we write
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, state TEXT NOT NULL, time REAL NOT NULL, "
+            "message TEXT, exception_type TEXT, payload TEXT, truncated INTEGER)"
+        )
+        self._add_failure_columns()
+        self.evict()
+
+    def _add_failure_columns(self):
+        """add the failure columns to a database created before they existed"""
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(results)")}
+        for column, column_type in (
+            ("message", "TEXT"),
+            ("exception_type", "TEXT"),
+            ("payload", "TEXT"),
+            ("truncated", "INTEGER"),
+        ):
+            if column not in columns:
+                try:
+                    self._connection.execute(f"ALTER TABLE results ADD COLUMN {column} {column_type}")
+                except sqlite3.OperationalError:
+                    pass  # another process added it first
+
+    @staticmethod
+    def _hash_key(key) -> str:
+        # fingerprints are hashable, but not always the same after a restart, so we store their repr
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _get_result(self, key) -> "Optional[tuple[NodeState, Optional[FailureRecord]]]":
+        key = self._hash_key(key)
+        result = self._pending.get(key)
+        if result is not None:
+            return result
+        row = self._connection.execute(
+            "SELECT state, message, exception_type, payload, truncated FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        state, message, exception_type, payload, truncated = row
+        failure = None
+        if message is not None:
+            payload = None if payload is None else json.loads(payload)
+            failure = FailureRecord(message, exception_type, payload, bool(truncated))
+        return NodeState(state), failure
+
+    def _set_result(self, key, state: NodeState, failure: "Optional[FailureRecord]"):
+        self._pending[self._hash_key(key)] = state, failure
+
+    @staticmethod
+    def _row(key: str, state: NodeState, failure: "Optional[FailureRecord]", now: float) -> tuple:
+        if failure is None:
+            return key, state.value, now, None, None, None, None
+        payload = None if failure.payload is None else json.dumps(failure.payload, default=repr)
+        return key, state.value, now, failure.message, failure.exception_type, payload, int(failure.truncated)
+
+    def flush(self):
+        """write all pending results to the database, and evict old results"""
+        with self._lock:
+            if self._pending:
+                now = time.time()
+                rows = [self._row(key, state, failure, now) for key, (state, failure) in self._pending.items()]
+                # BEGIN IMMEDIATE locks the database for writing, other processes wait up to self.timeout
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO results (key, state, time, message, exception_type, payload, truncated)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    self._connection.execute("COMMIT")
+                except Exception:
+                    self._connection.execute("ROLLBACK")
+                    raise
+                self._pending.clear()
+        self.evict()
+
+    def evict(self):
+        """remove results older than max_age, and the oldest results above max_entries"""
+        with self._lock:
+            if self.max_age is not None:
+                self._connection.execute("DELETE FROM results WHERE time < ?", (time.time() - self.max_age,))
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY time DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._connection.execute("DELETE FROM results")
+        self.reset_stats()
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+    def __len__(self):
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class AdaptedDataCache:
+    """
+    remembers the adapted data per (DataNode, required type) during a session run,
+    so validators that require the same type don't adapt the same DataNode again.
+    keeps the most recently used values, up to max_entries
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._values = collections.OrderedDict()  # (data_node, required type) -> adapted data, least recent first
+        self._lock = threading.Lock()  # validators can run in parallel
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data_node: "DataNode", required_type: type, default=None):
+        """returns the adapted data, or default if it's not cached"""
+        key = data_node, required_type
+        with self._lock:
+            try:
+                value = self._values[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, data_node: "DataNode", required_type: type, adapted_data):
+        key = data_node, required_type
+        with self._lock:
+            self._values[key] = adapted_data
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)  # evict the least recently used
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
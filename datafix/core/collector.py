@@ -1,5 +1,6 @@
+from typing import Generator
 from datafix.core.node import Node
-from datafix.core.datanode import DataNode
+from datafix.core.datanode import DataNode, default_fingerprint
 from datafix.core.action import Run
 
 
@@ -23,11 +24,21 @@ class Collector(Node):  # session plugin (context), session is a node
         return [n for n in self.children if isinstance(n, DataNode)]
 
     def run(self, *args, **kwargs):
+        for data_node in self._iter_run(*args, **kwargs):
+            ...
+
+    def _iter_run(self, *args, **kwargs) -> "Generator[DataNode]":
+        """run the collector, and yield each DataNode as soon as it's created"""
         self.delete_children()
         with self.node_state_setter():
             result = self.collect(*args, **kwargs)
             for data_item in result:
-                DataNode(data=data_item, parent=self, name=data_item)
+                yield DataNode(data_item, self, data_item)  # positional arguments, created per data item
+
+    @property
+    def _supports_streaming(self) -> bool:
+        """True if we can yield the DataNodes 1 by 1 while they are collected, see Session.stream"""
+        return type(self).run is Collector.run
 
     @property
     def data_type(self):
@@ -39,6 +50,16 @@ class Collector(Node):  # session plugin (context), session is a node
             return type(self.data_nodes[0].data)
         return None
 
+    def fingerprint(self, data):
+        """
+        returns a hashable value that changes when the collected data changes, or None if unknown.
+        override to support incremental runs for your data, e.g. return a mesh's dirty-counter
+        """
+        return default_fingerprint(data)
+
     def collect(self):  # create instances node(s)
-        """returns a list of data, each list item is then automatically stored in a DataNode"""
+        """
+        returns a list of data, each list item is then automatically stored in a DataNode
+        can also be a generator that yields the data, to avoid loading all data in memory at once
+        """
         raise NotImplementedError  # override this with your implementation
@@ -1,4 +1,20 @@
-from datafix.core.node import Node, NodeState
+import os
+from pathlib import PurePath
+from datafix.core.node import Node, _state_lock, _count_state, _INIT, _SUCCEED, _FAIL, _WARNING
+
+
+def default_fingerprint(data):
+    """
+    returns a fingerprint for data of a known type, or None if the type is unknown.
+    a path's fingerprint changes when the file is modified, based on the modification time & size
+    """
+    if isinstance(data, PurePath):
+        try:
+            stat = os.stat(data)
+        except OSError:
+            return str(data), None, None  # the file doesn't exist
+        return str(data), stat.st_mtime_ns, stat.st_size
+    return None
 
 
 class DataNode(Node):
@@ -8,10 +24,77 @@ class DataNode(Node):
     DataNodes are not runnable, but can have actions, e.g. 'select mesh'
     """
 
-    def __init__(self, data, *args, **kwargs):
+    __slots__ = ("data", "_result_nodes", "_result_state_counts", "_fingerprint", "_adapted_data")
+
+    def __init__(self, data, parent: "Node|None" = None, name=None):
         self.data = data  # custom data saved in the node
-        self.result_nodes = []  # result nodes created by the validator(s) that ran on this node
-        super().__init__(*args, **kwargs)
+        self._result_nodes = None  # see self.result_nodes
+        self._result_state_counts = None  # FAIL/WARNING -> nr of result nodes in that state, created on the 1st
+        self._fingerprint = None
+        self._adapted_data = None  # required type -> adapted data, see Session.keep_adapted_data
+        # a collector creates a DataNode per data item, so set the node attributes here instead of in Node.__init__
+        self._state = _INIT
+        self._warning = False
+        self._actions = None
+        self._children = None
+        self._child_actions = None
+        self._name = str(name) if name else self.__class__.__name__
+        self.parent = None
+        if parent:
+            self._add_to_parent(parent)
+
+        # register in the session, so validators can quickly find DataNodes by type
+        index = getattr(self.session, "_data_node_index", None)
+        if index is not None:
+            index.add(self)
+
+    def delete(self):
+        index = getattr(self.session, "_data_node_index", None)
+        if index is not None:
+            index.remove(self)
+        super().delete()
+
+    @property
+    def result_nodes(self) -> list:
+        """result nodes created by the validator(s) that ran on this node"""
+        result_store = getattr(self.session, "result_store", None)
+        if result_store is not None and self in result_store:
+            # results saved in columns are created on access, see Session.columnar_results
+            return list(self._result_nodes or ()) + result_store.result_nodes(self)
+        return self._result_nodes_list()
+
+    @result_nodes.setter
+    def result_nodes(self, result_nodes: list):
+        self._result_nodes = result_nodes
+
+    def _result_nodes_list(self) -> list:
+        """the result nodes saved on this node"""
+        if self._result_nodes is None:
+            self._result_nodes = []
+        return self._result_nodes
+
+    def adapt(self, required_type: type):
+        """
+        returns the data adapted to the required type, e.g. for an action that needs a Mesh.
+        reuses the data adapted by validators if the session keeps adapted data, see Session.keep_adapted_data
+        """
+        return self.session.adapt_data_node(self, required_type)
+
+    @property
+    def fingerprint(self):
+        """
+        a hashable value that changes when the data changes, or None if unknown.
+        used to reuse the validation results of unchanged data in incremental runs.
+        by default the collector that created this node creates the fingerprint, see Collector.fingerprint
+        """
+        if self._fingerprint is None:
+            fingerprint = getattr(self.parent, "fingerprint", default_fingerprint)
+            self._fingerprint = fingerprint(self.data)
+        return self._fingerprint
+
+    @fingerprint.setter
+    def fingerprint(self, fingerprint):
+        self._fingerprint = fingerprint
 
     @property
     def state(self):
@@ -19,19 +102,56 @@ class DataNode(Node):
         # creating resultNode(s) with the validation result saved in the state
         # this node fails if any result nodes failed
 
-        result_nodes = [node for node in self.result_nodes]
-        result_nodes_states = [node.state for node in result_nodes]
+        # the result nodes keep the counts up to date, so we don't check every result node
+        result_nodes_states = self._result_state_counts
+        if not result_nodes_states:
+            return _SUCCEED
 
-        if NodeState.FAIL in result_nodes_states:
-            return NodeState.FAIL
-        elif NodeState.WARNING in result_nodes_states:
-            return NodeState.WARNING
+        if _FAIL in result_nodes_states:
+            return _FAIL
+        elif _WARNING in result_nodes_states:
+            return _WARNING
         else:
-            return NodeState.SUCCEED
+            return _SUCCEED
 
     @state.setter
     def state(self, state):
         pass
 
+    def _add_result_node(self, result_node):
+        # list.append is atomic, only the list of the 1st result is created with the lock
+        result_nodes = self._result_nodes
+        if result_nodes is None:
+            with _state_lock:
+                result_nodes = self._result_nodes_list()
+        result_nodes.append(result_node)
+        state = result_node.state
+        if state is _FAIL or state is _WARNING:  # see _count_result_state
+            self._count_result_state(state, 1)
+
+    def _remove_result_node(self, result_node):
+        with _state_lock:
+            self._result_nodes_list().remove(result_node)
+            self._count_result_state(result_node.state, -1)
+
+    def _result_state_changed(self, old_result_state, new_result_state):
+        """called by a result node when its state changed"""
+        self._count_result_state(old_result_state, -1)
+        self._count_result_state(new_result_state, 1)
+
+    def _count_result_state(self, state, amount: int):
+        """count a result node that was added or removed, and notify the parent if our state changed"""
+        if state is not _FAIL and state is not _WARNING:
+            return  # only failed & warning results change our state, see self.state
+        with _state_lock:
+            state_counts = self._result_state_counts
+            if state_counts is None:
+                state_counts = self._result_state_counts = {}
+            old_state = self.state
+            _count_state(state_counts, state, amount)
+            if amount > 0 and old_state is _FAIL:
+                return  # another failed result, we still fail
+            self._state_changed(old_state)
+
     def __str__(self):
         return f"DataNode({self.data})"
@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class Executor:
+    """
+    An Executor runs a function on a list of items, and returns the results in the same order as the items.
+    The default Executor runs everything serially in the current thread.
+
+    assign an executor to a session to run its validators concurrently
+    > session.executor = ThreadExecutor(max_workers=8)
+    """
+
+    # True if the work runs in another process,
+    # the function and the items then need to be picklable
+    processes = False
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers  # None lets the pool decide, usually based on the cpu count
+
+    def map(self, fn, items) -> list:
+        """run fn on each item, returns a list of results in the same order as the items"""
+        return [fn(item) for item in items]
+
+
+class ThreadExecutor(Executor):
+    """run work in a thread pool, great for I/O bound validators"""
+
+    def map(self, fn, items) -> list:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, items))
+
+
+class ProcessExecutor(Executor):
+    """
+    run work in a process pool, to run CPU bound validators on multiple cores.
+    only the validator class & settings, and the (adapted) data are sent to the worker processes,
+    so validators that override run() or need the session still run in the main process.
+    the workers send back an outcome per data, failures as compact FailureRecords.
+    data that can't be pickled, e.g. objects of a DCC, is validated in the main process with a warning
+    """
+
+    processes = True
+
+    def map(self, fn, items) -> list:
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, items))
@@ -0,0 +1,244 @@
+"""
+export the results of a session for dashboards & CI, as JSON Lines, Apache Arrow / Parquet, or JUnit XML.
+the exporters walk the session tree & write while walking, so the results aren't held in memory twice.
+"""
+
+import os
+import json
+from contextlib import contextmanager
+from typing import Generator, Optional, TYPE_CHECKING
+from xml.sax.saxutils import escape, quoteattr
+from datafix.core.node import NodeState
+from datafix.core.collector import Collector
+from datafix.core.validator import Validator
+from datafix.core.datanode import DataNode
+from datafix.core.resultnode import ResultNode
+
+if TYPE_CHECKING:
+    from datafix.core.node import Node
+    from datafix.core.session import Session
+
+
+# the fields of an exported record, a record is a flat dict so it fits in a table
+FIELDS = (
+    "id",  # a unique int per node in the export
+    "kind",  # session, collector, validator, data_node, result or node
+    "name",
+    "parent_id",
+    "state",  # the NodeState value, e.g. 'fail'
+    "data_node_id",  # the id of the validated DataNode, for results
+    "message",  # the error of a failed result, if the result saved it, see ResultNode.failure
+    "exception_type",  # the class name of the error, e.g. 'AssertionError'
+    "wall_time",  # seconds the node took in the last run, if the session profiled it, see Session.profile
+    "cpu_time",
+)
+
+# file extension -> format
+FORMATS = {".jsonl": "jsonl", ".json": "jsonl", ".parquet": "parquet", ".arrow": "arrow", ".xml": "junit"}
+
+
+def _kind(node: "Node") -> str:
+    if isinstance(node, ResultNode):
+        return "result"
+    if isinstance(node, DataNode):
+        return "data_node"
+    if isinstance(node, Validator):
+        return "validator"
+    if isinstance(node, Collector):
+        return "collector"
+    if node.parent is None:
+        return "session"
+    return "node"
+
+
+def _message(node: "Node") -> "Optional[str]":
+    """the error message saved on a result"""
+    message = getattr(node, "message", None)
+    return None if message is None else str(message)
+
+
+def _exception_type(node: "Node") -> "Optional[str]":
+    failure = getattr(node, "failure", None)
+    return None if failure is None else failure.exception_type
+
+
+def iter_records(session: "Session") -> "Generator[dict]":
+    """yield a record for each node in the session, parents before their children, see FIELDS"""
+    # only DataNodes keep their id, to link the results to them. children get their parent's id from the stack
+    data_node_ids = {}
+    next_id = 0
+
+    def get_id(node):
+        nonlocal next_id
+        node_id = data_node_ids.get(node)
+        if node_id is None:
+            node_id = next_id
+            next_id += 1
+            if isinstance(node, DataNode):
+                data_node_ids[node] = node_id
+        return node_id
+
+    profile = getattr(session, "profile", None)
+    stack = [(session, None)]
+    while stack:
+        node, parent_id = stack.pop()
+        node_id = get_id(node)
+        node_profile = profile.get(node) if profile is not None else None
+        data_node = getattr(node, "data_node", None)
+        yield {
+            "id": node_id,
+            "kind": _kind(node),
+            "name": node.name,
+            "parent_id": parent_id,
+            "state": node.state.value,
+            "data_node_id": get_id(data_node) if data_node is not None else None,
+            "message": _message(node),
+            "exception_type": _exception_type(node),
+            "wall_time": node_profile.wall_time if node_profile is not None else None,
+            "cpu_time": node_profile.cpu_time if node_profile is not None else None,
+        }
+        if node._children:
+            # reversed on the stack, so children are exported in order
+            stack.extend((child, node_id) for child in reversed(node._children))
+
+
+@contextmanager
+def _open(path_or_stream, mode="w"):
+    """open a path, or use an open stream"""
+    if hasattr(path_or_stream, "write"):
+        yield path_or_stream
+    else:
+        with open(path_or_stream, mode, encoding=None if "b" in mode else "utf-8") as file:
+            yield file
+
+
+def write_jsonl(session: "Session", path_or_stream):
+    """write a JSON object per node on a line, see iter_records"""
+    with _open(path_or_stream) as stream:
+        for record in iter_records(session):
+            stream.write(json.dumps(record, default=str) + "\n")
+
+
+def write_arrow(session: "Session", path: str, format: str = "parquet", batch_size: int = 100_000):
+    """
+    write the records as an Apache Parquet or Arrow IPC file, in batches of batch_size records.
+    requires pyarrow
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("exporting to Arrow or Parquet requires pyarrow: pip install pyarrow") from None
+
+    types = {
+        "id": pyarrow.int64(),
+        "parent_id": pyarrow.int64(),
+        "data_node_id": pyarrow.int64(),
+        "wall_time": pyarrow.float64(),
+        "cpu_time": pyarrow.float64(),
+    }
+    schema = pyarrow.schema([(field, types.get(field, pyarrow.string())) for field in FIELDS])
+
+    def iter_batches():
+        columns = {field: [] for field in FIELDS}
+        for record in iter_records(session):
+            for field in FIELDS:
+                columns[field].append(record[field])
+            if len(columns["id"]) >= batch_size:
+                yield record_batch(columns)
+                columns = {field: [] for field in FIELDS}
+        if columns["id"]:
+            yield record_batch(columns)
+
+    def record_batch(columns):
+        arrays = [pyarrow.array(columns[field], type=schema.field(field).type) for field in FIELDS]
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+    if format == "parquet":
+        import pyarrow.parquet
+
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            for batch in iter_batches():
+                writer.write_table(pyarrow.Table.from_batches([batch], schema=schema))
+    elif format == "arrow":
+        import pyarrow.ipc
+
+        with pyarrow.OSFile(path, "wb") as sink, pyarrow.ipc.new_file(sink, schema) as writer:
+            for batch in iter_batches():
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"unsupported arrow format '{format}', expected 'parquet' or 'arrow'")
+
+
+def write_junit(session: "Session", path_or_stream):
+    """
+    write a JUnit XML report for CI: a test suite per validator, with a test case per result.
+    warnings pass with the warning in system-out, skipped validators are reported as skipped
+    """
+    profile = getattr(session, "profile", None)
+    validators = [node for node in session.children if isinstance(node, Validator)]
+    with _open(path_or_stream) as stream:
+        stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        stream.write(f"<testsuites name={quoteattr(session.name)}>\n")
+        for validator in validators:
+            _write_junit_suite(stream, validator, profile)
+        stream.write("</testsuites>\n")
+
+
+def _write_junit_suite(stream, validator: Validator, profile):
+    state_counts = validator.state_counts
+    node_profile = profile.get(validator) if profile is not None else None
+    name = quoteattr(validator.name)
+    # a validator that failed or was skipped without results is reported as 1 test case
+    without_results = not validator._children and validator.state in (NodeState.FAIL, NodeState.SKIPPED)
+    tests = len(validator._children or ()) + without_results
+    failures = state_counts.get(NodeState.FAIL, 0) + (without_results and validator.state == NodeState.FAIL)
+    skipped = int(without_results and validator.state == NodeState.SKIPPED)
+    attributes = f'name={name} tests="{tests}" failures="{failures}" errors="0" skipped="{skipped}"'
+    if node_profile is not None:
+        attributes += f' time="{node_profile.wall_time:.6f}"'
+    stream.write(f"  <testsuite {attributes}>\n")
+    if without_results:
+        stream.write(f"    <testcase classname={name} name={name}>")
+        if validator.state == NodeState.SKIPPED:
+            stream.write("<skipped/>")
+        else:
+            stream.write(f"<failure message={quoteattr(validator.name + ' failed running')}/>")
+        stream.write("</testcase>\n")
+    for result_node in validator._children or ():
+        stream.write(f"    <testcase classname={name} name={quoteattr(str(result_node.name))}")
+        state = result_node.state
+        if state == NodeState.SUCCEED:
+            stream.write("/>\n")
+            continue
+        stream.write(">")
+        message = _message(result_node) or ""
+        if state == NodeState.FAIL:
+            exception_type = _exception_type(result_node)
+            type_attribute = f" type={quoteattr(exception_type)}" if exception_type else ""
+            stream.write(f"<failure message={quoteattr(message)}{type_attribute}>{escape(message)}</failure>")
+        elif state == NodeState.WARNING:
+            stream.write(f"<system-out>{escape('warning: ' + message)}</system-out>")
+        else:
+            stream.write("<skipped/>")
+        stream.write("</testcase>\n")
+    stream.write("  </testsuite>\n")
+
+
+def export(session: "Session", path: str, format: "Optional[str]" = None):
+    """
+    export the session's results to a file.
+    format: 'jsonl', 'parquet', 'arrow' or 'junit', by default based on the file extension
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        format = FORMATS.get(extension)
+        if format is None:
+            raise ValueError(f"can't export to '{path}', unknown extension, expected one of {', '.join(FORMATS)}")
+    if format == "jsonl":
+        write_jsonl(session, path)
+    elif format in ("parquet", "arrow"):
+        write_arrow(session, path, format=format)
+    elif format == "junit":
+        write_junit(session, path)
+    else:
+        raise ValueError(f"unsupported export format '{format}', expected 'jsonl', 'parquet', 'arrow' or 'junit'")
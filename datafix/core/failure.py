@@ -0,0 +1,106 @@
+from typing import Optional
+
+
+class ValidationError(Exception):
+    """
+    raise this in Validator.validate to save structured details with the failure, e.g. the ids of bad faces
+    > raise ValidationError("faces aren't planar", payload=[3, 8, 12])
+    any exception with a payload attribute works
+    """
+
+    def __init__(self, message: str = "", payload=None):
+        super().__init__(message)
+        self.payload = payload
+
+
+class FailureRecord:
+    """
+    why a validation failed: the exception's message & type, and an optional payload, see ValidationError.
+    saved on the ResultNode, see ResultNode.failure. the message & payload are capped to a max size,
+    records of the same error are shared by all results that failed with it, see FailureTable
+    """
+
+    __slots__ = ("message", "exception_type", "payload", "truncated")
+
+    def __init__(self, message: str, exception_type: "Optional[str]" = None, payload=None, truncated=False):
+        self.message = message
+        self.exception_type = exception_type  # the class name of the exception
+        self.payload = payload
+        self.truncated = truncated  # True if the message or payload was cut to the max size
+
+    def __eq__(self, other):
+        if not isinstance(other, FailureRecord):
+            return NotImplemented
+        return (self.message, self.exception_type, self.payload) == (
+            other.message,
+            other.exception_type,
+            other.payload,
+        )
+
+    __hash__ = None  # the payload can be mutable
+
+    def __repr__(self):
+        return f"FailureRecord({self.exception_type}: {self.message!r})"
+
+
+class FailureTable:
+    """
+    creates the FailureRecords of a session, and interns them: results that failed with the same error
+    share 1 record, so thousands of identical failures don't each keep a copy of the message.
+    the table only remembers max_interned different errors, to not grow forever with unique messages
+    """
+
+    def __init__(self, max_message_length: int = 1000, max_payload_items: int = 100, max_interned: int = 10_000):
+        self.max_message_length = max_message_length
+        self.max_payload_items = max_payload_items
+        self.max_interned = max_interned
+        self._records = {}  # (exception type, message) -> record without payload
+
+    def record(self, exception: Exception) -> FailureRecord:
+        """return the record of an exception raised by a validation"""
+        message = str(exception)
+        exception_type = type(exception).__name__
+        payload = getattr(exception, "payload", None)
+        truncated = False
+        if len(message) > self.max_message_length:
+            message = message[: self.max_message_length] + "..."
+            truncated = True
+        if payload is not None:
+            # a payload is usually unique, e.g. face ids, don't intern it
+            payload, payload_truncated = self._cap_payload(payload)
+            return FailureRecord(message, exception_type, payload, truncated or payload_truncated)
+
+        key = exception_type, message
+        record = self._records.get(key)
+        if record is None:
+            record = FailureRecord(message, exception_type, truncated=truncated)
+            if len(self._records) < self.max_interned:
+                self._records[key] = record
+        return record
+
+    def intern(self, record: FailureRecord) -> FailureRecord:
+        """return the interned record equal to this record, e.g. a record created in a worker process"""
+        if record.payload is not None:
+            return record
+        key = record.exception_type, record.message
+        interned = self._records.get(key)
+        if interned is None:
+            interned = record
+            if len(self._records) < self.max_interned:
+                self._records[key] = record
+        return interned
+
+    def _cap_payload(self, payload):
+        """returns the payload with max max_payload_items items, and True if items were cut"""
+        if isinstance(payload, (list, tuple, set, frozenset)) and len(payload) > self.max_payload_items:
+            return list(payload)[: self.max_payload_items], True
+        if isinstance(payload, dict) and len(payload) > self.max_payload_items:
+            return dict(list(payload.items())[: self.max_payload_items]), True
+        return payload, False
+
+    def clear(self):
+        self._records.clear()
+
+    def __len__(self):
+        """the nr of interned records"""
+        return len(self._records)
@@ -0,0 +1,93 @@
+from typing import Iterable, Generator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datafix.core.node import Node
+    from datafix.core.datanode import DataNode
+
+
+class DataNodeIndex:
+    """
+    indexes DataNodes by the type of their data, and the node that created them (usually a collector).
+    so a validator finds its DataNodes without scanning all collectors & DataNodes.
+
+    a session keeps this index up to date, DataNodes add themselves on creation, and remove themselves on delete
+    """
+
+    def __init__(self):
+        # data type -> {parent node: {data_node: None}}, in creation order per parent.
+        # the index is found again from the data node when it's removed, so we don't store a key per data node
+        self._index = {}
+        self._count = 0
+
+    def add(self, data_node: "DataNode"):
+        data_type = type(data_node.data)
+        parents = self._index.get(data_type)
+        if parents is None:
+            parents = self._index[data_type] = {}
+        data_nodes = parents.get(data_node.parent)
+        if data_nodes is None:
+            data_nodes = parents[data_node.parent] = {}
+        if data_node not in data_nodes:
+            data_nodes[data_node] = None
+            self._count += 1
+
+    def remove(self, data_node: "DataNode"):
+        key = self._find(data_node)
+        if key is None:
+            return
+        data_type, parent = key
+        parents = self._index[data_type]
+        data_nodes = parents[parent]
+        del data_nodes[data_node]
+        self._count -= 1
+        if not data_nodes:
+            del parents[parent]
+            if not parents:
+                del self._index[data_type]
+
+    def _find(self, data_node: "DataNode") -> "tuple[type, Node]|None":
+        """the (data type, parent) the data node is indexed under, or None if it's not indexed"""
+        data_type = type(data_node.data)
+        if data_node in self._index.get(data_type, {}).get(data_node.parent, ()):
+            return data_type, data_node.parent
+        # the data or parent changed since the data node was added, rare enough to scan the index
+        for data_type, parents in self._index.items():
+            for parent, data_nodes in parents.items():
+                if data_node in data_nodes:
+                    return data_type, parent
+        return None
+
+    @property
+    def types(self) -> "list[type]":
+        """all data types of the indexed DataNodes"""
+        return list(self._index)
+
+    def parents(self, types: "Iterable[type]") -> "list[Node]":
+        """the nodes that created DataNodes with data of any of the given types"""
+        parents = {}
+        for data_type in types:
+            for parent in self._index.get(data_type, ()):
+                parents[parent] = None
+        return list(parents)
+
+    def iter_data_nodes(self, parents: "Iterable[Node]", types: "Iterable[type]") -> "Generator[DataNode]":
+        """
+        yield the DataNodes with data of any of the given types,
+        grouped by parent in the order of parents, and in creation order per parent
+        """
+        types = [data_type for data_type in types if data_type in self._index]
+        for parent in parents:
+            buckets = [self._index[data_type][parent] for data_type in types if parent in self._index[data_type]]
+            if len(buckets) == 1:
+                yield from buckets[0]
+            elif buckets:
+                # a parent that collected several types, its children are in creation order
+                for node in parent.children:
+                    if any(node in bucket for bucket in buckets):
+                        yield node
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, data_node: "DataNode"):
+        return self._find(data_node) is not None
@@ -1,9 +1,11 @@
 from __future__ import annotations
+import io
 import logging
-import textwrap
+import itertools
+import threading
 from enum import Enum
-from typing import List, TYPE_CHECKING
-from contextlib import contextmanager
+from typing import Iterable, Iterator, TextIO, TYPE_CHECKING
+from contextlib import contextmanager, nullcontext
 
 if TYPE_CHECKING:
     import datafix.core.session
@@ -23,6 +25,8 @@ def color_text(text, state):
         text = f"\033[31m{text}\033[0m"  # red
     elif state == NodeState.WARNING:
         text = f"\033[33m{text}\033[0m"  # yellow
+    elif state == NodeState.SKIPPED:
+        text = f"\033[90m{text}\033[0m"  # grey
     return text
 
 
@@ -36,64 +40,388 @@ class NodeState(Enum):
     WARNING = "warning"  # warning
     # PAUSED = "paused"
     # STOPPED = "stopped"
-    # SKIPPED = "skipped"
+    SKIPPED = "skipped"  # not run, the session stopped before the node started, see Session.fail_fast
     # DISABLED = "disabled"
     # PASS
     # WAIT
     # CHOICE
 
+    # states are counted in dicts on every state change, Enum hashes the name in Python, members are unique
+    __hash__ = object.__hash__
+
+
+# the states used by every node & result. looking up an Enum member is slow before Python 3.12, look them up once
+_INIT = NodeState.INIT
+_SUCCEED = NodeState.SUCCEED
+_FAIL = NodeState.FAIL
+_WARNING = NodeState.WARNING
+
+
+# state counters are shared between nodes, e.g. validators running in parallel update the same DataNodes
+_state_lock = threading.RLock()
+
+
+def _count_state(state_counts: dict, state: NodeState, amount: int):
+    count = state_counts.get(state, 0) + amount
+    if count:
+        state_counts[state] = count
+    else:
+        del state_counts[state]
+
+
+class ChildList:
+    """
+    the ordered children of a Node, behaves like a list
+    but removing a child, and finding a child by name are O(1), instead of scanning all children.
+    the children are indexed by name once they're looked up by name, renamed children update the index
+
+    keeps count of the states of the children, children update the counts when their state changes.
+    the children are indexed by state once they're queried by state, see iter_state
+    """
+
+    __slots__ = ("_nodes", "_by_name", "_list", "state_counts", "_by_state")
+    __hash__ = None  # mutable, like a list
+
+    def __init__(self, nodes: "Iterable[Node]" = ()):
+        self._nodes = {}  # node -> None, a dict keeps insertion order & has O(1) removal
+        # name -> node, or {node: None} in insertion order if several children share the name.
+        # most names are unique, so we don't create a dict per name. created by the first lookup, see _names
+        self._by_name = None
+        self._list = None  # cached list for index access, reset when the children change
+        self.state_counts = {}  # state -> nr of children in that state
+        self._by_state = None  # state -> {node: None}, created by the first iter_state, then kept up to date
+        for node in nodes:
+            self.append(node)
+
+    def append(self, node: "Node"):
+        with _state_lock:
+            self._append(node)
+
+    def _append(self, node: "Node"):
+        """append without the lock, for children only added by the thread that runs the parent, see Node._lock_free"""
+        if node in self._nodes:
+            # a dict can't store the same node twice, move it to the end like a re-added child
+            self.remove(node)
+        self._nodes[node] = None
+        if self._by_name is not None:
+            self._index_name(node, node.name)
+        self._list = None
+        state = node.state
+        state_counts = self.state_counts
+        state_counts[state] = state_counts.get(state, 0) + 1
+        if self._by_state is not None:
+            self._by_state.setdefault(state, {})[node] = None
+
+    def extend(self, nodes: "Iterable[Node]"):
+        for node in nodes:
+            self.append(node)
+
+    def remove(self, node: "Node"):
+        try:
+            del self._nodes[node]
+        except KeyError:
+            raise ValueError(f"{node!r} is not a child") from None
+        if self._by_name is not None:
+            self._unindex_name(node, node.name)
+        self._list = None
+        with _state_lock:
+            _count_state(self.state_counts, node.state, -1)
+            if self._by_state is not None:
+                self._unindex_state(node, node.state)
+
+    def clear(self):
+        self._nodes.clear()
+        self._by_name = None
+        self._list = None
+        self.state_counts.clear()
+        self._by_state = None
+
+    def _update_state(self, node: "Node", old_state: NodeState, new_state: NodeState):
+        """called by a child when its state changed"""
+        with _state_lock:
+            if node in self._nodes:
+                _count_state(self.state_counts, old_state, -1)
+                _count_state(self.state_counts, new_state, 1)
+                if self._by_state is not None:
+                    self._unindex_state(node, old_state)
+                    self._by_state.setdefault(new_state, {})[node] = None
+
+    def _index_name(self, node: "Node", name):
+        nodes = self._by_name.get(name)
+        if nodes is None:
+            self._by_name[name] = node
+        elif isinstance(nodes, dict):
+            nodes[node] = None
+        else:
+            self._by_name[name] = {nodes: None, node: None}
+
+    def _unindex_name(self, node: "Node", name):
+        nodes = self._by_name[name]
+        if isinstance(nodes, dict):
+            del nodes[node]
+            if len(nodes) == 1:
+                self._by_name[name] = next(iter(nodes))
+        else:
+            del self._by_name[name]
+
+    def _renamed(self, node: "Node", old_name):
+        """called by a child when its name changed"""
+        with _state_lock:
+            if self._by_name is not None and node in self._nodes:
+                self._unindex_name(node, old_name)
+                name = node.name
+                if name in self._by_name:
+                    # keep the children that share the name in order, renames are rare so we can scan the children
+                    nodes = {child: None for child in self._nodes if child.name == name}
+                    self._by_name[name] = nodes if len(nodes) > 1 else node
+                else:
+                    self._by_name[name] = node
+
+    def _names(self) -> dict:
+        """the children by name, indexed on the first lookup, then kept up to date"""
+        with _state_lock:
+            if self._by_name is None:
+                self._by_name = {}
+                for node in self._nodes:
+                    self._index_name(node, node.name)
+            return self._by_name
+
+    def _unindex_state(self, node: "Node", state: NodeState):
+        nodes = self._by_state[state]
+        del nodes[node]
+        if not nodes:
+            del self._by_state[state]
+
+    def iter_state(self, states: "Iterable[NodeState]") -> "Iterator[Node]":
+        """
+        iterate the children in any of these states, without checking the other children.
+        the first call indexes the children by state, the children keep the index up to date when their state changes.
+        in order per state, a child that changed state moves to the end. like a dict, the iterator breaks if
+        the children or their states change while iterating, use list(children.iter_state(...)) to change them
+        """
+        with _state_lock:
+            if self._by_state is None:
+                by_state = {}
+                for node in self._nodes:
+                    by_state.setdefault(node.state, {})[node] = None
+                self._by_state = by_state
+            buckets = [self._by_state[state] for state in states if state in self._by_state]
+        if len(buckets) == 1:
+            return iter(buckets[0])
+        return itertools.chain.from_iterable(buckets)
+
+    def iter_by_name(self, name) -> "Iterator[Node]":
+        """iterate the children with this name, in order"""
+        try:
+            nodes = self._names().get(name)
+        except TypeError:  # unhashable
+            return iter(())
+        if nodes is None:
+            return iter(())
+        if isinstance(nodes, dict):
+            return iter(nodes)
+        return iter((nodes,))
+
+    def get_by_name(self, name) -> "Node|None":
+        """return the first child with this name, or None"""
+        try:
+            nodes = self._names().get(name)
+        except TypeError:  # unhashable
+            return None
+        if isinstance(nodes, dict):
+            return next(iter(nodes))
+        return nodes
+
+    def __getitem__(self, index):
+        if self._list is None:
+            self._list = list(self._nodes)
+        return self._list[index]
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __reversed__(self):
+        return reversed(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        try:
+            return node in self._nodes
+        except TypeError:  # unhashable
+            return False
+
+    def __eq__(self, other):
+        if isinstance(other, (ChildList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self._nodes))
+
 
 class Node:
     """
     warning: if True, warn instead of fail. A warning implies accepted failure.
     continue_on_fail: if True, continue running even if this node fails
+
+    nodes use __slots__ & create their actions & children lazily, to save memory in sessions with many DataNodes.
+    subclasses that don't define __slots__ get a __dict__ as usual, so they can add any attribute
     """
 
+    __slots__ = ("_state", "_warning", "_actions", "_children", "_child_actions", "parent", "_name", "__weakref__")
+
     continue_on_fail = True  # if self or any children fail, continue running
-    warning = False  # set state to WARNING if this node FAILS
+    _is_child = True  # add this node to the parent's children
+    # True if only the thread running the parent adds these nodes & changes their state during a run, e.g. results.
+    # the parent then counts them without the lock, see ChildList._append
+    _lock_free = False
+
+    # the nodes this node waits for in a session run: nodes, node classes (all nodes of that class in the session),
+    # node names, or data types (the collectors of that type). None waits for the nodes before it, see
+    # Session.get_dependencies
+    depends_on: "list[Node|type|str]|None" = None
     # action_classes = []
 
-    # Action-classes, that will be added to self.actions on instance
-    # the main reason we instance on init, is so each node has it's own action
-    # so we can track fail success of actions per node
-    # E.G. a select mesh action, defined by a mesh collector, is auto added to all mesh-Nodes
-    child_actions = None  # should be empty list but mutate bug
-    name = None
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the name is set per instance, a name class attribute would replace the name property & hide it
+        if not isinstance(cls.__dict__.get("name", property()), property):
+            logging.warning(f"ignoring the class attribute `{cls.__name__}.name`, pass the name to the node instead")
+            delattr(cls, "name")
 
     def __init__(self, parent: "Node|None" = None, name=None):
-        self.actions = []  # instanced action nodes, that can be run on this node
-        self.children: "List[Node]" = []  # nodes created by this node
+        self._state = _INIT
+        self._warning = False  # set state to WARNING if this node FAILS, see self.warning
+        self._actions = None  # instanced action nodes, that can be run on this node, see self.actions
+        self._children = None  # nodes created by this node, see self.children
+        self._child_actions = None  # see self.child_actions
         self.parent = parent  # node that created this node
 
-        self.child_actions = self.child_actions or []
-
         if name:
-            self.name = str(name)
+            self._name = str(name)
         else:
-            self.name = self.__class__.__name__
+            self._name = self.__class__.__name__
 
         if parent:
-            if parent is self:
-                raise ValueError(f"Node '{self}' cannot be its own parent")
+            self._add_to_parent(parent)
 
-            # add any node created by another node, to the parent's children
-            parent.children.append(self)
+    def _add_to_parent(self, parent: "Node"):
+        if parent is self:
+            raise ValueError(f"Node '{self}' cannot be its own parent")
+        self.parent = parent
 
-            # add any child actions defined in the parent, to this node
+        # actions are saved in parent.actions instead of the children
+        if self._is_child:
+            # add any node created by another node, to the parent's children
+            children = parent._children
+            if children is None:
+                children = parent.children
+            if self._lock_free:
+                children._append(self)
+            else:
+                with _state_lock:
+                    children._append(self)
+
+            # add any child actions defined in the parent, to this node.
+            # not parent._child_actions, a subclass can set child_actions as class attribute
             for action in parent.child_actions:
                 self.actions.append(action(parent=self))
 
-        self._state = NodeState.INIT
+    @property
+    def actions(self) -> "list[Node]":
+        """instanced action nodes, that can be run on this node"""
+        if self._actions is None:
+            self._actions = []
+        return self._actions
+
+    @actions.setter
+    def actions(self, actions: "list[Node]"):
+        self._actions = actions
+
+    @property
+    def child_actions(self) -> "list[type]":
+        """
+        Action-classes, that will be added to the actions of each child on instance
+        the main reason we instance on init, is so each node has it's own action
+        so we can track fail success of actions per node
+        E.G. a select mesh action, defined by a mesh collector, is auto added to all mesh-Nodes
+
+        a subclass can also set a list of Action-classes as class attribute
+        """
+        if self._child_actions is None:
+            self._child_actions = []
+        return self._child_actions
+
+    @child_actions.setter
+    def child_actions(self, child_actions: "list[type]"):
+        self._child_actions = child_actions
+
+    @property
+    def children(self) -> "ChildList[Node]":
+        """nodes created by this node"""
+        if self._children is None:
+            self._children = ChildList()
+        return self._children
+
+    @children.setter
+    def children(self, nodes: "Iterable[Node]"):
+        nodes = list(nodes)
+        for node in nodes:
+            node.parent = self  # so the children notify us when their state changes
+        self._children = ChildList(nodes)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        old_name = self._name
+        self._name = name
+        # keep the parent's name index up to date, so parent[name] finds this node by its new name
+        if self.parent is not None and self.parent._children is not None:
+            self.parent._children._renamed(self, old_name)
+
+    @property
+    def warning(self) -> bool:
+        """if True, warn instead of fail. A warning implies accepted failure."""
+        return self._warning
+
+    @warning.setter
+    def warning(self, warning: bool):
+        old_state = self.state
+        self._warning = warning
+        self._state_changed(old_state)
 
     @property
     def state(self):
-        if self._state == NodeState.FAIL and self.warning:
-            return NodeState.WARNING
+        if self._state is _FAIL and self.warning:
+            return _WARNING
         return self._state
 
     @state.setter
     def state(self, state):
+        self._set_state(state)
+
+    def _set_state(self, state: NodeState):
+        old_state = self.state
         self._state = state
+        self._state_changed(old_state)
+
+    def _state_changed(self, old_state: NodeState):
+        """notify the parent when the state changed, so it can keep count of the states of its children"""
+        new_state = self.state
+        if new_state != old_state and self.parent is not None and self.parent._children is not None:
+            self.parent._children._update_state(self, old_state, new_state)
+
+    @property
+    def state_counts(self) -> "dict[NodeState, int]":
+        """the nr of children in each state, e.g. {NodeState.FAIL: 2, NodeState.SUCCEED: 10}"""
+        if self._children is None:
+            return {}
+        return dict(self._children.state_counts)
 
     def set_state_from_children(self):
         """fail or warn if a child Node failed or warned"""
@@ -102,7 +430,7 @@ class Node:
         if self.state == NodeState.FAIL:
             self.state = NodeState.FAIL
 
-        child_states = [child_node.state for child_node in self.children]
+        child_states = self.state_counts
 
         if NodeState.FAIL in child_states:
             # a child failed
@@ -125,22 +453,37 @@ class Node:
     @property
     def session(self) -> "datafix.core.session.Session":
         """get the session this node belongs to (the top node)"""
-        if self.parent:
-            return self.parent.session
-        else:
-            return self
+        node = self
+        while node.parent is not None:  # a loop instead of recursion, this is called for every result
+            node = node.parent
+        return node
 
     def run(self, *args, **kwargs):
         raise NotImplementedError
 
-    def report(self) -> str:
-        """ "create a report of this node and it's children"""
-        txt = f"{self.pp_state}\n"
+    def report(self, **options) -> str:
+        """create a report of this node and it's children, see write_report for the options"""
+        stream = io.StringIO()
+        self.write_report(stream, **options)
+        return stream.getvalue()
+
+    def write_report(
+        self,
+        stream: "TextIO",
+        states: "Iterable[NodeState]|None" = None,
+        max_children: "int|None" = None,
+        summary: bool = False,
+    ):
+        """
+        write the report of this node and it's children line by line to a stream, e.g. a file or sys.stdout.
+        for big sessions, this doesn't build the whole report in memory like report()
+        states: only report nodes in these states, or with children in these states, e.g. [NodeState.FAIL]
+        max_children: report max this nr of children per node, followed by the nr of children left out
+        summary: only report this node & its children, with the nr of their children in each state
+        """
+        from datafix.core.report import ReportWriter  # report.py imports this module
 
-        for child in self.children:
-            txt_child = child.report()
-            txt += textwrap.indent(txt_child, "  ")
-        return txt
+        ReportWriter(stream, states=states, max_children=max_children, summary=summary).write(self)
 
     @property
     def pp_state(self) -> str:
@@ -166,10 +509,9 @@ class Node:
     def __getitem__(self, item: "str|Node"):
         """get a child-node by name, returns first node if multiple
         e.g. session["collector_name"]"""
-        for node in self.children:
-            if node.name == item:
-                return node
-        return None
+        if self._children is None:
+            return None
+        return self._children.get_by_name(item)
 
     def get(self, item: "str|Node", default=None):
         """get a child-node by name, returns first node if multiple
@@ -203,7 +545,9 @@ class Node:
 
     def delete_children(self):
         """delete all child-nodes, keep self"""
-        for child in list(self.children):  # list so we can delete while iterating
+        if self._children is None:
+            return  # no children were ever added
+        for child in list(self._children):  # list so we can delete while iterating
             child.delete()
 
     # def __iter__(self):
@@ -229,23 +573,26 @@ class Node:
     @contextmanager
     def node_state_setter(self):
         """
-        a context manager to set the state of a node, and handle exceptions
+        a context manager to set the state of a node, and handle exceptions.
+        records the time the node took in the session's profile, see Session.profile
 
         usage:
         > with self.node_state_setter():
         >     # do something that might fail
         >     ...
         """
-        try:
-            # Set the node state to RUNNING at the start
-            self._state = NodeState.RUNNING
-            yield  # Logic inside the 'with' block executes here
-            # check state is not fail or warning, in case something set it to fail while it ran
-            if self.state == NodeState.RUNNING:
-                self._state = NodeState.SUCCEED
-        except Exception as e:
-            # On exception, set the node state to FAIL and log the error
-            self._state = NodeState.FAIL
-            self.log_error(f"'{self.__class__.__name__}' failed running: '{e}'")
-            if DEBUG_MODE or not self.continue_on_fail:
-                raise e  # Rethrow the exception if continue_on_fail is False
+        profile = getattr(self.session, "profile", None)
+        with profile.time_node(self) if profile is not None else nullcontext():
+            try:
+                # Set the node state to RUNNING at the start
+                self._set_state(NodeState.RUNNING)
+                yield  # Logic inside the 'with' block executes here
+                # check state is not fail or warning, in case something set it to fail while it ran
+                if self.state == NodeState.RUNNING:
+                    self._set_state(NodeState.SUCCEED)
+            except Exception as e:
+                # On exception, set the node state to FAIL and log the error
+                self._set_state(NodeState.FAIL)
+                self.log_error(f"'{self.__class__.__name__}' failed running: '{e}'")
+                if DEBUG_MODE or not self.continue_on_fail:
+                    raise e  # Rethrow the exception if continue_on_fail is False
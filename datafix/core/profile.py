@@ -0,0 +1,130 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, Hashable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datafix.core.node import Node
+
+
+def _call_timed(fn, *args):
+    """
+    call fn, returns its result & its timing: (start time since the epoch, wall time, cpu time, process id).
+    picklable, to time work in a worker process
+    """
+    start_time, wall_time, cpu_time = time.time(), time.perf_counter(), time.thread_time()
+    result = fn(*args)
+    return result, (start_time, time.perf_counter() - wall_time, time.thread_time() - cpu_time, os.getpid())
+
+
+class NodeProfile:
+    """the cost of a node or an adapter: the time it took, and the nr of items it processed"""
+
+    __slots__ = ("calls", "items", "wall_time", "cpu_time")
+
+    def __init__(self):
+        self.calls = 0  # nr of times the node ran, or the adapter was called
+        self.items = 0  # nr of collected DataNodes, validation results, or adapted data
+        self.wall_time = 0.0  # seconds
+        self.cpu_time = 0.0  # seconds of cpu time, of the thread the node ran in
+
+    @property
+    def time_per_item(self) -> float:
+        """the average wall time per item, or the wall time if there are no items"""
+        return self.wall_time / self.items if self.items else self.wall_time
+
+    def __repr__(self):
+        return (
+            f"NodeProfile({self.wall_time:.3f}s wall, {self.cpu_time:.3f}s cpu, "
+            f"{self.items} items, {self.calls} calls)"
+        )
+
+
+class Profile:
+    """
+    the time each node & adapter took in a session run, to find the slow ones. see Session.profile
+
+    a node's time includes adapting the data it validates, the time of the adapters is also saved separately.
+    cpu time is the cpu time of the thread the node ran in, async nodes that share an event loop share their cpu time
+    """
+
+    def __init__(self):
+        self.nodes: "dict[Hashable, NodeProfile]" = {}  # node or adapter -> its profile
+        self._running = set()  # nodes being timed, to not time nested runs twice
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time_node(self, node: "Node", calls: int = 1):
+        """
+        time a node run, and count its children as the items it processed.
+        a nested run of the same node is included in the outer run, e.g. a collector run by the session
+        """
+        with self._lock:
+            nested = node in self._running
+            self._running.add(node)
+        if nested:
+            yield
+            return
+        start, cpu_time = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall_time, cpu_time = time.perf_counter() - start, time.thread_time() - cpu_time
+            with self._lock:
+                self._running.discard(node)
+            self._record(node, start, wall_time, cpu_time, items=len(node._children or ()), calls=calls)
+
+    @contextmanager
+    def time_call(self, key: "Hashable", items: int = 1):
+        """time a call that processes items, e.g. an adapter call"""
+        start, cpu_time = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self._record(key, start, time.perf_counter() - start, time.thread_time() - cpu_time, items=items)
+
+    def _record(self, key: "Hashable", start: float, wall_time: float, cpu_time: float, items: int, calls: int = 1):
+        """record a timed run, start is the time.perf_counter() when it started"""
+        self.add(key, wall_time, cpu_time, items=items, calls=calls)
+
+    def add_worker_timing(self, key: "Hashable", timing: tuple):
+        """add the time a node took in a worker process, timing is returned by _call_timed"""
+        start_time, wall_time, cpu_time, process_id = timing
+        self.add(key, wall_time, cpu_time, calls=0)
+
+    def add(self, key: "Hashable", wall_time: float, cpu_time: float, items: int = 0, calls: int = 1):
+        with self._lock:
+            node_profile = self.nodes.get(key)
+            if node_profile is None:
+                node_profile = self.nodes[key] = NodeProfile()
+            node_profile.calls += calls
+            node_profile.items += items
+            node_profile.wall_time += wall_time
+            node_profile.cpu_time += cpu_time
+
+    def get(self, key: "Hashable") -> "Optional[NodeProfile]":
+        return self.nodes.get(key)
+
+    def slowest(self, count: "Optional[int]" = None) -> "list[tuple[Hashable, NodeProfile]]":
+        """the nodes & adapters sorted by wall time, slowest first"""
+        items = sorted(self.nodes.items(), key=lambda item: item[1].wall_time, reverse=True)
+        return items[:count]
+
+    def report(self, count: "Optional[int]" = None) -> str:
+        """a report of the slowest nodes & adapters, e.g. 'ValidateMesh: 12.000s wall, 11.500s cpu, ...'"""
+        txt = "profile:\n"
+        for key, node_profile in self.slowest(count):
+            name = getattr(key, "name", None) or type(key).__name__  # adapters don't have a name
+            txt += (
+                f"  {name}: {node_profile.wall_time:.3f}s wall, {node_profile.cpu_time:.3f}s cpu, "
+                f"{node_profile.items} items, {node_profile.time_per_item * 1000:.3f}ms per item, "
+                f"{node_profile.calls} calls\n"
+            )
+        return txt
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def __len__(self):
+        return len(self.nodes)
@@ -0,0 +1,101 @@
+"""
+find nodes in a session with the session's indexes, instead of walking all nodes, see Session.query
+"""
+
+import fnmatch
+from typing import Iterable, Iterator, Optional, Union, TYPE_CHECKING
+from datafix.core.node import Node, NodeState, ChildList
+from datafix.core.datanode import DataNode
+from datafix.core.resultnode import ResultNode
+from datafix.core.validator import Validator
+
+if TYPE_CHECKING:
+    from datafix.core.session import Session
+
+
+def _is_glob(name: str) -> bool:
+    return any(character in name for character in "*?[")
+
+
+def _iter_children(children, states: "Optional[frozenset]", name: "Optional[str]") -> "Iterator[Node]":
+    """iterate the children in the states & with the name, with the index that checks the least children"""
+    if not children:
+        return iter(())
+    if isinstance(children, ChildList) and states is not None:
+        # a ResultList counts its states by scanning them, it's as fast to search them with iter_state
+        if not any(state in states for state in children.state_counts):
+            return iter(())  # the state counts are kept up to date, no need to look at the children
+    if name is not None and not _is_glob(name) and isinstance(children, ChildList):
+        nodes = children.iter_by_name(name)
+        if states is not None:
+            nodes = (node for node in nodes if node.state in states)
+        return nodes
+    nodes = iter(children) if states is None else children.iter_state(states)
+    if name is not None:
+        nodes = (node for node in nodes if fnmatch.fnmatchcase(node.name, name))
+    return nodes
+
+
+def _find_validators(session: "Session", validator) -> "list[Validator]":
+    """the validators in the session: all, this validator, the validators of this class, or with this name"""
+    validators = [node for node in session.children if isinstance(node, Validator)]
+    if validator is None:
+        return validators
+    if isinstance(validator, Validator):
+        return [validator]
+    if isinstance(validator, type):
+        return [node for node in validators if isinstance(node, validator)]
+    return [node for node in validators if node.name == validator]
+
+
+def query(
+    session: "Session",
+    node_class: type = Node,
+    state: "Union[NodeState, Iterable[NodeState], None]" = None,
+    validator: "Union[Validator, type, str, None]" = None,
+    data_type: "Optional[type]" = None,
+    name: "Optional[str]" = None,
+) -> "Iterator[Node]":
+    """lazily yield the nodes in the session that match all filters, see Session.query"""
+    states = None
+    if state is not None:
+        states = frozenset((state,) if isinstance(state, NodeState) else state)
+    types = None
+    if data_type is not None:
+        types = {indexed_type for indexed_type in session._data_node_index.types if issubclass(indexed_type, data_type)}
+
+    def matches(node_type: type) -> bool:
+        """True if nodes of this type can be of the queried class"""
+        return issubclass(node_type, node_class) or issubclass(node_class, node_type)
+
+    # the nodes in the session, e.g. collectors & validators
+    if validator is None and data_type is None and not issubclass(node_class, (DataNode, ResultNode)):
+        for node in _iter_children(session._children, states, name):
+            if isinstance(node, node_class):
+                yield node
+
+    # the DataNodes, found in the index by the node that created them, usually a collector
+    if validator is None and matches(DataNode):
+        index = session._data_node_index
+        indexed_types = index.types if types is None else [indexed for indexed in index.types if indexed in types]
+        if states is None and name is None:
+            data_nodes = index.iter_data_nodes(index.parents(indexed_types), indexed_types)
+        else:
+            data_nodes = (
+                node
+                for parent in index.parents(indexed_types)
+                for node in _iter_children(parent._children, states, name)
+                if isinstance(node, DataNode) and (types is None or type(node.data) in types)
+            )
+        for node in data_nodes:
+            if isinstance(node, node_class):
+                yield node
+
+    # the results, found in the validators' children
+    if matches(ResultNode) and (types is None or types):
+        for node in _find_validators(session, validator):
+            for result_node in _iter_children(node._children, states, name):
+                if types is not None and type(result_node.data_node.data) not in types:
+                    continue
+                if isinstance(result_node, node_class):
+                    yield result_node
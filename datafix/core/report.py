@@ -0,0 +1,94 @@
+from typing import Iterable, Optional, TextIO, TYPE_CHECKING
+from datafix.core.node import NodeState
+
+if TYPE_CHECKING:
+    from datafix.core.node import Node
+
+
+def format_state_counts(state_counts: "dict[NodeState, int]") -> str:
+    """e.g. '10 succeed, 2 fail', in the order of NodeState"""
+    return ", ".join(f"{state_counts[state]} {state.value}" for state in NodeState if state in state_counts)
+
+
+class ReportWriter:
+    """
+    writes the report of a node & its children to a stream line by line, e.g. a file or sys.stdout,
+    so big sessions are reported in linear time, without building the whole report in memory.
+    walks the tree without recursion, so deep trees don't hit the recursion limit
+
+    states: only report nodes in these states, or with children in these states, e.g. [NodeState.FAIL]
+    max_children: report max this nr of children per node, followed by the nr of children left out
+    summary: only report the node & its children with the nr of their children in each state, not the whole tree
+    """
+
+    indent = "  "
+
+    def __init__(
+        self,
+        stream: TextIO,
+        states: "Optional[Iterable[NodeState]]" = None,
+        max_children: "Optional[int]" = None,
+        summary: bool = False,
+    ):
+        self.stream = stream
+        self.states = None if states is None else frozenset(states)
+        self.max_children = max_children
+        self.summary = summary
+
+    def write(self, node: "Node"):
+        """write the report of the node & its children"""
+        self._write_node(node, 0)
+        stack = [self._iter_children(node, 1)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            depth, child = item
+            if isinstance(child, str):  # a line about the left out children
+                self._write_line(child, depth)
+                continue
+            self._write_node(child, depth)
+            if not self.summary:
+                stack.append(self._iter_children(child, depth + 1))
+
+    def _iter_children(self, node: "Node", depth: int):
+        """yield (depth, child) for the children to report, and (depth, text) if children were left out"""
+        children = node._children
+        if not children:
+            return
+        written = 0
+        left_out = 0
+        for child in children:
+            if not self._includes(child):
+                continue
+            if self.max_children is not None and written >= self.max_children:
+                if self.states is None:
+                    left_out = len(children) - written  # no need to check the other children
+                    break
+                left_out += 1
+                continue
+            written += 1
+            yield depth, child
+        if left_out:
+            yield depth, f"... {left_out} more"
+
+    def _includes(self, node: "Node") -> bool:
+        if self.states is None:
+            return True
+        return node.state in self.states or any(state in self.states for state in node.state_counts)
+
+    def _write_node(self, node: "Node", depth: int):
+        line = node.pp_state
+        if self.summary and node._children:
+            line += f" ({format_state_counts(node.state_counts)})"
+        self._write_line(line, depth)
+
+    def _write_line(self, line: str, depth: int):
+        indent = self.indent * depth
+        if "\n" in line:
+            # e.g. a DataNode named after multi-line data, indent each line like textwrap.indent
+            line = "\n".join(indent + part if part.strip() else part for part in line.split("\n"))
+            self.stream.write(line + "\n")
+        else:
+            self.stream.write(indent + line + "\n")
@@ -1,5 +1,7 @@
+from typing import Optional
 from datafix.core.node import Node
 from datafix.core.datanode import DataNode
+from datafix.core.failure import FailureRecord
 
 
 class ResultNode(Node):
@@ -14,16 +16,59 @@ class ResultNode(Node):
     # there is overlap between a resultnode, and a outcome saved in the state. SUCCESS / FAIL / WARNING
     # POLISH: maybe combine in future?
 
-    def __init__(self, data_node, state, warning, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    __slots__ = ("data_node", "_linked", "failure")
+
+    _lock_free = True  # a validator creates its results in the thread that runs it
+
+    def __init__(
+        self,
+        data_node,
+        state,
+        warning,
+        parent: "Optional[Node]" = None,
+        name=None,
+        failure: "Optional[FailureRecord]" = None,
+    ):
         self.data_node: DataNode = data_node
-        data_node.result_nodes.append(self)  # creates bi-directional link
-        self.state = state
-        self.warning = warning
+        self.failure = failure  # why the validation failed, see FailureRecord
+        self._linked = False  # True while linked to the data node
+        # a validator creates a result per DataNode, so set the node attributes here instead of in Node.__init__.
+        # set the final state before linking, so the parent & data node count this result once
+        self._state = state
+        self._warning = warning
+        self._actions = None
+        self._children = None
+        self._child_actions = None
+        self._name = str(name) if name else self.__class__.__name__
+        self.parent = None
+        if parent:
+            self._add_to_parent(parent)
+        data_node._add_result_node(self)  # creates bi-directional link
+        self._linked = True
+
+    def _state_changed(self, old_state):
+        super()._state_changed(old_state)
+        new_state = self.state
+        if new_state == old_state or not self._linked:
+            return
+        # keep the state counts of the data node up to date
+        self.data_node._result_state_changed(old_state, new_state)
+
+    def delete(self):
+        """delete self, and unlink from the data node"""
+        if self._linked:
+            self.data_node._remove_result_node(self)
+            self._linked = False
+        super().delete()
 
     def __str__(self):
         return f"ResultNode({self.data_node.data})"
 
+    @property
+    def message(self) -> "Optional[str]":
+        """the error message of a failed validation, None if it passed"""
+        return self.failure.message if self.failure is not None else None
+
     @property
     def data(self):
         # the result node doesnt store data, but runs on a data node
@@ -0,0 +1,351 @@
+import heapq
+import weakref
+from array import array
+from typing import Iterable, Generator, Optional, TYPE_CHECKING
+from datafix.core.node import NodeState, _state_lock, _count_state
+from datafix.core.resultnode import ResultNode
+from datafix.core.failure import FailureRecord
+
+if TYPE_CHECKING:
+    from datafix.core.session import Session
+    from datafix.core.validator import Validator
+    from datafix.core.datanode import DataNode
+
+
+# a result's state is saved as 1 byte, the index of the state, +_WARNING_FLAG if the result has a warning
+_STATES = list(NodeState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_WARNING_FLAG = 0x80
+_CODES = [code for code in range(len(_STATES))] + [code | _WARNING_FLAG for code in range(len(_STATES))]
+
+
+def _state_code(state: NodeState, warning: bool) -> int:
+    return _STATE_CODES[state] | (_WARNING_FLAG if warning else 0)
+
+
+def _code_state(code: int) -> NodeState:
+    """the state of a result with this code, a failure with a warning is a warning, like ResultNode.state"""
+    state = _STATES[code & ~_WARNING_FLAG]
+    if state == NodeState.FAIL and code & _WARNING_FLAG:
+        return NodeState.WARNING
+    return state
+
+
+def _iter_find(data: bytes, pattern: bytes, itemsize: int) -> "Generator[int]":
+    """yield the indices of all items equal to pattern, in the bytes of an array, searching in C instead of Python"""
+    position = data.find(pattern)
+    while position != -1:
+        if position % itemsize:
+            # the pattern started in the middle of an item
+            position = data.find(pattern, position + 1)
+            continue
+        yield position // itemsize
+        position = data.find(pattern, position + itemsize)
+
+
+def _find_all(data: bytes, pattern: bytes, itemsize: int) -> "list[int]":
+    """return the indices of all items equal to pattern, see _iter_find"""
+    return list(_iter_find(data, pattern, itemsize))
+
+
+class _ResultNodeView(ResultNode):
+    """
+    a ResultNode created on access, for a result saved in a ResultList.
+    changing its state updates the result in the ResultList
+    """
+
+    __slots__ = ("_row",)
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError("result node views are created by a ResultList")
+
+
+class ResultList:
+    """
+    the results of 1 validator, saved in columns: a state code, and a data node id per result.
+    replaces the validator's children if the session uses columnar results, see Session.columnar_results
+    behaves like the ChildList of ResultNodes, but only creates a ResultNode when it's accessed
+    """
+
+    __hash__ = None  # mutable, like a list
+
+    def __init__(self, store: "ResultStore", validator: "Validator"):
+        self._store = store
+        self._validator = validator
+        self.state_codes = array("B")  # row -> state code
+        self.data_node_ids = array("I")  # row -> data node id in the store
+        # row -> index in self.failures, 0 if the result has no failure. None until a result has a failure
+        self.failure_ids: "Optional[array]" = None
+        self.failures = [None]  # the FailureRecords of the results, each record once
+        self._failure_ids = {}  # id(record) -> index in self.failures
+        self._views = weakref.WeakValueDictionary()  # row -> ResultNode created on access
+
+    def add(
+        self, data_node: "DataNode", state: NodeState, warning: bool = False, failure: "Optional[FailureRecord]" = None
+    ) -> int:
+        """save the result of a validation of a DataNode, returns its row"""
+        code = _state_code(state, warning)
+        with _state_lock:
+            if failure is not None or self.failure_ids is not None:
+                self._add_failure(failure)
+            self.data_node_ids.append(self._store._acquire(data_node))
+            self.state_codes.append(code)
+            data_node._count_result_state(_code_state(code), 1)
+            return len(self.state_codes) - 1
+
+    def _add_failure(self, failure: "Optional[FailureRecord]"):
+        """save the failure of the next row, interned records are saved once"""
+        if self.failure_ids is None:
+            self.failure_ids = array("I", bytes(4 * len(self.state_codes)))  # no failures in the previous rows
+        failure_id = 0
+        if failure is not None:
+            failure_id = self._failure_ids.get(id(failure))
+            if failure_id is None:
+                failure_id = self._failure_ids[id(failure)] = len(self.failures)
+                self.failures.append(failure)
+        self.failure_ids.append(failure_id)
+
+    def get_failure(self, row: int) -> "Optional[FailureRecord]":
+        """the failure of the result in a row"""
+        if self.failure_ids is None:
+            return None
+        return self.failures[self.failure_ids[row]]
+
+    def iter_failures(self) -> "Generator[tuple[ResultNode, FailureRecord]]":
+        """yield (result node, failure) for the results with a failure, only creating the ResultNodes of those"""
+        if self.failure_ids is None:
+            return
+        failures = self.failures
+        for row, failure_id in enumerate(self.failure_ids):
+            if failure_id:
+                yield self[row], failures[failure_id]
+
+    def append(self, node):
+        raise TypeError(f"can't add {node!r} to columnar results, validators save results with ResultList.add")
+
+    extend = append
+
+    def remove(self, node: "ResultNode"):
+        row = getattr(node, "_row", None)
+        if row is None or self._views.get(row) is not node:
+            raise ValueError(f"{node!r} is not a child")
+        with _state_lock:
+            self._remove_row(row)
+            del self._views[row]
+            node._row = None
+            # the next views move up a row
+            for view_row, view in sorted(self._views.items()):
+                if view_row > row:
+                    del self._views[view_row]
+                    view._row = view_row - 1
+                    self._views[view_row - 1] = view
+
+    def _remove_row(self, row: int):
+        code = self.state_codes.pop(row)
+        data_node_id = self.data_node_ids.pop(row)
+        if self.failure_ids is not None:
+            self.failure_ids.pop(row)
+        self._discount(code, data_node_id)
+
+    def _discount(self, code: int, data_node_id: int):
+        """remove a result from the state counts of its DataNode"""
+        state = _code_state(code)
+        self._store._data_nodes[data_node_id]._count_result_state(state, -1)
+        self._store._release(data_node_id)
+
+    def clear(self):
+        with _state_lock:
+            for code, data_node_id in zip(self.state_codes, self.data_node_ids):
+                self._discount(code, data_node_id)
+            self.state_codes = array("B")
+            self.data_node_ids = array("I")
+            self.failure_ids = None
+            self.failures = [None]
+            self._failure_ids = {}
+            # views created before can't change the results anymore
+            for view in list(self._views.values()):
+                view._row = None
+                view.parent = None
+            self._views = weakref.WeakValueDictionary()
+
+    def _update_state(self, node: "ResultNode", old_state: NodeState, new_state: NodeState):
+        """called by a ResultNode view when its state changed"""
+        with _state_lock:
+            row = node._row
+            if row is None or self._views.get(row) is not node:
+                return
+            self.state_codes[row] = _state_code(node._state, node._warning)
+            node.data_node._result_state_changed(old_state, new_state)
+
+    @property
+    def state_counts(self) -> "dict[NodeState, int]":
+        """the nr of results in each state, counted in C instead of per result"""
+        codes = self.state_codes.tobytes()
+        state_counts = {}
+        for code in _CODES:
+            count = codes.count(bytes([code]))
+            if count:
+                _count_state(state_counts, _code_state(code), count)
+        return state_counts
+
+    def iter_data_nodes(self, state: NodeState) -> "Generator[DataNode]":
+        """yield the DataNodes with a result in this state, in order. e.g. all failed DataNodes"""
+        codes = self.state_codes.tobytes()
+        rows = []
+        for code in _CODES:
+            if _code_state(code) == state:
+                rows.extend(_find_all(codes, bytes([code]), 1))
+        for row in sorted(rows):
+            yield self._store._data_nodes[self.data_node_ids[row]]
+
+    def iter_state(self, states: "Iterable[NodeState]") -> "Generator[ResultNode]":
+        """yield the results in any of these states in order, searching the state codes in C, like ChildList.iter_state"""
+        states = set(states)
+        codes = self.state_codes.tobytes()
+        rows = [_iter_find(codes, bytes([code]), 1) for code in _CODES if _code_state(code) in states]
+        for row in heapq.merge(*rows):
+            yield self._view(row)
+
+    def _rows(self, data_node_id: int) -> "list[int]":
+        """the rows of the results of a data node"""
+        pattern = array(self.data_node_ids.typecode, [data_node_id]).tobytes()
+        return _find_all(self.data_node_ids.tobytes(), pattern, self.data_node_ids.itemsize)
+
+    def _view(self, row: int) -> ResultNode:
+        view = self._views.get(row)
+        if view is not None:
+            return view
+        data_node = self._store._data_nodes[self.data_node_ids[row]]
+        code = self.state_codes[row]
+        # set the slots like ResultNode.__init__, without linking the view to the DataNode
+        view = _ResultNodeView.__new__(_ResultNodeView)
+        view._state = _STATES[code & ~_WARNING_FLAG]
+        view._warning = bool(code & _WARNING_FLAG)
+        view._actions = list(data_node._actions) if data_node._actions else None
+        view._children = None
+        view._child_actions = None
+        view.parent = self._validator
+        view._name = data_node.name
+        view.data_node = data_node
+        view._linked = False
+        view.failure = self.get_failure(row)
+        view._row = row
+        self._views[row] = view
+        return view
+
+    def get_by_name(self, name) -> "ResultNode|None":
+        """return the first result of a DataNode with this name, or None"""
+        for row, data_node_id in enumerate(self.data_node_ids):
+            if self._store._data_nodes[data_node_id].name == name:
+                return self._view(row)
+        return None
+
+    def __getitem__(self, index):
+        rows = range(len(self))[index]
+        if isinstance(rows, range):
+            return [self._view(row) for row in rows]
+        return self._view(rows)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self._view(row)
+
+    def __reversed__(self):
+        for row in reversed(range(len(self))):
+            yield self._view(row)
+
+    def __len__(self):
+        return len(self.state_codes)
+
+    def __contains__(self, node):
+        row = getattr(node, "_row", None)
+        return row is not None and self._views.get(row) is node
+
+    def __eq__(self, other):
+        if isinstance(other, (ResultList, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ResultList({self._validator}, {len(self)} results)"
+
+
+class ResultStore:
+    """
+    saves the validation results of a session in columns, instead of a ResultNode object per result,
+    so sessions with many DataNodes & validators fit in memory. see Session.columnar_results
+
+    each validator saves its results in a ResultList, that replaces its children.
+    the store gives each DataNode with results an id, so a result takes a few bytes instead of a ResultNode
+    """
+
+    def __init__(self, session: "Session"):
+        self.session = session
+        self._data_nodes = []  # data node id -> DataNode, or None if the id is free
+        self._data_node_ids = {}  # DataNode -> data node id
+        self._row_counts = array("I")  # data node id -> nr of results of the DataNode
+        self._free_ids = []  # ids of DataNodes without results, reused for new DataNodes
+
+    def results(self, validator: "Validator") -> ResultList:
+        """return the ResultList of a validator, and use it as the validator's children"""
+        results = validator._children
+        if not isinstance(results, ResultList):
+            validator.delete_children()  # e.g. ResultNodes from a run before columnar results were enabled
+            results = validator._children = ResultList(self, validator)
+        return results
+
+    def _acquire(self, data_node: "DataNode") -> int:
+        """return the id of a DataNode, and count a result of it"""
+        data_node_id = self._data_node_ids.get(data_node)
+        if data_node_id is None:
+            if self._free_ids:
+                data_node_id = self._free_ids.pop()
+                self._data_nodes[data_node_id] = data_node
+            else:
+                data_node_id = len(self._data_nodes)
+                self._data_nodes.append(data_node)
+                self._row_counts.append(0)
+            self._data_node_ids[data_node] = data_node_id
+        self._row_counts[data_node_id] += 1
+        return data_node_id
+
+    def _release(self, data_node_id: int):
+        """uncount a result of a DataNode, and free its id when it has no results left"""
+        self._row_counts[data_node_id] -= 1
+        if not self._row_counts[data_node_id]:
+            del self._data_node_ids[self._data_nodes[data_node_id]]
+            self._data_nodes[data_node_id] = None
+            self._free_ids.append(data_node_id)
+
+    def iter_result_lists(self) -> "Generator[ResultList]":
+        """the ResultLists of the validators in the session, in session order"""
+        for node in self.session.children:
+            if isinstance(node._children, ResultList):
+                yield node._children
+
+    def result_nodes(self, data_node: "DataNode") -> "list[ResultNode]":
+        """return the results of a DataNode as ResultNodes, in session order"""
+        data_node_id = self._data_node_ids.get(data_node)
+        if data_node_id is None:
+            return []
+        return [
+            result_list._view(row)
+            for result_list in self.iter_result_lists()
+            for row in result_list._rows(data_node_id)
+        ]
+
+    def state_counts(self, result_lists: "Iterable[ResultList]|None" = None) -> "dict[NodeState, int]":
+        """the nr of results in each state, of all validators or the given ResultLists"""
+        state_counts = {}
+        for result_list in self.iter_result_lists() if result_lists is None else result_lists:
+            for state, count in result_list.state_counts.items():
+                _count_state(state_counts, state, count)
+        return state_counts
+
+    def __contains__(self, data_node: "DataNode"):
+        """True if the DataNode has results in this store"""
+        return data_node in self._data_node_ids
+
+    def __len__(self):
+        """the nr of results"""
+        return sum(len(result_list) for result_list in self.iter_result_lists())
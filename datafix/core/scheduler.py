@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional, TYPE_CHECKING
+import heapq
+
+if TYPE_CHECKING:
+    from datafix.core.node import Node
+
+
+class DependencyCycleError(Exception):
+    """raised before a session runs, if nodes depend on each other in a cycle"""
+
+
+def sort_nodes(nodes: "list[Node]", dependencies: "dict[Node, list[Node]]") -> "list[Node]":
+    """
+    sort the nodes so each node comes after its dependencies, ready nodes keep their original order.
+    raises DependencyCycleError if nodes depend on each other in a cycle
+    """
+    order = {node: index for index, node in enumerate(nodes)}
+    waiting, dependents = _get_waiting(nodes, dependencies)
+    ready = [order[node] for node in nodes if not waiting[node]]
+    heapq.heapify(ready)
+    sorted_nodes = []
+    while ready:
+        node = nodes[heapq.heappop(ready)]
+        sorted_nodes.append(node)
+        for dependent in dependents[node]:
+            waiting[dependent].discard(node)
+            if not waiting[dependent]:
+                heapq.heappush(ready, order[dependent])
+    if len(sorted_nodes) < len(nodes):
+        cycle = _find_cycle([node for node in nodes if waiting[node]], dependencies)
+        raise DependencyCycleError("nodes depend on each other: " + " -> ".join(node.name for node in cycle))
+    return sorted_nodes
+
+
+def _get_waiting(nodes, dependencies):
+    """returns the dependencies each node waits for, and the dependents of each node"""
+    waiting = {node: set(dependencies.get(node, ())) for node in nodes}
+    dependents = {node: [] for node in nodes}
+    for node in nodes:
+        for dependency in waiting[node]:
+            dependents[dependency].append(node)
+    return waiting, dependents
+
+
+def _find_cycle(nodes: "list[Node]", dependencies: "dict[Node, list[Node]]") -> "list[Node]":
+    """returns a cycle e.g. [a, b, a], from nodes that all wait for a dependency that's in a cycle"""
+    remaining = set(nodes)
+    path = [nodes[0]]
+    while True:
+        node = next(dependency for dependency in dependencies[path[-1]] if dependency in remaining)
+        if node in path:
+            return path[path.index(node) :] + [node]
+        path.append(node)
+
+
+def run_nodes(
+    nodes: "list[Node]",
+    dependencies: "dict[Node, list[Node]]",
+    run_node: "Callable[[Node], None]",
+    max_workers: "Optional[int]" = None,
+    run_in_pool: "Optional[Callable[[Node], bool]]" = None,
+):
+    """
+    run each node as soon as its dependencies finished, independent nodes run in parallel in a thread pool.
+    nodes for which run_in_pool returns False run in the calling thread, e.g. collectors that use a DCC's api.
+    if run_node raises, no new nodes start, and the error is raised when the running nodes finished
+    """
+    order = {node: index for index, node in enumerate(sort_nodes(nodes, dependencies))}
+    waiting, dependents = _get_waiting(nodes, dependencies)
+    ready = sorted((node for node in nodes if not waiting[node]), key=order.get)
+    error = None
+
+    def finish(node):
+        for dependent in dependents[node]:
+            waiting[dependent].discard(node)
+            if not waiting[dependent]:
+                ready.append(dependent)
+        ready.sort(key=order.get)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}  # future -> node
+        while True:
+            if error is None and ready:
+                local_nodes = []
+                for node in ready:
+                    if run_in_pool is None or run_in_pool(node):
+                        running[pool.submit(run_node, node)] = node
+                    else:
+                        local_nodes.append(node)
+                ready[:] = local_nodes
+                if ready:
+                    # run 1 node in this thread, then start any nodes that are ready now
+                    node = ready.pop(0)
+                    try:
+                        run_node(node)
+                    except Exception as e:
+                        error = e
+                    finish(node)
+                    continue
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda future: order[running[future]]):
+                node = running.pop(future)
+                if future.exception() is not None and error is None:
+                    error = future.exception()
+                finish(node)
+    if error is not None:
+        raise error
@@ -1,7 +1,29 @@
+import time
+import queue
+import asyncio
 import logging
-from typing import Type, Optional, Generator
+import threading
+from functools import partial
+from contextlib import contextmanager, nullcontext
+from typing import Type, Optional, Generator, Iterable, Iterator, List, Dict, TextIO, Union
 from datafix.core.collector import Collector
-from datafix.core.node import Node, NodeState
+from datafix.core.datanode import DataNode
+from datafix.core.validator import Validator, _validate_datas, _map_jobs
+from datafix.core.executor import Executor
+from datafix.core.cache import ResultCache, AdaptedDataCache
+from datafix.core.resultstore import ResultStore, ResultList
+from datafix.core.resultnode import ResultNode
+from datafix.core.failure import FailureTable
+from datafix.core.profile import Profile, _call_timed
+from datafix.core.trace import Tracer
+from datafix.core.export import export
+from datafix.core.query import query
+from datafix.core.index import DataNodeIndex
+from datafix.core.adapter import find_adapter_chain
+from datafix.core.scheduler import sort_nodes, run_nodes
+from datafix.core.node import Node, NodeState, _state_lock, _count_state
+
+_MISSING = object()  # a value that's not cached
 
 
 class Session(Node):
@@ -9,10 +31,93 @@ class Session(Node):
 
     __active_session: "Optional[Session]" = None
 
+    # run validators concurrently after all collectors finished, e.g. ThreadExecutor(max_workers=8)
+    # None runs all nodes serially, in the order they were added
+    executor: "Optional[Executor]" = None
+
+    # if True, run() reuses the cached results of DataNodes with an unchanged fingerprint
+    incremental = False
+
+    # if True, validators validate each DataNode as soon as it's collected, while the collectors keep collecting
+    stream = False
+    # max nr of collected DataNodes waiting to be validated, collectors pause when the buffer is full
+    stream_buffer_size = 1000
+
+    # max nr of adapted data to reuse during a run, when several validators require the same type. 0 disables it
+    adapted_data_cache_size = 1000
+    # max nr of data adapted in 1 call of Adapter.adapt_many
+    adapt_batch_size = 1000
+    # if True, DataNodes keep their adapted data after a run, so actions can reuse it, see DataNode.adapt
+    keep_adapted_data = False
+
+    # if True, stop the run as soon as a node or validation fails (a warning doesn't stop it), e.g. for CI.
+    # nodes that didn't start are skipped, running validators stop validating, see Session.stop
+    fail_fast = False
+
+    # if True, record the time each node & adapter takes in a run, see Session.profile
+    profiling = True
+    # if set, save a timeline of each run to this path as a Chrome trace, see Tracer.
+    # slower than profiling, it records a span per validated DataNode
+    trace_path: "Optional[str]" = None
+
+    # max nr of async collections & validations running at the same time in arun()
+    max_concurrency = 100
+
+    # max length of the error message saved on a failed ResultNode, longer messages are cut, see FailureRecord
+    max_failure_message_length = 1000
+    # max nr of items in the payload saved on a failed ResultNode, e.g. the ids of bad faces, see ValidationError
+    max_failure_payload_items = 100
+
+    # if True, validators save their results in columns instead of a ResultNode per result, to save memory.
+    # ResultNodes are created when accessed, e.g. when iterating validator.children, see ResultStore
+    columnar_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         type(self).__active_session = self
-        self.adapters = []
+        self.adapters = []  # use register_adapter to add adapters
+        self._adapter_chains = {}  # (data type, required type) -> chain of adapters, or None if there is none
+        self.result_cache: "Optional[ResultCache]" = None  # stores validation results for incremental runs
+        self.cached_result_count = 0  # nr of results served from the cache in the last run
+        self._incremental = False  # True while running incrementally
+        self._data_node_index = DataNodeIndex()  # all DataNodes in this session, by data type
+        self._result_store: "Optional[ResultStore]" = None
+        self._adapted_data_cache: "Optional[AdaptedDataCache]" = None  # only exists while running
+        self._stop_event: "Optional[threading.Event]" = None  # only exists while running, see stop
+        self.stopped_by: "Optional[Node]" = None  # the node that stopped the last run, if it stopped early
+        self.skipped_validation_count = 0  # nr of validations skipped because the last run stopped early
+        self.time_saved = 0.0  # estimated seconds saved by stopping the last run early
+        self._validation_time = 0.0  # seconds spent validating in this run, to estimate the time saved
+        self._validation_count = 0  # nr of validations in this run
+        # creates the FailureRecords of failed results, see Validator._create_result_node
+        self._failure_table = FailureTable(self.max_failure_message_length, self.max_failure_payload_items)
+        # the time each node & adapter took in the last run, None if not profiling
+        self.profile: "Optional[Profile]" = Profile() if self.profiling else None
+
+    @property
+    def result_state_counts(self) -> "dict[NodeState, int]":
+        """the nr of results in each state, in the whole session. summed from the validators' counts"""
+        state_counts = {}
+        for node in self.children:
+            if isinstance(node, Validator) and node._children:
+                for state, count in node._children.state_counts.items():
+                    _count_state(state_counts, state, count)
+        return state_counts
+
+    @property
+    def result_store(self) -> "Optional[ResultStore]":
+        """the columnar results of the validators, None unless self.columnar_results"""
+        if not self.columnar_results:
+            return None
+        if self._result_store is None:
+            self._result_store = ResultStore(self)
+        return self._result_store
+
+    @property
+    def tracer(self) -> "Optional[Tracer]":
+        """the timeline of the last run, None unless self.trace_path is set"""
+        profile = self.profile
+        return profile if isinstance(profile, Tracer) else None
 
     def append(self, node: Type[Node]):
         # convenience method to add a node to the session, unsure if i ll keep it
@@ -29,23 +134,438 @@ class Session(Node):
             # todo support list of type x
             #  e.g. List[Type[Mesh]]
 
-            if required_type:
-                # if a type is required, only return collectors of matching type
-                if collector.data_type and issubclass(collector.data_type, required_type):
-                    yield collector
-                # else:
-                #     logging.info(f"collector '{collector}' does not match datatype '{required_type}'")
-            else:
-                # no required type, allow all collectors
+            if self._collector_matches(collector, required_type):
                 yield collector
 
-    def run(self):
-        self.state = NodeState.RUNNING
-        for node in self.children:
+    def iter_data_nodes(self, required_type=None) -> "Generator[DataNode]":
+        """
+        return all DataNodes with data of the required type, or data that can be adapted to it.
+        in collection order: by collector in session order, and in the order each collector created them
+        """
+        types = [data_type for data_type in self._data_node_index.types if self._type_matches(data_type, required_type)]
+        return self._data_node_index.iter_data_nodes(self.children, types)
+
+    def _type_matches(self, data_type: type, required_type=None) -> bool:
+        """True if data of data_type is of the required type, or can be adapted to it"""
+        if not required_type:
+            return True
+        return self._get_adapter_chain(data_type, required_type) is not None
+
+    def _get_adapter_chain(self, data_type: type, required_type: type) -> "Optional[tuple]":
+        """the adapters that convert data_type to required_type, resolved once, see find_adapter_chain"""
+        key = data_type, required_type
+        try:
+            return self._adapter_chains[key]
+        except KeyError:
+            chain = self._adapter_chains[key] = find_adapter_chain(self.adapters, data_type, required_type)
+            return chain
+
+    @staticmethod
+    def _collector_matches(collector: Collector, required_type=None) -> bool:
+        """True if the collector collects the required type"""
+        if required_type:
+            # if a type is required, only return collectors of matching type
+            return bool(collector.data_type and issubclass(collector.data_type, required_type))
+        # no required type, allow all collectors
+        return True
+
+    def run(self, incremental: "Optional[bool]" = None):
+        """
+        run all nodes in the session, each node after the nodes it depends on, see Node.depends_on
+        incremental: reuse the results of unchanged DataNodes from previous runs, defaults to self.incremental
+        """
+        order = self.get_run_order()  # raises before running anything if nodes depend on each other
+        with self._run_context(incremental):
+            if self.stream:
+                self._run_streaming(order)
+            elif self.executor:
+                self._run_parallel(order)
+            else:
+                for node in order:
+                    self._run_node(node)
+
+    async def arun(self, incremental: "Optional[bool]" = None, max_concurrency: "Optional[int]" = None):
+        """
+        run all nodes in the session in the running event loop, e.g. asyncio.run(session.arun())
+        async nodes (see AsyncCollector & AsyncValidator) run concurrently, as soon as the nodes they depend on finished.
+        sync validators run in a thread, other sync nodes such as collectors run in the event loop's thread.
+        max_concurrency: the max nr of async collections & validations at the same time, defaults to self.max_concurrency
+        """
+        order = self.get_run_order()
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        dependencies = self.get_dependencies()
+        loop = asyncio.get_running_loop()
+        tasks = {}  # node -> task running the node
+
+        async def run_node(node):
+            await asyncio.gather(*(tasks[dependency] for dependency in dependencies[node]))
+            if self._stopped:
+                self._skip_node(node)
+                return
+            start = time.perf_counter()
             with node.node_state_setter():
-                node.run()
+                arun_node = getattr(node, "_arun", None)
+                if arun_node is not None:
+                    await arun_node(semaphore)
+                elif isinstance(node, Validator):
+                    await loop.run_in_executor(None, node.run)
+                else:
+                    node.run()
+            self._node_finished(node, time.perf_counter() - start)
+
+        with self._run_context(incremental):
+            for node in order:  # dependencies first, so their tasks exist
+                tasks[node] = asyncio.ensure_future(run_node(node))
+            try:
+                await asyncio.gather(*tasks.values())
+            except BaseException:
+                # a node raised, stop the other nodes like a serial run
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                raise
+
+    @contextmanager
+    def _run_context(self, incremental: "Optional[bool]" = None):
+        """prepare the caches for a run, and clean up after the run, also if it failed"""
+        self.state = NodeState.RUNNING
+        self._incremental = self.incremental if incremental is None else incremental
+        if self._incremental and self.result_cache is None:
+            self.result_cache = ResultCache()
+        if self.result_cache is not None:
+            self.result_cache.reset_stats()
+        self.cached_result_count = 0
+        self.profile = Tracer() if self.trace_path else Profile() if self.profiling else None
+        if self.adapted_data_cache_size:
+            self._adapted_data_cache = AdaptedDataCache(self.adapted_data_cache_size)
+        self._stop_event = threading.Event()
+        self.stopped_by = None
+        # a new table per run, so errors of old runs aren't kept
+        self._failure_table = FailureTable(self.max_failure_message_length, self.max_failure_payload_items)
+        self.skipped_validation_count = 0
+        self.time_saved = 0.0
+        self._validation_time = 0.0
+        self._validation_count = 0
+
+        try:
+            yield
+        finally:
+            self._incremental = False
+            self._adapted_data_cache = None
+            self._stop_event = None
+            if self.result_cache is not None:
+                self.result_cache.flush()
+            if self.tracer is not None and self.trace_path:
+                self.tracer.save(self.trace_path)  # also save the trace of a failed run
+
+        if self.result_cache is not None:
+            self.cached_result_count = self.result_cache.hits
+            if self.cached_result_count:
+                logging.info(f"{self} reused {self.cached_result_count} cached results")
+        if self.stopped_by is not None:
+            self._estimate_time_saved()
         self.set_state_from_children()
 
+    def stop(self, node: "Optional[Node]" = None):
+        """
+        stop the running session: nodes that didn't start yet are skipped, running validators stop validating.
+        validations that already started still finish. does nothing if the session isn't running
+        node: the node that stopped the session, e.g. a validator that failed in fail fast mode
+        """
+        with _state_lock:
+            if self._stop_event is None or self._stop_event.is_set():
+                return
+            self.stopped_by = node
+            self._stop_event.set()
+
+    @property
+    def _stopped(self) -> bool:
+        """True if the running session was stopped, see stop"""
+        stop_event = self._stop_event
+        return stop_event is not None and stop_event.is_set()
+
+    def _estimate_time_saved(self):
+        """count the validations skipped by stopping early, and estimate the time they would have taken"""
+        for node in self.children:
+            if isinstance(node, Validator):
+                self.skipped_validation_count += node._skipped_count
+        if self._validation_count:
+            # assume a skipped validation takes as long as the average validation in this run
+            self.time_saved = self._validation_time / self._validation_count * self.skipped_validation_count
+        skipped_nodes = sum(1 for node in self.children if node.state == NodeState.SKIPPED)
+        logging.info(
+            f"{self} stopped after '{self.stopped_by}' failed, skipped {skipped_nodes} nodes "
+            f"and {self.skipped_validation_count} validations, saving about {self.time_saved:.2f}s"
+        )
+
+    def get_dependencies(self) -> "Dict[Node, List[Node]]":
+        """
+        returns the nodes each node waits for in a run, see Node.depends_on.
+        by default a validator waits for all collectors & other nodes that aren't validators,
+        and the other nodes wait for the previous node that isn't a validator, so collectors run in order
+        """
+        nodes = list(self.children)
+        non_validators = [node for node in nodes if not isinstance(node, Validator)]
+        dependencies = {}
+        previous_node = []  # the previous node that isn't a validator
+        for node in nodes:
+            if node.depends_on is not None:
+                dependencies[node] = self._resolve_dependencies(node, nodes)
+            elif isinstance(node, Validator):
+                dependencies[node] = non_validators
+            else:
+                dependencies[node] = previous_node
+            if not isinstance(node, Validator):
+                previous_node = [node]
+        return dependencies
+
+    def _resolve_dependencies(self, node: Node, nodes: "List[Node]") -> "List[Node]":
+        dependencies = {}  # dict to keep the order & skip duplicates
+        for dependency in node.depends_on:
+            if isinstance(dependency, Node):
+                if dependency not in self.children:
+                    raise ValueError(f"{node} depends on {dependency}, which is not in the session")
+                matches = [dependency]
+            elif isinstance(dependency, str):
+                matches = [other for other in nodes if other.name == dependency]
+            elif isinstance(dependency, type) and issubclass(dependency, Node):
+                matches = [other for other in nodes if isinstance(other, dependency)]
+            elif isinstance(dependency, type):
+                # collectors that collect the data type, or that didn't collect anything yet
+                matches = [
+                    other
+                    for other in nodes
+                    if isinstance(other, Collector)
+                    and (other.data_type is None or self._type_matches(other.data_type, dependency))
+                ]
+            else:
+                raise TypeError(f"{node} can't depend on {dependency!r}, expected a node, node class, name or type")
+            dependencies.update((match, None) for match in matches if match is not node)
+        return list(dependencies)
+
+    def get_run_order(self) -> "List[Node]":
+        """
+        returns the nodes in the order they run, after the nodes they depend on.
+        raises DependencyCycleError if nodes depend on each other in a cycle
+        """
+        return sort_nodes(list(self.children), self.get_dependencies())
+
+    def _run_parallel(self, order: "List[Node]"):
+        """
+        run each node as soon as the nodes it depends on finished, validators run concurrently with the executor.
+        other nodes such as collectors run in this thread, in order
+        """
+        if self.executor.processes:
+            self._run_in_processes(order)
+        else:
+            run_nodes(
+                order,
+                self.get_dependencies(),
+                self._run_node,
+                max_workers=self.executor.max_workers,
+                run_in_pool=lambda node: isinstance(node, Validator),
+            )
+
+        # validators finish in any order, sort the results on the DataNodes in session order
+        # so reports are the same as a serial run
+        # columnar results are already in session order
+        order = {node: index for index, node in enumerate(self.children)}
+        for data_node in self.iter_data_nodes():
+            if data_node._result_nodes:
+                data_node._result_nodes.sort(key=lambda result_node: order.get(result_node.parent, -1))
+
+    def _run_in_processes(self, order: "List[Node]"):
+        """
+        run the nodes in waves, the validators of a wave run in worker processes at the same time.
+        a wave has all nodes whose dependencies finished in the previous waves
+        """
+        dependencies = self.get_dependencies()
+        waves = {}  # node -> wave nr
+        for node in order:
+            waves[node] = max((waves[dependency] + 1 for dependency in dependencies[node]), default=0)
+        for wave in range(max(waves.values(), default=-1) + 1):
+            nodes = [node for node in order if waves[node] == wave]
+            for node in nodes:
+                if not isinstance(node, Validator):
+                    self._run_node(node)
+            self._run_validators_in_processes([node for node in nodes if isinstance(node, Validator)])
+
+    def _run_streaming(self, order: "List[Node]"):
+        """
+        run the collectors & other nodes in this thread, and validate their DataNodes in a background thread,
+        as soon as they are collected. collectors stay in this thread, like in Scheduler.run_nodes, since DCC APIs
+        usually aren't thread safe. validators that can't validate DataNodes 1 by 1,
+        or that depend on specific nodes, run after collection in order
+        """
+        validators = [node for node in order if isinstance(node, Validator)]
+        streaming_validators = [v for v in validators if v._supports_streaming and v.depends_on is None]
+        other_validators = [v for v in validators if v not in streaming_validators]
+
+        buffer = queue.Queue(maxsize=self.stream_buffer_size)
+        done = object()  # put in the buffer when collection finished
+        stop = threading.Event()  # set when validation stopped, so the collectors stop too
+        validate_errors = []
+
+        def put(item):
+            # wait while the buffer is full, unless validation stopped
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def validate():
+            try:
+                matching_validators = {}  # data type -> validators that validate data of this type
+                while True:
+                    data_node = buffer.get()
+                    if data_node is done:
+                        break
+                    data_type = type(data_node.data)
+                    if data_type not in matching_validators:
+                        matching_validators[data_type] = [
+                            validator
+                            for validator in streaming_validators
+                            if self._type_matches(data_type, validator.required_type)
+                        ]
+                    for validator in matching_validators[data_type]:
+                        self._validate_streamed_data_node(validator, data_node)
+                    if self._stopped:
+                        break
+            except Exception as e:
+                validate_errors.append(e)
+            finally:
+                stop.set()
+
+        def collect():
+            for node in order:
+                if isinstance(node, Validator):
+                    continue
+                if not isinstance(node, Collector) or self._stopped:
+                    self._run_node(node)
+                    continue
+                if not node._supports_streaming:
+                    # the collector overrides run(), validate its DataNodes once it finished
+                    self._run_node(node)
+                    if not all(put(data_node) for data_node in node.data_nodes):
+                        return
+                    continue
+                start = time.perf_counter()
+                for data_node in node._iter_run():
+                    if not put(data_node):
+                        return
+                self._node_finished(node, time.perf_counter() - start)
+
+        for validator in streaming_validators:
+            validator.delete_children()
+            validator.state = NodeState.RUNNING
+
+        validate_thread = threading.Thread(target=validate, name=f"{self} validate", daemon=True)
+        start = time.perf_counter()
+        validate_thread.start()
+        try:
+            collect()
+        finally:
+            put(done)
+            validate_thread.join()
+            self._count_validations(
+                time.perf_counter() - start, sum(len(validator._children or ()) for validator in streaming_validators)
+            )
+
+        if validate_errors:
+            raise validate_errors[0]
+
+        for validator in streaming_validators:
+            validator._set_state_from_results()
+        for validator in other_validators:
+            self._run_node(validator)
+
+    @staticmethod
+    def _validate_streamed_data_node(validator: Validator, data_node):
+        try:
+            validator._validate_or_reuse_data_node(data_node)
+        except Exception as e:
+            # only raises if the validator doesn't continue on fail, stop the session like a serial run
+            validator.state = NodeState.FAIL
+            validator.log_error(f"'{validator.__class__.__name__}' failed running: '{e}'")
+            raise
+
+    def _run_node(self, node: Node):
+        """run a node, or skip it if the session stopped"""
+        if self._stopped:
+            self._skip_node(node)
+            return
+        start = time.perf_counter()
+        with node.node_state_setter():
+            node.run()
+        self._node_finished(node, time.perf_counter() - start)
+
+    @staticmethod
+    def _skip_node(node: Node):
+        node.delete_children()  # don't report the results of a previous run
+        node.state = NodeState.SKIPPED
+
+    def _node_finished(self, node: Node, duration: float):
+        """count the validation time, and stop the session if the node failed in fail fast mode"""
+        if isinstance(node, Validator):
+            self._count_validations(duration, len(node._children or ()))
+        if self.fail_fast and node.state == NodeState.FAIL:
+            self.stop(node)
+
+    def _count_validations(self, duration: float, count: int):
+        with _state_lock:
+            self._validation_time += duration
+            self._validation_count += count
+
+    def _run_validators_in_processes(self, validators: "List[Validator]"):
+        """
+        send the validator class & settings, and the adapted data to the worker processes,
+        and create the ResultNodes from the outcomes they send back. see Validator._worker_settings
+        """
+        # validators that override run() rely on the session, so they run in this process
+        if self._stopped:
+            for validator in validators:
+                self._skip_node(validator)
+            return
+        local_validators = [v for v in validators if not v._runs_in_worker_process]
+        worker_validators = [v for v in validators if v._runs_in_worker_process]
+
+        jobs = []
+        prepared = []  # (validator, data_nodes) for each job
+        for validator in worker_validators:
+            with validator.node_state_setter():
+                job, data_nodes = validator._prepare_worker_job()
+                jobs.append(job)
+                prepared.append((validator, data_nodes))
+
+        start = time.perf_counter()
+        profile = self.profile
+        if profile is None:
+            results = _map_jobs(self.executor, jobs)
+        else:
+            # the workers time the validation, in this process we only see the time to prepare & finish the jobs
+            results = []
+            for (validator, data_nodes), (outcomes, timing) in zip(
+                prepared, _map_jobs(self.executor, jobs, partial(_call_timed, _validate_datas))
+            ):
+                profile.add_worker_timing(validator, timing)
+                results.append(outcomes)
+        self._count_validations(time.perf_counter() - start, sum(len(job.datas) for job in jobs))
+
+        # the workers already validated everything, save all results even if a validator fails in fail fast mode
+        for (validator, data_nodes), outcomes in zip(prepared, results):
+            # the prepare step already counted the run
+            with profile.time_node(validator, calls=0) if profile is not None else nullcontext():
+                with validator.node_state_setter():
+                    validator._finish_worker_job(data_nodes, outcomes)
+            if self.fail_fast and validator.state == NodeState.FAIL:
+                self.stop(validator)
+
+        for validator in local_validators:
+            self._run_node(validator)
+
     def adapt(self, instance, required_type: "type"):
         if not required_type:
             # there is no required type, so we collect all instances
@@ -58,13 +578,188 @@ class Session(Node):
         # for all other instances not of the matching type, we attempt to adapt to type
         # if possible we collect, if no adapter is found, we skip the instance
         # this should not fail, but skip! # todo
-        for adapter in self.adapters:
-            if adapter.type_output == required_type and type(instance) in adapter.input_types:
-                return adapter.run(instance)
-        return None
+        chain = self._get_adapter_chain(type(instance), required_type)
+        if chain is None:
+            return None
+        for adapter in chain:
+            with self._time_adapter(adapter):
+                instance = adapter.run(instance)
+        return instance
+
+    def _time_adapter(self, adapter, items: int = 1):
+        """record the time of an adapter call in the profile"""
+        profile = self.profile
+        return profile.time_call(adapter, items) if profile is not None else nullcontext()
+
+    def adapt_many(self, datas: list, required_type: "type") -> list:
+        """
+        adapt a list of data like self.adapt, with 1 call of Adapter.adapt_many per batch instead of 1 per data.
+        returns a list with the adapted data in the same order, or the exception if adapting a data failed
+        """
+        adapted_datas = list(datas)
+        if not required_type:
+            return adapted_datas
+
+        indices_per_chain = {}  # chain of adapters -> indices of the data it adapts
+        for index, data in enumerate(adapted_datas):
+            if isinstance(data, required_type):
+                continue
+            chain = self._get_adapter_chain(type(data), required_type)
+            if chain is None:
+                adapted_datas[index] = None  # no adapter found, like self.adapt
+            else:
+                indices_per_chain.setdefault(chain, []).append(index)
+
+        for chain, indices in indices_per_chain.items():
+            for start in range(0, len(indices), self.adapt_batch_size):
+                batch = indices[start : start + self.adapt_batch_size]
+                values = [adapted_datas[index] for index in batch]
+                for adapter in chain:
+                    values = self._run_adapter_many(adapter, values)
+                for index, value in zip(batch, values):
+                    adapted_datas[index] = value
+        return adapted_datas
+
+    def _run_adapter_many(self, adapter, values: list) -> list:
+        """adapt the values that didn't fail yet in 1 batch, or 1 by 1 if the batch fails, to find the failing data"""
+        indices = [index for index, value in enumerate(values) if not isinstance(value, Exception)]
+        values = list(values)
+        try:
+            with self._time_adapter(adapter, len(indices)):
+                adapted_values = adapter.run_many([values[index] for index in indices])
+        except Exception:
+            adapted_values = []
+            for index in indices:
+                try:
+                    with self._time_adapter(adapter):
+                        adapted_values.append(adapter.run(values[index]))
+                except Exception as e:
+                    adapted_values.append(e)
+        for index, adapted_value in zip(indices, adapted_values):
+            values[index] = adapted_value
+        return values
+
+    def adapt_data_node(self, data_node: DataNode, required_type: "type"):
+        """
+        adapt the data of a DataNode, like self.adapt.
+        during a run the adapted data is reused, when several validators require the same type
+        """
+        adapted = self._get_adapted_data(data_node, required_type)
+        if adapted is _MISSING:
+            adapted = self.adapt(data_node.data, required_type)
+            self._set_adapted_data(data_node, required_type, adapted)
+        return adapted
+
+    def adapt_data_nodes(self, data_nodes: "List[DataNode]", required_type: "type") -> list:
+        """
+        adapt the data of many DataNodes like adapt_data_node, in batches with Adapter.adapt_many.
+        returns a list with the adapted data in the same order, or the exception if adapting a data failed
+        """
+        adapted_datas = [self._get_adapted_data(data_node, required_type) for data_node in data_nodes]
+        indices = [index for index, adapted in enumerate(adapted_datas) if adapted is _MISSING]
+        if indices:
+            values = self.adapt_many([data_nodes[index].data for index in indices], required_type)
+            for index, value in zip(indices, values):
+                adapted_datas[index] = value
+                if not isinstance(value, Exception):
+                    self._set_adapted_data(data_nodes[index], required_type, value)
+        return adapted_datas
+
+    def _get_adapted_data(self, data_node: DataNode, required_type: "type"):
+        """returns the data if it doesn't need adapting, the adapted data if it's kept or cached, or _MISSING"""
+        data = data_node.data
+        if not required_type or isinstance(data, required_type):
+            return data
+        adapted_data = data_node._adapted_data
+        if adapted_data is not None and required_type in adapted_data:
+            return adapted_data[required_type]
+        cache = self._adapted_data_cache
+        if cache is not None:
+            return cache.get(data_node, required_type, _MISSING)
+        return _MISSING
+
+    def _set_adapted_data(self, data_node: DataNode, required_type: "type", adapted):
+        cache = self._adapted_data_cache
+        if cache is not None:
+            cache.set(data_node, required_type, adapted)
+        if self.keep_adapted_data:
+            if data_node._adapted_data is None:
+                data_node._adapted_data = {}
+            data_node._adapted_data[required_type] = adapted
+
+    @property
+    def _prefetch_size(self) -> int:
+        """
+        the nr of DataNodes a validator adapts in advance, in 1 batch with adapt_data_nodes,
+        before it validates them 1 by 1. the validator keeps the adapted data of its batch until it's validated
+        """
+        if not self.adapters or self._incremental:
+            return 0  # nothing to adapt, or we might not need to validate (or adapt) unchanged data
+        return self.adapt_batch_size
 
     def register_adapter(self, adapter):
         self.adapters.append(adapter)
+        self._adapter_chains.clear()  # a new adapter can change the shortest chains
+
+    def export(self, path: str, format: "Optional[str]" = None):
+        """
+        export the results of the last run to a file, e.g. session.export("results.xml") for a JUnit report in CI.
+        format: 'jsonl', 'parquet', 'arrow' or 'junit', by default based on the file extension, see datafix.core.export
+        """
+        export(self, path, format=format)
+
+    def query(
+        self,
+        node_class: type = Node,
+        state: "Union[NodeState, Iterable[NodeState], None]" = None,
+        validator: "Union[Validator, type, str, None]" = None,
+        data_type: "Optional[type]" = None,
+        name: "Optional[str]" = None,
+    ) -> "Iterator[Node]":
+        """
+        lazily iterate the nodes in the session that match all filters, using the session's indexes instead of
+        walking all nodes. e.g. the failed results of meshes: session.query(ResultNode, NodeState.FAIL, data_type=Mesh)
+        node_class: only nodes of this class, e.g. DataNode, ResultNode or a collector class
+        state: only nodes in this state, or in any of these states
+        validator: only the results of this validator, validator class, or validator name
+        data_type: only DataNodes with data of this type, and their results
+        name: only nodes with a name matching this glob pattern, e.g. "*_LOD0"
+        yields the session's nodes, then the DataNodes, then the results. like iterating a dict, don't change
+        the states of the nodes while iterating, use list(session.query(...)) to change them
+        """
+        return query(self, node_class, state=state, validator=validator, data_type=data_type, name=name)
+
+    def group_failures(self, validator: "Optional[Validator]" = None) -> "Dict[str, List[ResultNode]]":
+        """
+        group the failed (and warning) results of the last run by their error message, the biggest group first.
+        e.g. to see why 3000 items failed: {"mesh has ngons": [ResultNode, ...], ...}
+        validator: only group the results of this validator, by default group the results of all validators
+        """
+        groups = {}  # message -> result nodes
+        validators = [validator] if validator else [node for node in self.children if isinstance(node, Validator)]
+        for node in validators:
+            children = node._children
+            if not children:
+                continue
+            if isinstance(children, ResultList):
+                failures = children.iter_failures()
+            else:
+                failures = ((child, child.failure) for child in children if getattr(child, "failure", None))
+            for result_node, failure in failures:
+                group = groups.get(failure.message)
+                if group is None:
+                    group = groups[failure.message] = []
+                group.append(result_node)
+        return dict(sorted(groups.items(), key=lambda item: len(item[1]), reverse=True))
+
+    def write_report(self, stream: "TextIO", profile: bool = False, **options):
+        """
+        write the report of this session and its nodes to a stream, see Node.write_report for the options
+        profile: add the time each node & adapter took in the last run, slowest first, see self.profile
+        """
+        super().write_report(stream, **options)
+        if profile and self.profile is not None:
+            stream.write(self.profile.report())
 
     def __str__(self) -> str:
         return f"Session({self.name})"
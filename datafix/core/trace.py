@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Optional
+from datafix.core.profile import Profile
+
+
+class Tracer(Profile):
+    """
+    a profile that also records a timeline: a span for each node run, adapter call & DataNode validation,
+    with the process & thread it ran in. save it as a Chrome trace with save(), see Session.trace_path.
+    open the trace in chrome://tracing, https://ui.perfetto.dev or https://www.speedscope.app
+
+    validators in worker processes get 1 span per job, the DataNodes are validated in the worker
+    """
+
+    def __init__(self):
+        super().__init__()
+        # (name, category, start, duration, process id, thread id, args), start in seconds since the tracer started
+        self.events = []
+        self._start = time.perf_counter()
+        self._start_time = time.time()  # to convert start times from worker processes
+        self._thread_names = {}  # (process id, thread id) -> name
+
+    @contextmanager
+    def span(self, name: str, category: str, args: "Optional[dict]" = None):
+        """record a span, e.g. the validation of 1 DataNode"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_span(name, category, start - self._start, time.perf_counter() - start, args=args)
+
+    def _record(self, key: "Hashable", start: float, wall_time: float, cpu_time: float, items: int, calls: int = 1):
+        super()._record(key, start, wall_time, cpu_time, items, calls)
+        name = getattr(key, "name", None) or type(key).__name__
+        args = {"type": type(key).__name__, "items": items, "cpu_time": cpu_time}
+        self._add_span(name, _category(key), start - self._start, wall_time, args=args)
+
+    def add_worker_timing(self, key: "Hashable", timing: tuple):
+        super().add_worker_timing(key, timing)
+        start_time, wall_time, cpu_time, process_id = timing
+        name = getattr(key, "name", None) or type(key).__name__
+        args = {"type": type(key).__name__, "cpu_time": cpu_time}
+        self._add_span(
+            name, "worker", start_time - self._start_time, wall_time, args=args, process_id=process_id, thread_id=0
+        )
+
+    def _add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration: float,
+        args: "Optional[dict]" = None,
+        process_id: "Optional[int]" = None,
+        thread_id: "Optional[int]" = None,
+    ):
+        if process_id is None:
+            process_id = os.getpid()
+        if thread_id is None:
+            thread = threading.current_thread()
+            thread_id = thread.ident
+            self._thread_names.setdefault((process_id, thread_id), thread.name)
+        # appending to a list is thread safe
+        self.events.append((name, category, start, duration, process_id, thread_id, args))
+
+    def to_dict(self) -> dict:
+        """the trace in the Chrome trace event format, timestamps are in microseconds"""
+        trace_events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",  # a complete event, with a start & a duration
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": process_id,
+                "tid": thread_id,
+                "args": args or {},
+            }
+            for name, category, start, duration, process_id, thread_id, args in self.events
+        ]
+        for (process_id, thread_id), name in self._thread_names.items():
+            trace_events.append(
+                {"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id, "args": {"name": name}}
+            )
+        main_process_id = os.getpid()
+        for process_id in {event[4] for event in self.events}:
+            name = "datafix" if process_id == main_process_id else f"worker {process_id}"
+            trace_events.append({"name": "process_name", "ph": "M", "pid": process_id, "args": {"name": name}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str):
+        """save the trace as a Chrome trace json file"""
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, default=str)
+
+
+def _category(key) -> str:
+    """the category of a span, e.g. 'collector', 'validator' or 'adapter'"""
+    for cls in type(key).__mro__:
+        if cls.__name__ in ("Collector", "Validator", "Action", "Adapter"):
+            return cls.__name__.lower()
+    return "node"
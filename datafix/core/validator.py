@@ -1,6 +1,165 @@
+import os
+import pickle
+import logging
+from functools import partial
+from contextlib import nullcontext
+from typing import NamedTuple, Optional, TYPE_CHECKING
 from datafix.core.resultnode import ResultNode
-from datafix.core.node import Node, NodeState
+from datafix.core.resultstore import ResultList
+from datafix.core.node import Node, NodeState, _SUCCEED, _FAIL, _WARNING
 from datafix.core.action import Run
+from datafix.core.executor import Executor
+from datafix.core.failure import FailureRecord, FailureTable
+
+if TYPE_CHECKING:
+    import threading
+    from datafix.core.trace import Tracer
+    from datafix.core.cache import ResultCache
+
+# an outcome is the result of validating 1 data item:
+# None if it passed, the exception or its FailureRecord (from a worker process or validate_batch) if it failed,
+# or NodeState.WARNING
+_PENDING = object()  # the outcome of data that still needs to be validated
+_SKIPPED = object()  # the outcome of data that wasn't validated, because the session stopped
+_NOT_ADAPTED = object()  # the data of a DataNode that wasn't adapted in advance, see Validator._iter_prefetched
+# the failures of data that validate_batch failed without an exception, so the results still have a message
+_BATCH_RETURNED_FALSE = FailureRecord("validate_batch returned False")
+_BATCH_RETURNED_FAIL = FailureRecord("validate_batch returned NodeState.FAIL")
+
+
+class _WorkerJob(NamedTuple):
+    """the work sent to a worker process, only the validator class & settings, and the (adapted) data to validate"""
+
+    validator_class: type
+    datas: list
+    settings: dict  # the validator's instance attributes, e.g. continue_on_fail, see Validator._worker_settings
+    failure_table: "Optional[FailureTable]" = None  # creates the failure records in the worker, with the max sizes
+
+
+class _RunContext(NamedTuple):
+    """the session settings used to validate each DataNode, looked up once per run, see Validator._run_context"""
+
+    session: Node  # the top node, the validator itself if it has no parent
+    tracer: "Optional[Tracer]"
+    result_cache: "Optional[ResultCache]"
+    failure_table: FailureTable
+    columnar_results: bool
+    fail_fast: bool
+    incremental: bool
+    stop_event: "Optional[threading.Event]"  # set when the session stops, see Session.stop
+
+
+def _validate_datas(job: _WorkerJob) -> list:
+    """
+    validate a list of (adapted) data in a worker process, without a session.
+    returns a list with an outcome for each data, exceptions are returned as compact FailureRecords
+    """
+    validator = job.validator_class()
+    validator.__dict__.update(job.settings)
+    failure_table = FailureTable() if job.failure_table is None else job.failure_table
+    outcomes = validator._get_outcomes(job.datas)
+    records = [_to_record(outcome, failure_table) for outcome in outcomes]
+    stopped = not validator.continue_on_fail and outcomes and isinstance(outcomes[-1], Exception)
+    if stopped and _is_picklable(outcomes[-1]):
+        # the validator stopped at this failure, send the exception so the main process raises it like a serial run
+        records[-1] = outcomes[-1]
+    return records
+
+
+def _to_record(outcome, failure_table: FailureTable):
+    """convert an exception to a FailureRecord that can be sent back to the main process"""
+    if not isinstance(outcome, Exception):
+        return outcome
+    record = failure_table.record(outcome)
+    if record.payload is not None and not _is_picklable(record.payload):
+        record.payload = repr(record.payload)
+    return record
+
+
+def _is_picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _holds_node(value) -> bool:
+    """True if the value is a Node, or a container with a Node. pickling a node pickles the whole session"""
+    if isinstance(value, Node):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return any(_holds_node(item) for item in value)
+    if isinstance(value, dict):
+        return any(_holds_node(key) or _holds_node(item) for key, item in value.items())
+    return False
+
+
+def _call_pickled(fn, payload: bytes):
+    """call fn with the job pickled in payload, see _map_jobs"""
+    return fn(pickle.loads(payload))
+
+
+def _map_jobs(executor: Executor, jobs: "list[_WorkerJob]", fn=_validate_datas) -> list:
+    """
+    run fn on each job with the executor, returns the results in order.
+    jobs that can't be pickled to send to a worker process, e.g. data of a DCC, run in this process with a warning
+    """
+    if not executor.processes:
+        return executor.map(fn, jobs)
+    payloads = []  # the pickled job, or None if it can't be pickled
+    for job in jobs:
+        node_settings = [name for name, value in job.settings.items() if _holds_node(value)]
+        if node_settings:
+            # pickling a node pickles the whole session, and the worker has no session to look it up in
+            logging.warning(
+                f"can't send the settings of `{job.validator_class.__name__}` to a worker process, "
+                f"validating it in this process: {', '.join(node_settings)} holds a node"
+            )
+            payloads.append(None)
+            continue
+        try:
+            # pickle here once, so a job that can't be pickled doesn't fail all jobs in the pool
+            payloads.append(pickle.dumps(job, pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            what = "data" if _is_picklable(job.settings) else "settings"
+            logging.warning(
+                f"can't send the {what} of `{job.validator_class.__name__}` to a worker process, "
+                f"validating it in this process: {e}"
+            )
+            payloads.append(None)
+    results = iter(executor.map(partial(_call_pickled, fn), [payload for payload in payloads if payload is not None]))
+    return [fn(job) if payload is None else next(results) for job, payload in zip(jobs, payloads)]
+
+
+def _outcome_from_batch_result(result):
+    """convert a result returned by validate_batch to an outcome"""
+    if result is None:
+        return None
+    if isinstance(result, Exception):
+        return result
+    if isinstance(result, NodeState):
+        if result == NodeState.SUCCEED:
+            return None
+        if result == NodeState.WARNING:
+            return NodeState.WARNING
+        if result == NodeState.FAIL:
+            return _BATCH_RETURNED_FAIL
+        raise ValueError(f"validate_batch returned unsupported state '{result}'")
+    # support bools, and bool-likes such as numpy.bool_
+    return None if result else _BATCH_RETURNED_FALSE
+
+
+def _iter_chunks(items, size: int):
+    """yield lists of up to size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 class Validator(Node):
@@ -14,13 +173,20 @@ class Validator(Node):
 
     required_type = None
 
+    # bump the version when you change the validation logic, to ignore results cached by older versions
+    version = 0
+
+    # opt in to validate the DataNodes of this validator concurrently, e.g. ThreadExecutor(max_workers=8)
+    # results are still saved in collection order, and failures behave the same as a serial run
+    executor: "Optional[Executor]" = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.actions = [Run(parent=self)]
 
-    def _adapt_and_validate_data(self, data):
+    def _adapt_and_validate_data_node(self, data_node):
         """validate the data in the DataNode"""
-        adapted_data = self.session.adapt(data, self.required_type)
+        adapted_data = self.session.adapt_data_node(data_node, self.required_type)
         # todo validator shouldn't care about adapter, node or session mngr should handle this
         return self.validate(adapted_data)
 
@@ -28,47 +194,448 @@ class Validator(Node):
         """the logic to validate the data, override this"""
         raise NotImplementedError()
 
+    def validate_batch(self, datas) -> list:
+        """
+        optional, override this to validate all data in 1 go, e.g. 1 database query instead of 1 per data.
+        returns a list with a result for each data, in the same order:
+        None, True or NodeState.SUCCEED to pass. False, NodeState.FAIL or an exception to fail.
+        NodeState.WARNING to warn.
+        if overridden, run() uses this instead of validate()
+        """
+        raise NotImplementedError()
+
+    @property
+    def _has_validate_batch(self) -> bool:
+        return type(self).validate_batch is not Validator.validate_batch
+
     def validate_data_node(self, data_node):
         # public method, don't override this
         # atm not used by anything else except private datafix logic,
         # but will be used by UI to right-click revalidate
         """run the validation logic on a DataNode, and save the result in a ResultNode"""
+        return self._validate_data_node(data_node, self._run_context())
+
+    def _validate_data_node(self, data_node, context: _RunContext):
+        """validate_data_node, with the session settings of the run"""
+        if self._has_validate_batch:
+            job, entries = self._adapt_data_nodes([data_node], use_cache=False)
+            outcomes = self._get_outcomes(job.datas)
+            return next(self._iter_result_nodes(entries, outcomes))
+
+        outcome = self._get_validation_error(data_node, context=context)
+        return self._create_result_node(data_node, outcome, context=context)
+
+    def _validate_data_node_in_run(self, data_node, context: _RunContext):
+        """validate_data_node in a run, passes the session settings of the run unless validate_data_node is overridden"""
+        if type(self).validate_data_node is not Validator.validate_data_node:
+            return self.validate_data_node(data_node)
+        return self._validate_data_node(data_node, context)
+
+    def _run_context(self) -> _RunContext:
+        """look up the session settings used to validate each DataNode once, instead of once per DataNode"""
+        session = self.session  # walks up the parents
+        failure_table = getattr(session, "_failure_table", None)
+        return _RunContext(
+            session=session,
+            tracer=getattr(session, "tracer", None),
+            result_cache=getattr(session, "result_cache", None),
+            # without a session, e.g. in a worker process, intern the failures of this run
+            failure_table=FailureTable() if failure_table is None else failure_table,
+            columnar_results=getattr(session, "columnar_results", False),
+            fail_fast=getattr(session, "fail_fast", False),
+            incremental=getattr(session, "_incremental", False),
+            stop_event=getattr(session, "_stop_event", None),
+        )
+
+    def _get_validation_error(self, data_node, adapted_data=_NOT_ADAPTED, context: "Optional[_RunContext]" = None):
+        """
+        validate the data in a DataNode, returns the raised exception, or None if it passed.
+        adapted_data: the data adapted in advance, or the exception if adapting it failed, see _iter_prefetched
+        """
+        tracer = (self._run_context() if context is None else context).tracer
+        if tracer is not None:
+            with tracer.span(data_node.name, "validation"):
+                return self._get_validation_error_untraced(data_node, adapted_data)
+        return self._get_validation_error_untraced(data_node, adapted_data)
+
+    def _get_validation_error_untraced(self, data_node, adapted_data=_NOT_ADAPTED):
+        if isinstance(adapted_data, Exception):
+            return adapted_data
         try:
-            result = self._adapt_and_validate_data(data=data_node.data)
+            if adapted_data is _NOT_ADAPTED:
+                result = self._adapt_and_validate_data_node(data_node)
+            else:
+                result = self.validate(adapted_data)
             # # todo how to support return value and fail/raise error at same time
-            state = NodeState.SUCCEED
         except Exception as e:
-            self.log_error(f"'{data_node}' failed validation `{self.__class__.__name__}`:'{e}'")
-            state = NodeState.FAIL
+            return e
+        return None
+
+    def _get_validation_error_unless_stopped(self, data_node, context: "Optional[_RunContext]" = None):
+        """like _get_validation_error, but skip the DataNode if the session stopped, so workers stop early"""
+        if context is None:
+            context = self._run_context()
+        if context.stop_event is not None and context.stop_event.is_set():
+            return _SKIPPED
+        outcome = self._get_validation_error(data_node, context=context)
+        if outcome is not None:
+            self._stop_if_fail_fast(context)
+        return outcome
+
+    def _get_outcomes_unless_stopped(self, job) -> list:
+        """like _get_outcomes for the data in a job, but skip all data if the session stopped"""
+        if self._is_stopped:
+            return [_SKIPPED] * len(job.datas)
+        outcomes = self._get_outcomes(job.datas)
+        if any(outcome is not None and outcome != NodeState.WARNING for outcome in outcomes):
+            self._stop_if_fail_fast()
+        return outcomes
+
+    def _get_outcomes(self, datas) -> list:
+        """
+        validate a list of adapted data, returns a list of outcomes.
+        stops at the first failure if the validator doesn't continue on fail, like the serial run
+        """
+        if self._has_validate_batch:
+            tracer = getattr(self.session, "tracer", None)
+            try:
+                with tracer.span(f"batch of {len(datas)}", "validation") if tracer is not None else nullcontext():
+                    results = list(self.validate_batch(datas))
+            except Exception as e:
+                # the whole batch failed
+                return [e] * len(datas)
+            if len(results) != len(datas):
+                raise ValueError(f"validate_batch returned {len(results)} results for {len(datas)} data")
+            return [_outcome_from_batch_result(result) for result in results]
+
+        outcomes = []
+        for data in datas:
+            try:
+                self.validate(data)
+                outcomes.append(None)
+            except Exception as e:
+                outcomes.append(e)
+                if not self.continue_on_fail:
+                    break
+        return outcomes
+
+    def _get_cached_outcome(self, data_node, context: "Optional[_RunContext]" = None):
+        """the outcome of a previous validation of this unchanged DataNode in an incremental run, or _PENDING"""
+        if context is None:
+            context = self._run_context()
+        if not context.incremental or context.result_cache is None:
+            return _PENDING
+        result = context.result_cache.get_result(self, data_node)
+        if result is None:
+            return _PENDING
+        state, failure = result
+        if failure is not None:
+            return failure  # rebuilds the failure of the result, like a record sent back by a worker process
+        return None if state == NodeState.SUCCEED else state
+
+    def _create_result_node(self, data_node, outcome=None, cache=True, context: "Optional[_RunContext]" = None):
+        """save the outcome of a validation in a ResultNode, and in the session's result cache"""
+        if context is None:
+            context = self._run_context()
+        failure = None
+        if outcome is None:
+            state = _SUCCEED
+        elif outcome is _WARNING:
+            logging.warning(f"'{data_node}' has a warning in validation `{self.__class__.__name__}`")
+            state = _WARNING
+        else:
+            if isinstance(outcome, FailureRecord):  # sent back by a worker process, or from validate_batch
+                # share the record with the results in this process that failed with the same error
+                failure = context.failure_table.intern(outcome)
+                message = outcome.message
+            else:
+                if isinstance(outcome, Exception):
+                    # shared with other results with the same error
+                    failure = context.failure_table.record(outcome)
+                message = outcome
+            if logging.root.isEnabledFor(logging.ERROR):  # don't format the message if errors aren't logged
+                self.log_error(f"'{data_node}' failed validation `{self.__class__.__name__}`:'{message}'")
+            state = _FAIL
+            self._stop_if_fail_fast(context)
             if not self.continue_on_fail:
-                raise e
-        result_node = ResultNode(
-            data_node=data_node, parent=self, state=state, warning=self.warning, name=data_node.name
-        )
+                if isinstance(outcome, Exception):
+                    raise outcome
+                raise Exception(f"'{data_node}' failed validation `{self.__class__.__name__}`")
+
+        if cache and context.result_cache is not None:
+            context.result_cache.set(self, data_node, state, failure)
+
+        if context.columnar_results:
+            # save the result in columns, the ResultNode is only created when accessed
+            results = context.session.result_store.results(self)
+            return results[results.add(data_node, state, self.warning, failure)]
+
+        # positional arguments, a validator creates a result per DataNode
+        result_node = ResultNode(data_node, state, self.warning, self, data_node._name, failure)
 
         # add actions from data node to result node. e.g. select mesh
         # as a convenience method for better UX in the UI
-        for action in data_node.actions:
-            result_node.actions.append(action)
+        if data_node._actions:  # don't create an empty actions list on every DataNode
+            result_node.actions.extend(data_node._actions)
 
         return result_node
 
+    def delete_children(self):
+        if isinstance(self._children, ResultList):
+            # columnar results don't need to be deleted 1 by 1
+            self._children.clear()
+            self._children = None
+            return
+        super().delete_children()
+
     def run(self):
         """run the validator on all collected DataNodes, and save the results in ResultNodes"""
         self.delete_children()
         for result_node in self._iter_validate_data_nodes():
             ...
+        self._set_state_from_results()
+
+    def _set_state_from_results(self):
+        """
+        fail or warn if a result failed or warned, like set_state_from_children.
+        a validator the session stopped before it validated all DataNodes didn't pass: it's SKIPPED, or FAIL if a
+        result failed, e.g. the validator that stopped the session in fail fast mode
+        """
+        if self._is_stopped and self._skipped_count:
+            self.state = NodeState.FAIL if NodeState.FAIL in self.state_counts else NodeState.SKIPPED
+            return
         self.set_state_from_children()
 
+    @property
+    def _skipped_count(self) -> int:
+        """the nr of DataNodes this validator didn't validate, e.g. because the session stopped"""
+        expected_count = sum(1 for _ in self._iter_data_nodes())
+        return max(0, expected_count - len(self._children or ()))
+
     def _iter_validate_data_nodes(self):
-        for data_node in self._iter_data_nodes():
-            result_node = self.validate_data_node(data_node)
-            yield result_node
+        if self._has_validate_batch:
+            yield from self._iter_validate_data_nodes_in_batches()
+            return
+        if self.executor:
+            yield from self._iter_validate_data_nodes_with_executor()
+            return
+        context = self._run_context()  # look up once, instead of once per DataNode
+        stop_event = context.stop_event
+        incremental = context.incremental
+        if context.tracer is None:
+            get_validation_error = self._get_validation_error_untraced
+        else:
+            get_validation_error = partial(self._get_validation_error, context=context)
+        for data_node, adapted_data in self._iter_prefetched(self._iter_data_nodes(), context):
+            if stop_event is not None and stop_event.is_set():
+                return
+            if incremental:
+                yield self._validate_or_reuse_data_node(data_node, context)
+            elif adapted_data is _NOT_ADAPTED:
+                yield self._validate_data_node_in_run(data_node, context)
+            else:
+                yield self._create_result_node(
+                    data_node, get_validation_error(data_node, adapted_data), context=context
+                )
+
+    def _stop_if_fail_fast(self, context: "Optional[_RunContext]" = None):
+        """stop the session after a failed validation, if it runs in fail fast mode, see Session.fail_fast"""
+        if self.warning:
+            return
+        if context is None:
+            context = self._run_context()
+        if context.fail_fast:
+            context.session.stop(self)
+
+    @property
+    def _is_stopped(self) -> bool:
+        """True if the session stopped running, e.g. after a failure in fail fast mode, see Session.stop"""
+        return getattr(self.session, "_stopped", False)
+
+    def _iter_prefetched(self, data_nodes, context: _RunContext):
+        """
+        yield (data_node, adapted_data) for each DataNode, after adapting them in batches of the session's
+        prefetch size, see Adapter.adapt_many. the adapted data is passed on to the validation, instead of
+        reading it back from the session's cache, that other validators running in parallel evict.
+        adapted_data is _NOT_ADAPTED if the DataNodes aren't adapted in advance
+        """
+        cls = type(self)
+        if (
+            cls.validate_data_node is not Validator.validate_data_node
+            or cls._adapt_and_validate_data_node is not Validator._adapt_and_validate_data_node
+        ):
+            for data_node in data_nodes:
+                yield data_node, _NOT_ADAPTED
+            return
+        required_type = self.required_type
+        chunk_size = getattr(context.session, "_prefetch_size", 0) if required_type else 0
+        if not chunk_size:
+            # data of the required type doesn't need adapting, see Session.adapt
+            for data_node in data_nodes:
+                data = data_node.data
+                if not required_type or isinstance(data, required_type):
+                    yield data_node, data
+                else:
+                    yield data_node, _NOT_ADAPTED
+            return
+        for chunk in _iter_chunks(data_nodes, chunk_size):
+            yield from zip(chunk, context.session.adapt_data_nodes(chunk, required_type))
+
+    def _validate_or_reuse_data_node(self, data_node, context: "Optional[_RunContext]" = None):
+        """validate a DataNode, or reuse the cached result in an incremental run"""
+        if context is None:
+            context = self._run_context()
+        cached_outcome = self._get_cached_outcome(data_node, context)
+        if cached_outcome is _PENDING:
+            return self._validate_data_node_in_run(data_node, context)
+        return self._create_result_node(data_node, cached_outcome, cache=False, context=context)
 
     def _iter_data_nodes(self):
         """find matching data nodes of supported type"""
         # default behaviour is to implicitly find any data node of required type
         # override this method if you explicitly want to control collector input.
-        for collector in self.session.iter_collectors(required_type=self.required_type):
-            for data_node in collector.data_nodes:
-                yield data_node
+        yield from self.session.iter_data_nodes(required_type=self.required_type)
+
+    def _iter_validate_data_nodes_with_executor(self):
+        """validate all DataNodes with self.executor, then save the results in collection order"""
+        data_nodes = list(self._iter_data_nodes())
+        if self.executor.processes and self._runs_in_worker_process:
+            job, entries = self._adapt_data_nodes(data_nodes)
+            outcomes = self._map_chunks(self.executor, job)
+            yield from self._iter_result_nodes(entries, outcomes)
+            return
+
+        # a validator that overrides more than validate() can't be sent to a worker process, validate it here
+        executor = Executor() if self.executor.processes else self.executor
+        context = self._run_context()
+        entries = [(data_node, self._get_cached_outcome(data_node, context)) for data_node in data_nodes]
+        pending_data_nodes = [data_node for data_node, outcome in entries if outcome is _PENDING]
+        outcomes = executor.map(partial(self._get_validation_error_unless_stopped, context=context), pending_data_nodes)
+        yield from self._iter_result_nodes(entries, outcomes, context)
+
+    def _iter_validate_data_nodes_in_batches(self):
+        """validate all DataNodes with validate_batch, in 1 batch, or in chunks if we have an executor"""
+        job, entries = self._adapt_data_nodes(self._iter_data_nodes())
+        if not self.executor:
+            outcomes = self._get_outcomes(job.datas)
+        elif self.executor.processes and self._runs_in_worker_process:
+            outcomes = self._map_chunks(self.executor, job)
+        else:
+            executor = Executor() if self.executor.processes else self.executor
+            outcomes = self._map_chunks(executor, job, fn=self._get_outcomes_unless_stopped)
+        yield from self._iter_result_nodes(entries, outcomes)
+
+    @staticmethod
+    def _map_chunks(executor, job, fn=_validate_datas) -> list:
+        """split the job's data in chunks, validate them with the executor, and return all outcomes in order"""
+        datas = job.datas
+        # a few chunks per worker, to balance slow & fast chunks
+        workers = executor.max_workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-len(datas) // (workers * 4)))
+        jobs = [job._replace(datas=datas[i : i + chunk_size]) for i in range(0, len(datas), chunk_size)]
+        # a chunk stops at its first failure if we don't continue on fail,
+        # all chunks before it are complete, so the outcomes line up until the first failure, where we raise
+        return [outcome for outcomes in _map_jobs(executor, jobs, fn) for outcome in outcomes]
+
+    @property
+    def _runs_in_worker_process(self) -> bool:
+        """True if only validate() or validate_batch() is overridden, so we can validate in another process"""
+        cls = type(self)
+        return (
+            cls.run is Validator.run
+            and cls.validate_data_node is Validator.validate_data_node
+            and cls._adapt_and_validate_data_node is Validator._adapt_and_validate_data_node
+            and cls._iter_validate_data_nodes is Validator._iter_validate_data_nodes
+        )
+
+    @property
+    def _supports_streaming(self) -> bool:
+        """True if we can validate DataNodes 1 by 1 while they are collected, see Session.stream"""
+        cls = type(self)
+        return (
+            not self.executor
+            and not self._has_validate_batch
+            and cls.run is Validator.run
+            and cls._iter_validate_data_nodes is Validator._iter_validate_data_nodes
+            and cls._iter_data_nodes is Validator._iter_data_nodes
+        )
+
+    def _prepare_worker_job(self):
+        """
+        prepare to run this validator in a worker process, returns the job for _validate_datas,
+        and the data nodes to pass to _finish_worker_job together with the outcomes returned by the worker
+        """
+        self.delete_children()
+        return self._adapt_data_nodes(self._iter_data_nodes())
+
+    def _finish_worker_job(self, entries, outcomes):
+        """create the ResultNodes for the outcomes returned by the worker, in collection order"""
+        for result_node in self._iter_result_nodes(entries, outcomes):
+            ...
+        self._set_state_from_results()
+
+    def _adapt_data_nodes(self, data_nodes, use_cache=True):
+        """
+        adapt the data of all DataNodes first, e.g. to validate them in 1 batch or in another process.
+        returns the job for _validate_datas, and a list of (data_node, outcome) entries for _iter_result_nodes.
+        the outcome is _PENDING if the adapted data is in the job,
+        or already known if the adapter failed, or if the result was cached.
+        """
+        context = self._run_context()
+        entries = [
+            (data_node, self._get_cached_outcome(data_node, context) if use_cache else _PENDING)
+            for data_node in data_nodes
+        ]
+        pending_data_nodes = [data_node for data_node, outcome in entries if outcome is _PENDING]
+        # adapt in batches, see Adapter.adapt_many
+        adapted_datas = iter(self.session.adapt_data_nodes(pending_data_nodes, self.required_type))
+        datas = []
+        for index, (data_node, outcome) in enumerate(entries):
+            if outcome is not _PENDING:
+                continue
+            adapted_data = next(adapted_datas)
+            if isinstance(adapted_data, Exception):
+                entries[index] = data_node, adapted_data
+            else:
+                datas.append(adapted_data)
+        return self._create_worker_job(datas), entries
+
+    def _create_worker_job(self, datas: list) -> _WorkerJob:
+        failure_table = getattr(self.session, "_failure_table", None)
+        if failure_table is not None:
+            # a new table with the session's max sizes, the records are interned again when they're sent back
+            failure_table = FailureTable(
+                failure_table.max_message_length, failure_table.max_payload_items, failure_table.max_interned
+            )
+        return _WorkerJob(type(self), datas, self._worker_settings(), failure_table)
+
+    def _worker_settings(self) -> dict:
+        """
+        the settings to send to the worker process with the data: the attributes set on this validator instance,
+        e.g. validator.continue_on_fail = False. the worker creates a new validator of the same class with these.
+        settings that hold a node can't be sent, the validator then runs in this process, see _map_jobs
+        """
+        settings = dict(getattr(self, "__dict__", ()))
+        # the worker validates the data it gets, it doesn't need an executor, or the nodes to wait for in a run
+        settings.pop("executor", None)
+        settings.pop("depends_on", None)
+        return settings
+
+    def _iter_result_nodes(self, entries, outcomes, context: "Optional[_RunContext]" = None):
+        """
+        create a ResultNode for each (data_node, outcome) entry, in order.
+        pending entries get their outcome from outcomes, in the same order.
+        skipped outcomes don't get a ResultNode
+        """
+        if context is None:
+            context = self._run_context()
+        outcomes = iter(outcomes)
+        for data_node, outcome in entries:
+            if outcome is _PENDING:
+                outcome = next(outcomes, None)
+                if outcome is _SKIPPED:
+                    continue
+                yield self._create_result_node(data_node, outcome, context=context)
+            else:
+                # don't cache adapter errors, the adapter might be fixed
+                yield self._create_result_node(data_node, outcome, cache=False, context=context)
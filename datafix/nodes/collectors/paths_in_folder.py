@@ -8,4 +8,5 @@ class PathsInFolder(Collector):
     def collect(self):
         """get all paths in a folder"""
         folder = Path(self.folder_path)
-        return [p for p in folder.iterdir()]
+        # yield paths while scanning, instead of waiting for the whole folder
+        yield from folder.iterdir()
@@ -0,0 +1,80 @@
+import pytest
+
+from datafix.core import Collector, Validator, Session, NodeState, ThreadExecutor, ProcessExecutor
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return [0, 1, 2, 3]
+
+
+class ValidateBatch(Validator):
+    def validate_batch(self, datas):
+        # 1 call for all data, returns pass, fail, warning or an exception per data
+        results = {0: True, 1: False, 2: NodeState.WARNING, 3: ValueError("3 is bad")}
+        return [results[data] for data in datas]
+
+
+class ValidateBatchFail(Validator):
+    def validate_batch(self, datas):
+        results = {0: True, 1: False, 2: NodeState.FAIL, 3: False}
+        return [results[data] for data in datas]
+
+
+class ValidateBatchCrash(Validator):
+    def validate_batch(self, datas):
+        raise Exception("database offline")
+
+
+def run_validator(validator_class, executor=None):
+    session = Session()
+    collector = session.append(CollectNumbers)
+    validator = validator_class(parent=session)
+    validator.executor = executor
+    session.run()
+    return collector, validator
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=2), ProcessExecutor(max_workers=2)])
+def test_validate_batch(executor):
+    collector, validator = run_validator(ValidateBatch, executor)
+
+    # still 1 ResultNode per DataNode, in collection order
+    assert [r.data_node for r in validator.children] == collector.data_nodes
+    assert [r.state for r in validator.children] == [
+        NodeState.SUCCEED,
+        NodeState.FAIL,
+        NodeState.WARNING,
+        NodeState.FAIL,
+    ]
+    assert validator.state == NodeState.FAIL
+
+
+@pytest.mark.parametrize("executor", [None, ProcessExecutor(max_workers=2)])
+def test_validate_batch_fail_message(executor):
+    """results that validate_batch failed without an exception still have a message"""
+    collector, validator = run_validator(ValidateBatchFail, executor)
+
+    results = list(validator.children)
+    assert results[1].message == "validate_batch returned False"
+    assert results[2].message == "validate_batch returned NodeState.FAIL"
+    assert results[3].failure is results[1].failure
+    groups = validator.session.group_failures()
+    assert {message: len(group) for message, group in groups.items()} == {
+        "validate_batch returned False": 2,
+        "validate_batch returned NodeState.FAIL": 1,
+    }
+
+
+def test_validate_batch_exception_fails_all():
+    collector, validator = run_validator(ValidateBatchCrash)
+
+    assert [r.state for r in validator.children] == [NodeState.FAIL] * 4
+
+
+def test_validate_data_node_uses_batch():
+    """revalidating a single DataNode also works if only validate_batch is implemented"""
+    collector, validator = run_validator(ValidateBatch)
+
+    result_node = validator.validate_data_node(collector.data_nodes[2])
+    assert result_node.state == NodeState.WARNING
@@ -0,0 +1,60 @@
+import pytest
+
+from datafix.core import Collector, Validator, Session, NodeState, ThreadExecutor, ProcessExecutor
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return list(range(20))
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        if data % 2:
+            raise ValueError(f"{data} is odd")
+
+
+class ValidateSmall(Validator):
+    continue_on_fail = False
+
+    def validate(self, data):
+        if data > 4:
+            raise ValueError(f"{data} is too big")
+
+
+executors = [ThreadExecutor(max_workers=4), ProcessExecutor(max_workers=2)]
+
+
+def run_validator(validator_class, executor=None):
+    session = Session()
+    session.append(CollectNumbers)
+    validator = validator_class(parent=session)
+    validator.executor = executor
+    session.run()
+    return validator
+
+
+@pytest.mark.parametrize("executor", executors)
+def test_fan_out_matches_serial(executor):
+    serial = run_validator(ValidateEven)
+    fan_out = run_validator(ValidateEven, executor)
+
+    assert fan_out.state == serial.state == NodeState.FAIL
+    assert [r.data for r in fan_out.children] == list(range(20))
+    assert [r.state for r in fan_out.children] == [r.state for r in serial.children]
+
+
+@pytest.mark.parametrize("executor", executors)
+def test_fan_out_stop_on_fail(executor):
+    """a validator that doesn't continue on fail raises on the first failure, in collection order"""
+    session = Session()
+    collector = session.append(CollectNumbers)
+    validator = ValidateSmall(parent=session)
+    validator.executor = executor
+    collector.run()
+
+    with pytest.raises(ValueError, match="5 is too big"):
+        validator.run()
+
+    # like a serial run, the DataNodes before the failure have a result
+    assert [r.data for r in validator.children] == [0, 1, 2, 3, 4]
@@ -136,3 +136,21 @@ def test_action_fail2():
 #     # SKIPPED?
 #     # NOT RUN
 #     # FAIL BUT CONTINUE (WARNING)
+
+
+class CollectWithChildActions(Collector):
+    child_actions = [ActionPrintHello]
+
+    def collect(self):
+        return ["Hello", "World"]
+
+
+def test_child_actions_class_attribute():
+    """child actions set as class attribute are added to each DataNode"""
+    session = Session()
+    collector = CollectWithChildActions(parent=session)
+    session.run()
+
+    for data_node in collector.data_nodes:
+        assert [type(action) for action in data_node.actions] == [ActionPrintHello]
+        assert data_node.actions[0].parent is data_node
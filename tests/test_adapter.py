@@ -0,0 +1,260 @@
+import time
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, Adapter, NodeState, ThreadExecutor
+from datafix.core.adapter import find_adapter_chain
+
+
+class Mesh:
+    def __init__(self, vertex_count):
+        self.vertex_count = vertex_count
+
+
+class Path(str):
+    pass
+
+
+class StringToInt(Adapter):
+    input_types = [str]
+    type_output = int
+
+    def adapt(self, data):
+        return len(data)
+
+
+class PathToInt(Adapter):
+    input_types = [Path]
+    type_output = int
+
+    def adapt(self, data):
+        return 100
+
+
+class IntToMesh(Adapter):
+    input_types = [int]
+    type_output = Mesh
+
+    def adapt(self, data):
+        return Mesh(vertex_count=data)
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["abc", Path("folder/file")]
+
+
+class ValidateMesh(Validator):
+    required_type = Mesh
+
+    def validate(self, data):
+        assert isinstance(data, Mesh)
+
+
+def test_find_adapter_chain():
+    adapters = [StringToInt(), PathToInt(), IntToMesh()]
+    string_to_int, path_to_int, int_to_mesh = adapters
+
+    assert find_adapter_chain(adapters, str, str) == ()
+    assert find_adapter_chain(adapters, str, Mesh) == (string_to_int, int_to_mesh)
+    # subclasses use the adapters of their base class, the adapter of the subclass is preferred
+    assert find_adapter_chain(adapters, Path, Mesh) == (path_to_int, int_to_mesh)
+    assert find_adapter_chain(adapters, bool, Mesh) == (int_to_mesh,)
+    assert find_adapter_chain(adapters, Mesh, str) is None
+
+
+def test_multi_hop_adapt():
+    session = Session()
+    session.register_adapter(StringToInt())
+    session.register_adapter(IntToMesh())
+    session.append(CollectStrings)
+    validator = session.append(ValidateMesh)
+    session.run()
+
+    assert validator.state == NodeState.SUCCEED
+    assert [r.data for r in validator.children] == ["abc", "folder/file"]
+    assert session.adapt("abc", Mesh).vertex_count == 3
+
+
+def test_register_adapter_clears_cache():
+    session = Session()
+    session.register_adapter(StringToInt())
+    assert session.adapt("abc", Mesh) is None
+
+    session.register_adapter(IntToMesh())
+    assert session.adapt("abc", Mesh).vertex_count == 3
+
+    # a more specific adapter is used once it's registered
+    session.register_adapter(PathToInt())
+    assert session.adapt(Path("abc"), Mesh).vertex_count == 100
+
+
+class CountingStringToInt(StringToInt):
+    def __init__(self):
+        self.adapted = []
+
+    def adapt(self, data):
+        self.adapted.append(data)
+        return super().adapt(data)
+
+
+class ValidateInt(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert isinstance(data, int)
+
+
+def setup_counting_session(validator_count=3):
+    session = Session()
+    adapter = CountingStringToInt()
+    session.register_adapter(adapter)
+    collector = session.append(CollectStrings)
+    for _ in range(validator_count):
+        session.append(ValidateInt)
+    return session, collector, adapter
+
+
+def test_adapted_data_is_reused():
+    """validators that require the same type reuse the adapted data during a run"""
+    session, collector, adapter = setup_counting_session()
+    session.run()
+
+    assert adapter.adapted == ["abc", "folder/file"]
+    assert session.state == NodeState.SUCCEED
+    assert session._adapted_data_cache is None  # only kept during the run
+
+    # without a cache, every validator adapts the data
+    session, collector, adapter = setup_counting_session()
+    session.adapted_data_cache_size = 0
+    session.run()
+    assert len(adapter.adapted) == 6
+
+
+def test_adapted_data_cache_evicts_least_recently_used():
+    from datafix.core import AdaptedDataCache
+
+    cache = AdaptedDataCache(max_entries=2)
+    cache.set("a", int, 1)
+    cache.set("b", int, 2)
+    assert cache.get("a", int) == 1
+    cache.set("c", int, 3)
+
+    assert cache.get("b", int, "missing") == "missing"
+    assert cache.get("a", int) == 1
+    assert len(cache) == 2
+
+
+def test_keep_adapted_data():
+    session, collector, adapter = setup_counting_session(validator_count=1)
+    session.keep_adapted_data = True
+    session.run()
+
+    # e.g. an action reuses the adapted data
+    data_node = collector.data_nodes[0]
+    assert data_node.adapt(int) == 3
+    assert adapter.adapted == ["abc", "folder/file"]
+
+
+class BatchStringToInt(StringToInt):
+    def __init__(self):
+        self.batches = []
+
+    def adapt_many(self, datas):
+        self.batches.append(list(datas))
+        if "crash" in datas:
+            raise ValueError("can't load the batch")
+        return [len(data) for data in datas]
+
+    def adapt(self, data):
+        if data == "crash":
+            raise ValueError("can't load crash")
+        return len(data)
+
+
+class CollectManyStrings(Collector):
+    def collect(self):
+        return ["a", "bb", "ccc", "dddd", "eeeee"]
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=2)])
+def test_adapt_many(executor):
+    """a validator's DataNodes are adapted in batches, before they're validated"""
+    session = Session()
+    session.adapt_batch_size = 2
+    session.executor = executor
+    adapter = BatchStringToInt()
+    session.register_adapter(adapter)
+    session.append(CollectManyStrings)
+    validator = session.append(ValidateInt)
+    session.run()
+
+    assert adapter.batches == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert [r.state for r in validator.children] == [NodeState.SUCCEED] * 5
+
+
+def test_adapt_many_failure():
+    """if a batch fails, the data is adapted 1 by 1, so only the failing data fails"""
+    session = Session()
+    session.register_adapter(BatchStringToInt())
+    session.register_adapter(IntToMesh())
+
+    adapted = session.adapt_many(["a", "crash", 1, Mesh(3)], Mesh)
+    assert [mesh.vertex_count for mesh in adapted[0:4:2]] == [1, 1]
+    assert isinstance(adapted[1], ValueError)
+    assert adapted[3].vertex_count == 3
+
+
+class Name(str):
+    pass
+
+
+class Label(str):
+    pass
+
+
+class CountingStringToName(Adapter):
+    input_types = [str]
+    type_output = Name
+    adapted = []
+
+    def adapt(self, data):
+        self.adapted.append(data)
+        return Name(data)
+
+
+class CountingStringToLabel(CountingStringToName):
+    type_output = Label
+
+    def adapt(self, data):
+        self.adapted.append(data)
+        return Label(data)
+
+
+class CollectManyNumbers(Collector):
+    def collect(self):
+        return [str(i) for i in range(100)]
+
+
+def validate_slowly(self, data):
+    time.sleep(0.0001)  # let the validators in other threads run in between
+
+
+def test_prefetched_data_is_validated_without_the_cache():
+    """a validator validates the data it adapted in advance, even if parallel validators evict it from the cache"""
+    session = Session()
+    session.executor = ThreadExecutor(max_workers=2)
+    session.adapted_data_cache_size = 10  # smaller than the batches
+    CountingStringToName.adapted = []
+    session.register_adapter(CountingStringToName())
+    session.register_adapter(CountingStringToLabel())
+    session.append(CollectManyNumbers)
+    validators = [
+        session.append(type("ValidateName", (Validator,), {"required_type": Name, "validate": validate_slowly})),
+        session.append(type("ValidateLabel", (Validator,), {"required_type": Label, "validate": validate_slowly})),
+    ]
+    session.run()
+
+    assert len(CountingStringToName.adapted) == 2 * 100  # each data adapted once per type
+    assert [len(validator.children) for validator in validators] == [100, 100]
+    assert session.state == NodeState.SUCCEED
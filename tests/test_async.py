@@ -0,0 +1,99 @@
+import time
+import asyncio
+
+from datafix.core import Session, Collector, Validator, NodeState, AsyncCollector, AsyncValidator
+
+
+class CollectNumbers(AsyncCollector):
+    async def collect(self):
+        await asyncio.sleep(0.01)
+        return list(range(20))
+
+
+class CollectLetters(AsyncCollector):
+    async def collect(self):
+        for letter in "abc":
+            await asyncio.sleep(0)
+            yield letter
+
+
+class CollectSyncNumbers(Collector):
+    def collect(self):
+        return [100, 101]
+
+
+class ValidateEven(AsyncValidator):
+    required_type = int
+    delay = 0.05
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def validate(self, data):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        assert data % 2 == 0
+
+
+class ValidateSyncPositive(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert data >= 0
+
+
+def create_session():
+    session = Session()
+    session.append(CollectNumbers)
+    session.append(CollectSyncNumbers)
+    session.append(CollectLetters)
+    session.append(ValidateEven)
+    session.append(ValidateSyncPositive)
+    return session
+
+
+def test_arun_validates_concurrently():
+    session = create_session()
+    start = time.perf_counter()
+    asyncio.run(session.arun())
+    duration = time.perf_counter() - start
+
+    collector, sync_collector, letters, validator, sync_validator = session.children
+    assert duration < 22 * ValidateEven.delay / 2  # 22 ints, serial would take 22 delays
+    assert validator.max_in_flight == 22
+    assert [node.data for node in letters.data_nodes] == ["a", "b", "c"]
+    # results are saved in collection order
+    assert [r.data for r in validator.children] == list(range(20)) + [100, 101]
+    assert validator.state_counts == {NodeState.SUCCEED: 11, NodeState.FAIL: 11}
+    assert sync_validator.state == NodeState.SUCCEED
+    assert session.state == NodeState.FAIL
+
+
+def test_max_concurrency():
+    session = create_session()
+    validator = session.children[3]
+    validator.delay = 0.01
+    asyncio.run(session.arun(max_concurrency=3))
+    assert validator.max_in_flight == 3
+    assert len(validator.children) == 22
+
+
+def test_sync_run_matches_arun():
+    session = create_session()
+    session.run()
+    sync_counts = [node.state_counts for node in session.children]
+
+    session = create_session()
+    asyncio.run(session.arun())
+    assert [node.state_counts for node in session.children] == sync_counts
+
+    # revalidate 1 DataNode from sync code, e.g. from the UI
+    validator = session.children[3]
+    data_node = session.children[0].data_nodes[1]
+    assert validator.validate_data_node(data_node).state == NodeState.FAIL
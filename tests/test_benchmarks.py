@@ -0,0 +1,32 @@
+import io
+
+from benchmarks.suite import Scenario, measure, compare, save, main
+
+
+def test_measure_scenario():
+    metrics = measure(Scenario(20, 2, adapters=True, fail_ratio=0.5), repeat=1)
+    assert set(metrics) == {"validations", "throughput", "run_time", "report_time", "peak_memory"}
+    assert metrics["validations"] == 40
+    assert metrics["throughput"] > 0
+
+
+def test_compare_finds_regressions(tmp_path):
+    baseline = {"scenarios": {"a": {"throughput": 100.0, "run_time": 1.0}, "b": {"throughput": 100.0}}}
+    current = {"scenarios": {"a": {"throughput": 80.0, "run_time": 1.05}, "b": {"throughput": 200.0}, "c": {}}}
+    output = io.StringIO()
+    assert compare(baseline, current, threshold=10, output=output) == ["a throughput -20.0%"]
+    assert "c: not in the baseline" in output.getvalue()
+
+    baseline_path = save(baseline, str(tmp_path / "baseline.json"))
+    current_path = save(current, str(tmp_path / "current.json"))
+    assert main(["compare", baseline_path, baseline_path]) == 0
+    assert main(["compare", baseline_path, current_path]) == 1
+
+
+def test_compare_skips_other_validations():
+    # e.g. an adapter scenario in a version without adapters, that didn't validate anything
+    baseline = {"scenarios": {"a": {"validations": 0, "throughput": 1000.0}}}
+    current = {"scenarios": {"a": {"validations": 100, "throughput": 100.0}}}
+    output = io.StringIO()
+    assert compare(baseline, current, threshold=10, output=output) == []
+    assert "a: not comparable" in output.getvalue()
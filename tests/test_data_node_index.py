@@ -0,0 +1,84 @@
+from datafix.core import Session, Collector, Validator, Adapter, NodeState
+
+
+class CollectMixed(Collector):
+    """a collector with data of several types"""
+
+    def collect(self):
+        return [1, "a", 2, "b"]
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["c", "d"]
+
+
+class ValidateString(Validator):
+    required_type = str
+
+    def validate(self, data):
+        assert isinstance(data, str)
+
+
+class ValidateInt(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert isinstance(data, int)
+
+
+class IntToString(Adapter):
+    input_types = [int]
+    type_output = str
+
+    def adapt(self, data):
+        return str(data)
+
+
+def test_mixed_collector():
+    """validators get the matching DataNodes of a collector per item, not based on the first item"""
+    session = Session()
+    session.append(CollectMixed)
+    session.append(CollectStrings)
+    string_validator = session.append(ValidateString)
+    int_validator = session.append(ValidateInt)
+    session.run()
+
+    assert [r.data for r in string_validator.children] == ["a", "b", "c", "d"]
+    assert [r.data for r in int_validator.children] == [1, 2]
+    assert session.state == NodeState.SUCCEED
+
+
+def test_iter_data_nodes_order():
+    """DataNodes are returned by collector in session order, even if a collector ran again later"""
+    session = Session()
+    mixed_collector = session.append(CollectMixed)
+    session.append(CollectStrings)
+    session.run()
+    mixed_collector.run()
+
+    assert [n.data for n in session.iter_data_nodes()] == [1, "a", 2, "b", "c", "d"]
+    assert [n.data for n in session.iter_data_nodes(str)] == ["a", "b", "c", "d"]
+    assert len(session._data_node_index) == 6
+
+
+def test_deleted_data_nodes_are_removed():
+    session = Session()
+    collector = session.append(CollectStrings)
+    session.run()
+    collector.delete()
+
+    assert list(session.iter_data_nodes()) == []
+    assert len(session._data_node_index) == 0
+
+
+def test_adapted_type():
+    """DataNodes that can be adapted to the required type are validated too"""
+    session = Session()
+    session.register_adapter(IntToString())
+    session.append(CollectMixed)
+    string_validator = session.append(ValidateString)
+    session.run()
+
+    assert [r.data for r in string_validator.children] == [1, "a", 2, "b"]
+    assert string_validator.state == NodeState.SUCCEED
@@ -0,0 +1,169 @@
+import logging
+import threading
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, NodeState, ThreadExecutor, ProcessExecutor, ValidationError
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["a", "b", "c", "d"]
+
+
+class ValidateIsA(Validator):
+    def validate(self, data):
+        assert data == "a"
+
+
+class ValidateIsString(Validator):
+    def validate(self, data):
+        assert isinstance(data, str)
+
+
+class ValidateWarnIsB(Validator):
+    warning = True
+
+    def validate(self, data):
+        assert data == "b"
+
+
+def setup_session(executor=None):
+    session = Session()
+    session.executor = executor
+    session.append(CollectStrings)
+    session.append(ValidateIsA)
+    session.append(ValidateIsString)
+    session.append(ValidateWarnIsB)
+    return session
+
+
+@pytest.mark.parametrize("executor", [ThreadExecutor(max_workers=3), ProcessExecutor(max_workers=2)])
+def test_parallel_run_matches_serial(executor):
+    """a parallel run creates the same tree & states as a serial run"""
+    serial_session = setup_session()
+    serial_session.run()
+
+    parallel_session = setup_session(executor)
+    parallel_session.run()
+
+    assert parallel_session.state == serial_session.state == NodeState.FAIL
+    assert parallel_session.report() == serial_session.report()
+
+    for serial_node, parallel_node in zip(serial_session.children, parallel_session.children):
+        assert serial_node.state == parallel_node.state
+        assert [n.state for n in serial_node.children] == [n.state for n in parallel_node.children]
+
+
+def test_parallel_result_node_order():
+    """the results on a DataNode are sorted in session order, not in the order the validators finished"""
+    session = setup_session(ThreadExecutor(max_workers=3))
+    session.run()
+
+    collector, validator_a, validator_string, validator_b = session.children
+    for data_node in collector.data_nodes:
+        assert [r.parent for r in data_node.result_nodes] == [validator_a, validator_string, validator_b]
+
+
+def test_parallel_collectors_run_first():
+    """validators added before a collector still see its data nodes"""
+    session = Session()
+    session.executor = ThreadExecutor()
+    validator = session.append(ValidateIsString)
+    session.append(CollectStrings)
+    session.run()
+
+    assert len(validator.children) == 4
+    assert validator.state == NodeState.SUCCEED
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return [1, 2, 3, 4]
+
+
+class ValidateMax(Validator):
+    maximum = 10
+
+    def validate(self, data):
+        if data > self.maximum:
+            raise ValidationError("too big", payload={"data": data, "lock": threading.Lock()})
+
+
+class CollectLocks(Collector):
+    def collect(self):
+        return [threading.Lock(), threading.Lock()]
+
+
+class ValidateIsLock(Validator):
+    def validate(self, data):
+        assert hasattr(data, "acquire")
+
+
+def test_process_settings_and_failures():
+    """the workers use the validator's settings, and send the failures back as records"""
+    session = Session()
+    session.executor = ProcessExecutor(max_workers=2)
+    session.append(CollectNumbers)
+    validator = session.append(ValidateMax)
+    validator.maximum = 2  # an instance setting, sent to the workers
+    session.run()
+
+    results = list(validator.children)
+    assert [result.state for result in results] == [NodeState.SUCCEED] * 2 + [NodeState.FAIL] * 2
+    failure = results[2].failure
+    assert (failure.message, failure.exception_type) == ("too big", "ValidationError")
+    # the lock can't be sent back, the payload is replaced by its repr
+    assert isinstance(failure.payload, str) and "'data': 3" in failure.payload
+    assert list(session.group_failures()) == ["too big"]
+
+
+def test_process_unpicklable_data(caplog):
+    """data that can't be sent to a worker process is validated in this process"""
+    session = Session()
+    session.executor = ProcessExecutor(max_workers=2)
+    session.append(CollectLocks)
+    validator = session.append(ValidateIsLock)
+    with caplog.at_level(logging.WARNING):
+        session.run()
+
+    assert validator.state == NodeState.SUCCEED
+    assert len(validator.children) == 2
+    assert "validating it in this process" in caplog.text
+
+
+class ValidateUnpicklableSetting(Validator):
+    def validate(self, data):
+        assert isinstance(data, int)
+
+
+class ValidateRelated(Validator):
+    def validate(self, data):
+        assert self.related["collector"].data_nodes
+
+
+def test_process_settings_with_nodes(caplog):
+    """settings that hold a node, or can't be pickled, run the validator in this process with a warning"""
+    session = Session()
+    session.executor = ProcessExecutor(max_workers=2)
+    collector = session.append(CollectNumbers)
+    validator = session.append(ValidateMax)
+    validator.maximum = 2
+    validator.depends_on = [collector]  # only used to schedule the run, not sent to the worker
+    assert validator._worker_settings() == {"maximum": 2}
+
+    related_validator = session.append(ValidateRelated)
+    related_validator.related = {"collector": collector}
+    other_validator = session.append(ValidateUnpicklableSetting)
+    other_validator.lock = threading.Lock()
+    with caplog.at_level(logging.WARNING):
+        session.run()
+
+    assert [result.state for result in validator.children] == [NodeState.SUCCEED] * 2 + [NodeState.FAIL] * 2
+    assert related_validator.state == NodeState.SUCCEED
+    assert len(related_validator.children) == 4
+    assert other_validator.state == NodeState.SUCCEED
+    assert "can't send the settings of `ValidateRelated`" in caplog.text
+    assert "related holds a node" in caplog.text
+    assert "can't send the settings of `ValidateUnpicklableSetting`" in caplog.text
+    assert "can't send the data" not in caplog.text
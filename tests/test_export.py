@@ -0,0 +1,108 @@
+import io
+import json
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, NodeState
+from datafix.core.export import iter_records, write_junit, FIELDS
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return [1, 2, 3]
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+class ValidateSmall(Validator):
+    warning = True
+
+    def validate(self, data):
+        assert data < 3
+
+
+class ValidateNothing(Validator):
+    def run(self):
+        raise Exception("broken validator")
+
+
+@pytest.fixture(params=[False, True], ids=["result_nodes", "columnar"])
+def session(request):
+    session = Session()
+    session.columnar_results = request.param
+    session.append(CollectNumbers)
+    session.append(ValidateEven)
+    session.append(ValidateSmall)
+    session.run()
+    return session
+
+
+def test_jsonl(session, tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    session.export(path)
+    with open(path) as file:
+        records = [json.loads(line) for line in file]
+
+    assert all(tuple(record) == FIELDS for record in records)
+    assert [record["kind"] for record in records] == ["session", "collector"] + ["data_node"] * 3 + (
+        ["validator"] + ["result"] * 3
+    ) * 2
+    by_id = {record["id"]: record for record in records}
+    assert len(by_id) == len(records)
+    result = records[6]
+    assert (result["name"], result["state"], by_id[result["parent_id"]]["name"]) == ("1", "fail", "ValidateEven")
+    assert result["exception_type"] == "AssertionError"
+    assert by_id[result["data_node_id"]]["kind"] == "data_node"
+    assert by_id[result["data_node_id"]]["name"] == "1"
+    assert records[5]["wall_time"] is not None  # the validator was profiled
+
+
+def test_junit(session):
+    stream = io.StringIO()
+    write_junit(session, stream)
+    root = ElementTree.fromstring(stream.getvalue())
+
+    suites = root.findall("testsuite")
+    assert [(suite.get("name"), suite.get("tests"), suite.get("failures")) for suite in suites] == [
+        ("ValidateEven", "3", "2"),
+        ("ValidateSmall", "3", "0"),
+    ]
+    assert [case.get("name") for case in suites[0]] == ["1", "2", "3"]
+    assert suites[0][0].find("failure").get("type") == "AssertionError"
+    assert suites[1][2].find("system-out").text.startswith("warning")
+
+
+def test_junit_validators_without_results():
+    session = Session()
+    session.fail_fast = True
+    session.append(CollectNumbers)
+    session.append(ValidateNothing)
+    session.append(ValidateEven)
+    session.run()
+    assert session.children[2].state == NodeState.SKIPPED
+
+    stream = io.StringIO()
+    write_junit(session, stream)
+    broken_suite, skipped_suite = ElementTree.fromstring(stream.getvalue()).findall("testsuite")
+    assert (broken_suite.get("failures"), broken_suite[0].find("failure") is not None) == ("1", True)
+    assert (skipped_suite.get("skipped"), skipped_suite[0].find("skipped") is not None) == ("1", True)
+
+
+def test_export_format(session, tmp_path):
+    with pytest.raises(ValueError):
+        session.export(str(tmp_path / "results.txt"))
+    session.export(str(tmp_path / "results.txt"), format="junit")
+    ElementTree.parse(str(tmp_path / "results.txt"))
+
+
+def test_arrow(session, tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "results.parquet")
+    session.export(path)
+    table = pyarrow_parquet.read_table(path)
+    assert table.column_names == list(FIELDS)
+    assert table.num_rows == len(list(iter_records(session)))
@@ -0,0 +1,144 @@
+import time
+import asyncio
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, AsyncValidator, NodeState, ThreadExecutor
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return [2, 3, 4, 5]
+
+
+class CollectBroken(Collector):
+    def collect(self):
+        raise Exception("can't collect")
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+class ValidateSmall(Validator):
+    def validate(self, data):
+        assert data < 10
+
+
+class ValidateEvenAsync(AsyncValidator):
+    async def validate(self, data):
+        await asyncio.sleep(0)
+        assert data % 2 == 0
+
+
+def create_session(validator_class=ValidateEven):
+    session = Session()
+    session.fail_fast = True
+    session.append(CollectNumbers)
+    session.append(validator_class)
+    validator = session.append(ValidateSmall)
+    validator.depends_on = [validator_class]
+    return session
+
+
+def test_fail_fast_skips_pending_work():
+    session = create_session()
+    session.run()
+    collector, validator, skipped_validator = session.children
+
+    assert session.state == NodeState.FAIL
+    assert session.stopped_by is validator
+    # the validator stopped after the first failure, the next validator didn't run
+    assert [r.data for r in validator.children] == [2, 3]
+    assert skipped_validator.state == NodeState.SKIPPED
+    assert len(skipped_validator.children) == 0
+    assert session.skipped_validation_count == 2 + 4
+    assert session.time_saved > 0
+
+    # a normal run validates everything
+    session.fail_fast = False
+    session.run()
+    assert session.stopped_by is None
+    assert session.skipped_validation_count == 0
+    assert skipped_validator.state == NodeState.SUCCEED
+    assert len(validator.children) == 4
+
+
+def test_warnings_dont_stop():
+    session = create_session()
+    session.children[1].warning = True
+    session.run()
+    assert session.stopped_by is None
+    assert session.state == NodeState.WARNING
+    assert session.children[2].state == NodeState.SUCCEED
+
+
+def test_failed_collector_skips_validators():
+    session = Session()
+    session.fail_fast = True
+    collector = session.append(CollectBroken)
+    validator = session.append(ValidateEven)
+    session.run()
+    assert session.stopped_by is collector
+    assert validator.state == NodeState.SKIPPED
+
+
+@pytest.mark.parametrize("executor", ["validator", "session", "stream"])
+def test_fail_fast_stops_concurrent_runs(executor):
+    session = create_session()
+    validator = session.children[1]
+    if executor == "validator":
+        validator.executor = ThreadExecutor(max_workers=1)
+    elif executor == "session":
+        session.executor = ThreadExecutor(max_workers=2)
+    else:
+        session.stream = True
+    session.run()
+    assert session.stopped_by is validator
+    assert [r.data for r in validator.children] == [2, 3]
+    assert session.children[2].state == NodeState.SKIPPED
+
+
+def test_fail_fast_async():
+    session = create_session(ValidateEvenAsync)
+    asyncio.run(session.arun(max_concurrency=1))
+    validator = session.children[1]
+    assert session.stopped_by is validator
+    assert [r.data for r in validator.children] == [2, 3]
+    assert session.children[2].state == NodeState.SKIPPED
+
+
+class CollectMany(Collector):
+    def collect(self):
+        return list(range(50))
+
+
+class ValidateSlowly(Validator):
+    def validate(self, data):
+        time.sleep(0.001)
+
+
+class ValidateNotZero(Validator):
+    def validate(self, data):
+        assert data != 0
+
+
+@pytest.mark.parametrize("mode", ["session", "stream"])
+def test_fail_fast_interrupted_validator_is_skipped(mode):
+    """a validator the session stopped before it validated all DataNodes doesn't pass"""
+    session = Session()
+    session.fail_fast = True
+    if mode == "session":
+        session.executor = ThreadExecutor(max_workers=2)
+    else:
+        session.stream = True
+    session.append(CollectMany)
+    slow_validator = session.append(ValidateSlowly)
+    failing_validator = session.append(ValidateNotZero)
+    session.run()
+
+    assert session.stopped_by is failing_validator
+    assert failing_validator.state == NodeState.FAIL
+    assert len(slow_validator.children) < 50
+    assert slow_validator.state == NodeState.SKIPPED
@@ -0,0 +1,66 @@
+import pytest
+
+from datafix.core import Session, Collector, Validator, NodeState, ValidationError, FailureRecord, FailureTable
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return list(range(10))
+
+
+class ValidateSmall(Validator):
+    def validate(self, data):
+        if data >= 6:
+            raise ValidationError("too big", payload=list(range(data)))
+        if data % 2:
+            raise AssertionError("odd")
+
+
+class ValidateNotNine(Validator):
+    def validate(self, data):
+        if data == 9:
+            raise ValueError("nine")
+
+
+@pytest.fixture(params=[False, True], ids=["result_nodes", "columnar"])
+def session(request):
+    session = Session()
+    session.columnar_results = request.param
+    session.max_failure_payload_items = 7
+    session.append(CollectNumbers)
+    session.append(ValidateSmall)
+    session.append(ValidateNotNine)
+    session.run()
+    return session
+
+
+def test_failure(session):
+    results = list(session.children[1].children)
+    assert results[0].failure is None and results[0].message is None
+    assert results[1].failure == FailureRecord("odd", "AssertionError")
+    assert results[1].state == NodeState.FAIL
+    # results with the same error share 1 record
+    assert results[3].failure is results[1].failure
+
+    assert (results[6].message, results[6].failure.exception_type) == ("too big", "ValidationError")
+    assert (results[6].failure.payload, results[6].failure.truncated) == ([0, 1, 2, 3, 4, 5], False)
+    assert (results[8].failure.payload, results[8].failure.truncated) == ([0, 1, 2, 3, 4, 5, 6], True)
+
+
+def test_group_failures(session):
+    groups = session.group_failures()
+    assert list(groups) == ["too big", "odd", "nine"]
+    assert [result.data_node.data for result in groups["too big"]] == [6, 7, 8, 9]
+    assert [result.data_node.data for result in groups["odd"]] == [1, 3, 5]
+    assert [result.data_node.data for result in groups["nine"]] == [9]
+    assert list(session.group_failures(session.children[2])) == ["nine"]
+
+
+def test_failure_table():
+    table = FailureTable(max_message_length=5, max_interned=1)
+    record = table.record(ValueError("a long message"))
+    assert (record.message, record.truncated) == ("a lon...", True)
+    assert table.record(ValueError("a long message")) is record
+    # the table is full, new errors aren't interned
+    assert table.record(KeyError("key")) is not table.record(KeyError("key"))
+    assert len(table) == 1
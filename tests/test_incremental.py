@@ -0,0 +1,95 @@
+from datafix.core import Session, Collector, Validator, NodeState, ThreadExecutor
+from datafix.nodes.collectors.paths_in_folder import PathsInFolder
+
+
+class ValidateNotEmpty(Validator):
+    validated = []  # track which data was validated, instead of served from the cache
+
+    def validate(self, data):
+        self.validated.append(data.name)
+        if data.stat().st_size == 0:
+            raise Exception(f"{data} is empty")
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["a", "b"]
+
+
+class ValidateString(Validator):
+    def validate(self, data):
+        assert isinstance(data, str)
+
+
+def setup_session(folder):
+    session = Session()
+    collector = PathsInFolder(parent=session)
+    collector.folder_path = folder
+    session.append(ValidateNotEmpty)
+    return session
+
+
+def test_incremental_run(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("")
+    session = setup_session(tmp_path)
+    ValidateNotEmpty.validated = []
+
+    session.run(incremental=True)
+    assert sorted(ValidateNotEmpty.validated) == ["a.txt", "b.txt"]
+    assert session.cached_result_count == 0
+    report = session.report()
+
+    # nothing changed, all results come from the cache
+    ValidateNotEmpty.validated = []
+    session.run(incremental=True)
+    assert ValidateNotEmpty.validated == []
+    assert session.cached_result_count == 2
+    assert session.report() == report
+    assert session.state == NodeState.FAIL
+    # with the reason it failed
+    assert list(session.group_failures()) == [f"{tmp_path / 'b.txt'} is empty"]
+
+    # change a file, only that file is validated again
+    (tmp_path / "b.txt").write_text("b")
+    session.run(incremental=True)
+    assert ValidateNotEmpty.validated == ["b.txt"]
+    assert session.cached_result_count == 1
+    assert session.state == NodeState.SUCCEED
+
+
+def test_non_incremental_run_validates_all(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    session = setup_session(tmp_path)
+    session.run(incremental=True)
+
+    ValidateNotEmpty.validated = []
+    session.run()
+    assert ValidateNotEmpty.validated == ["a.txt"]
+    assert session.cached_result_count == 0
+
+
+def test_version_invalidates_cache(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    session = setup_session(tmp_path)
+    session.run(incremental=True)
+
+    class ValidateNotEmptyV2(ValidateNotEmpty):
+        version = 2
+
+    ValidateNotEmptyV2.validated = []
+    session.children[1].delete()
+    session.append(ValidateNotEmptyV2)
+    session.run(incremental=True)
+    assert ValidateNotEmptyV2.validated == ["a.txt"]
+
+
+def test_data_without_fingerprint_is_not_cached():
+    session = Session()
+    session.executor = ThreadExecutor()
+    session.append(CollectStrings)
+    session.append(ValidateString)
+    session.run(incremental=True)
+    session.run(incremental=True)
+    assert session.cached_result_count == 0
+    assert session.state == NodeState.SUCCEED
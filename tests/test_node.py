@@ -1,3 +1,5 @@
+import logging
+
 from datafix.core.node import Node, NodeState
 
 
@@ -33,3 +35,95 @@ def test_warning_2_nodes():
     node1.warning = True
     assert node2.warning == False
     assert node2.state == NodeState.FAIL
+
+
+def test_get_child_by_name():
+    parent = Node()
+    first = Node(parent=parent, name="child")
+    second = Node(parent=parent, name="child")
+    other = Node(parent=parent, name="other")
+
+    # the first child with a matching name is returned
+    assert parent["child"] is first
+    assert parent.get("other") is other
+    assert parent.get("missing", "default") == "default"
+
+    first.delete()
+    assert parent["child"] is second
+    assert parent.children == [second, other]
+
+
+def test_get_child_by_name_after_rename():
+    parent = Node()
+    first = Node(parent=parent, name="a")
+    second = Node(parent=parent, name="b")
+    assert parent["a"] is first  # index the names
+
+    first.name = "b"
+    assert parent["a"] is None
+    assert parent["b"] is first  # the first child in order
+    second.name = "c"
+    assert parent["b"] is first
+    assert parent["c"] is second
+
+
+def test_name_class_attribute(caplog):
+    """a name class attribute doesn't replace the name the node is created with"""
+    with caplog.at_level(logging.WARNING):
+
+        class NamedNode(Node):
+            name = "class name"
+
+    assert "`NamedNode.name`" in caplog.text
+    parent = Node()
+    node = NamedNode(parent=parent, name="custom")
+    assert node.name == "custom"
+    assert parent["custom"] is node
+    assert NamedNode(parent=parent).name == "NamedNode"
+
+
+def test_delete_children():
+    parent = Node()
+    children = [Node(parent=parent, name=str(i)) for i in range(1000)]
+    children[500].delete()
+    assert len(parent.children) == 999
+    assert parent.children[500] is children[501]
+    assert parent["500"] is None
+
+    parent.delete_children()
+    assert len(parent.children) == 0
+    assert parent["0"] is None
+
+
+def test_lazy_containers():
+    """nodes don't create actions or children until they're used, to save memory"""
+    from datafix.core import Session, DataNode, Action
+
+    session = Session()
+    data_node = DataNode(data=1, parent=session)
+    assert data_node._children is None
+    assert data_node._actions is None
+    assert data_node.state_counts == {}
+
+    # actions are saved in actions, not in the children
+    action = Action(parent=data_node)
+    data_node.actions.append(action)
+    assert data_node.actions == [action]
+    assert data_node._children is None
+
+
+def test_subclass_attributes():
+    """nodes use __slots__, but subclasses can still add attributes"""
+    from datafix.core import Session, DataNode
+
+    class MeshNode(DataNode):
+        child_actions = []
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.vertex_count = 8
+
+    node = MeshNode(data="cube", parent=Session())
+    node.custom = "value"
+    assert node.vertex_count == 8
+    assert node.custom == "value"
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, Adapter, ThreadExecutor, ProcessExecutor
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["a", "bb", "ccc"]
+
+
+class StringToInt(Adapter):
+    input_types = [str]
+    type_output = int
+
+    def adapt(self, data):
+        return len(data)
+
+
+class ValidateSlow(Validator):
+    def validate(self, data):
+        time.sleep(0.02)
+
+
+class ValidateLength(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert data < 3
+
+
+def create_session():
+    session = Session()
+    session.register_adapter(StringToInt())
+    session.append(CollectStrings)
+    session.append(ValidateSlow)
+    session.append(ValidateLength)
+    return session
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=2), ProcessExecutor(max_workers=2)])
+def test_profile(executor):
+    session = create_session()
+    session.executor = executor
+    session.run()
+    collector, slow_validator, validator = session.children
+    profile = session.profile
+
+    # the collector run inside the session run is counted once
+    assert (profile.get(collector).calls, profile.get(collector).items) == (1, 3)
+    assert (profile.get(slow_validator).calls, profile.get(slow_validator).items) == (1, 3)
+    assert profile.get(slow_validator).wall_time >= 3 * 0.02
+    assert profile.get(slow_validator).time_per_item >= 0.02
+    assert profile.slowest(1) == [(slow_validator, profile.get(slow_validator))]
+    if not executor or not executor.processes:
+        assert profile.get(session.adapters[0]).items == 3
+
+    report = session.report(profile=True)
+    assert report.index("ValidateSlow: ") < report.index("ValidateLength: ")
+    assert "profile:" not in session.report()
+
+
+def test_profile_resets_each_run():
+    session = create_session()
+    session.run()
+    session.run()
+    assert session.profile.get(session.children[1]).calls == 1
+
+    session.profiling = False
+    session.run()
+    assert session.profile is None
+    assert "profile:" not in session.report(profile=True)
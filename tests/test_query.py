@@ -0,0 +1,81 @@
+import pytest
+
+from datafix.core import Session, Collector, Validator, Node, DataNode, ResultNode, NodeState
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return list(range(6))
+
+
+class CollectNames(Collector):
+    def collect(self):
+        return ["mesh_LOD0", "mesh_LOD1", "rig"]
+
+
+class ValidateEven(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+class ValidateLowercase(Validator):
+    warning = True
+
+    def validate(self, data):
+        assert str(data).islower()
+
+
+@pytest.fixture(params=[False, True], ids=["result_nodes", "columnar"])
+def session(request):
+    session = Session()
+    session.columnar_results = request.param
+    session.append(CollectNumbers)
+    session.append(CollectNames)
+    session.append(ValidateEven)
+    session.append(ValidateLowercase)
+    session.run()
+    return session
+
+
+def data(nodes):
+    return [node.data for node in nodes]
+
+
+def test_query_by_class(session):
+    assert list(session.query(Collector)) == list(session.children[:2])
+    assert list(session.query(ValidateEven)) == [session.children[2]]
+    assert data(session.query(DataNode)) == list(range(6)) + ["mesh_LOD0", "mesh_LOD1", "rig"]
+    assert len(list(session.query(ResultNode))) == 6 + 9
+    assert len(list(session.query())) == 4 + 9 + 15
+
+
+def test_query_filters(session):
+    assert data(session.query(ResultNode, NodeState.FAIL)) == [1, 3, 5]
+    assert data(session.query(ResultNode, NodeState.WARNING, data_type=int)) == list(range(6))
+    assert data(session.query(ResultNode, validator="ValidateLowercase", data_type=str)) == [
+        "mesh_LOD0",
+        "mesh_LOD1",
+        "rig",
+    ]
+    assert data(session.query(ResultNode, [NodeState.SUCCEED], validator=ValidateEven)) == [0, 2, 4]
+    assert data(session.query(DataNode, NodeState.FAIL)) == [1, 3, 5]
+    assert data(session.query(DataNode, NodeState.WARNING)) == [0, 2, 4, "mesh_LOD0", "mesh_LOD1"]
+    assert data(session.query(DataNode, name="DataNode(mesh_*)")) == []
+    assert data(session.query(DataNode, name="mesh_*")) == ["mesh_LOD0", "mesh_LOD1"]
+    assert data(session.query(DataNode, NodeState.SUCCEED, name="rig")) == ["rig"]
+    assert list(session.query(name="CollectN*", state=NodeState.SUCCEED)) == list(session.children[:2])
+    assert list(session.query(ResultNode, data_type=float)) == []
+
+
+def test_query_after_state_change():
+    # the state index is kept up to date after the first query
+    session = Session()
+    nodes = [Node(parent=session, name=str(index)) for index in range(4)]
+    assert list(session.query(state=NodeState.INIT)) == nodes
+    nodes[1].state = NodeState.FAIL
+    nodes[3].delete()
+    Node(parent=session, name="4").state = NodeState.FAIL
+    assert [node.name for node in session.query(state=NodeState.INIT)] == ["0", "2"]
+    assert [node.name for node in session.query(state=NodeState.FAIL)] == ["1", "4"]
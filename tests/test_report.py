@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+import datafix.core.node
+from datafix.core import Session, Collector, Validator, Node, NodeState
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return [1, 2, 3, 4]
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+@pytest.fixture(autouse=True)
+def no_colors(monkeypatch):
+    monkeypatch.setattr(datafix.core.node, "COLOR_CONSOLE_OUTPUT", False)
+
+
+@pytest.fixture
+def session():
+    session = Session()
+    session.append(CollectNumbers)
+    session.append(ValidateEven)
+    session.run()
+    return session
+
+
+def test_report(session):
+    stream = io.StringIO()
+    session.write_report(stream)
+    assert stream.getvalue() == session.report()
+    assert session.report().splitlines()[:3] == [
+        "Session(Session): fail",
+        "  CollectNumbers: succeed",
+        "    DataNode(1): fail",
+    ]
+    assert len(session.report().splitlines()) == 1 + 2 + 4 + 4
+
+
+def test_report_options(session):
+    assert session.report(states=[NodeState.FAIL]) == (
+        "Session(Session): fail\n"
+        "  CollectNumbers: succeed\n"
+        "    DataNode(1): fail\n"
+        "    DataNode(3): fail\n"
+        "  ValidateEven: fail\n"
+        "    ResultNode(1): fail\n"
+        "    ResultNode(3): fail\n"
+    )
+    assert session.report(states=[NodeState.FAIL], max_children=1).splitlines()[2:4] == [
+        "    DataNode(1): fail",
+        "    ... 1 more",
+    ]
+    assert session.report(summary=True) == (
+        "Session(Session): fail (1 succeed, 1 fail)\n"
+        "  CollectNumbers: succeed (2 succeed, 2 fail)\n"
+        "  ValidateEven: fail (2 succeed, 2 fail)\n"
+    )
+    assert session.report(states=[NodeState.WARNING]) == "Session(Session): fail\n"
+
+
+def test_report_deep_tree():
+    # the report doesn't recurse, so deep trees don't hit the recursion limit
+    root = node = Node(name="root")
+    for index in range(5000):
+        node = Node(parent=node, name=str(index))
+    lines = root.report().splitlines()
+    assert len(lines) == 5001
+    assert lines[-1] == "  " * 5000 + "Node: initialized"
@@ -0,0 +1,122 @@
+import sqlite3
+import multiprocessing
+
+from datafix.core import Session, Validator, DataNode, SqliteResultCache, NodeState, FailureRecord
+from datafix.core import cache
+from datafix.nodes.collectors.paths_in_folder import PathsInFolder
+
+
+class ValidateNotEmpty(Validator):
+    def validate(self, data):
+        if data.stat().st_size == 0:
+            raise Exception(f"{data} is empty")
+
+
+def run_session(folder, db_path, **kwargs) -> Session:
+    """run a new session, like a new process would"""
+    session = Session()
+    session.result_cache = SqliteResultCache(db_path, **kwargs)
+    collector = PathsInFolder(parent=session)
+    collector.folder_path = folder
+    session.append(ValidateNotEmpty)
+    session.run(incremental=True)
+    session.result_cache.close()
+    session.result_cache = None
+    return session
+
+
+def test_persistent_cache(tmp_path):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    (folder / "a.txt").write_text("a")
+    (folder / "b.txt").write_text("")
+    db_path = tmp_path / "cache.db"
+
+    session = run_session(folder, db_path)
+    assert session.cached_result_count == 0
+
+    session = run_session(folder, db_path)
+    assert session.cached_result_count == 2
+    assert session.state == NodeState.FAIL
+    [failed] = session.group_failures()[f"{folder / 'b.txt'} is empty"]
+    assert failed.failure.exception_type == "Exception"
+
+
+def test_persistent_cache_payload(tmp_path):
+    db_path = tmp_path / "cache.db"
+    validator = ValidateNotEmpty()
+    data_node = DataNode(data="a")
+    data_node.fingerprint = "a"
+    result_cache = SqliteResultCache(db_path)
+    failure = FailureRecord("bad faces", "ValidationError", payload=(3, 8), truncated=True)
+    result_cache.set(validator, data_node, NodeState.FAIL, failure)
+    result_cache.close()
+
+    state, cached_failure = SqliteResultCache(db_path).get_result(validator, data_node)
+    assert state == NodeState.FAIL
+    assert cached_failure == FailureRecord("bad faces", "ValidationError", payload=[3, 8])  # JSON has no tuples
+    assert cached_failure.truncated
+
+
+def test_old_database(tmp_path):
+    """a database created before the failure columns existed is upgraded"""
+    db_path = tmp_path / "cache.db"
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE results (key TEXT PRIMARY KEY, state TEXT NOT NULL, time REAL NOT NULL)")
+    connection.commit()
+    connection.close()
+
+    validator = ValidateNotEmpty()
+    data_node = DataNode(data="a")
+    data_node.fingerprint = "a"
+    result_cache = SqliteResultCache(db_path)
+    result_cache.set(validator, data_node, NodeState.FAIL, FailureRecord("empty", "Exception"))
+    result_cache.close()
+    assert SqliteResultCache(db_path).get_result(validator, data_node)[1].message == "empty"
+
+
+def test_source_change_invalidates_cache(tmp_path, monkeypatch):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    (folder / "a.txt").write_text("a")
+    db_path = tmp_path / "cache.db"
+    run_session(folder, db_path)
+
+    monkeypatch.setitem(cache._source_hashes, ValidateNotEmpty, "edited source")
+    session = run_session(folder, db_path)
+    assert session.cached_result_count == 0
+
+
+def test_eviction(tmp_path):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    for name in "abcd":
+        (folder / f"{name}.txt").write_text(name)
+    db_path = tmp_path / "cache.db"
+
+    run_session(folder, db_path, max_entries=3)
+    assert len(SqliteResultCache(db_path)) == 3
+
+    # everything is older than max_age
+    assert len(SqliteResultCache(db_path, max_age=-1)) == 0
+
+
+def _run_session_in_process(folder, db_path):
+    run_session(folder, db_path)
+
+
+def test_concurrent_processes(tmp_path):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    for i in range(20):
+        (folder / f"{i}.txt").write_text(str(i))
+    db_path = tmp_path / "cache.db"
+
+    processes = [multiprocessing.Process(target=_run_session_in_process, args=(folder, db_path)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert len(SqliteResultCache(db_path)) == 20
@@ -0,0 +1,102 @@
+import pytest
+
+from datafix.core import Session, Collector, Validator, NodeState, ThreadExecutor, ResultNode, ResultList
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return list(range(10))
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+class ValidateSmall(Validator):
+    warning = True
+
+    def validate(self, data):
+        assert data < 5
+
+
+def run_session(columnar_results, executor=None):
+    session = Session()
+    session.columnar_results = columnar_results
+    session.executor = executor
+    collector = session.append(CollectNumbers)
+    session.append(ValidateEven)
+    session.append(ValidateSmall)
+    session.run()
+    return session, collector
+
+
+def summary(session, collector):
+    return (
+        session.state,
+        session.result_state_counts,
+        [(node.state, node.state_counts) for node in session.children],
+        [[(r.parent, r.data, r.state) for r in data_node.result_nodes] for data_node in collector.data_nodes],
+        [data_node.state for data_node in collector.data_nodes],
+    )
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=2)])
+def test_columnar_results_match_result_nodes(executor):
+    session, collector = run_session(columnar_results=False, executor=executor)
+    columnar_session, columnar_collector = run_session(columnar_results=True, executor=executor)
+
+    assert isinstance(columnar_session.children[1].children, ResultList)
+    assert len(columnar_session.result_store) == 20
+    # compare validators by index, they're different instances in each session
+    summary_ = summary(session, collector)
+    columnar_summary = summary(columnar_session, columnar_collector)
+    order = {node: index for index, node in enumerate(session.children)}
+    columnar_order = {node: index for index, node in enumerate(columnar_session.children)}
+    assert summary_[:3] == columnar_summary[:3]
+    assert summary_[4] == columnar_summary[4]
+    assert [[(order[p], d, s) for p, d, s in r] for r in summary_[3]] == [
+        [(columnar_order[p], d, s) for p, d, s in r] for r in columnar_summary[3]
+    ]
+
+
+def test_result_node_views():
+    session, collector = run_session(columnar_results=True)
+    validator = session.children[1]
+
+    # ResultNodes are created on access, and stay the same while in use
+    result_node = validator.children[1]
+    assert isinstance(result_node, ResultNode)
+    assert result_node is validator.children[1]
+    assert result_node.data == 1
+    assert result_node.state == NodeState.FAIL
+    assert validator["1"] is result_node
+    assert list(validator.children.iter_data_nodes(NodeState.FAIL)) == collector.data_nodes[1::2]
+
+    # changing a view changes the saved result
+    result_node.state = NodeState.SUCCEED
+    assert validator.state_counts == {NodeState.SUCCEED: 6, NodeState.FAIL: 4}
+    assert session.result_state_counts[NodeState.FAIL] == 4
+    assert collector.data_nodes[1].state == NodeState.SUCCEED
+
+    # deleting a view deletes the result, the next results move up
+    next_result_node = validator.children[2]
+    result_node.delete()
+    assert len(validator.children) == 9
+    assert validator.children[1] is next_result_node
+    assert [r.parent for r in collector.data_nodes[1].result_nodes] == [session.children[2]]
+
+
+def test_rerun_releases_results():
+    session, collector = run_session(columnar_results=True)
+    old_data_node = collector.data_nodes[0]
+    store = session.result_store
+    session.run()
+    id_count = len(store._data_nodes)
+    for _ in range(3):
+        session.run()
+
+    assert len(store) == 20
+    assert len(store._data_nodes) == id_count  # ids of deleted DataNodes are reused
+    assert old_data_node not in store
+    assert session.result_state_counts == {NodeState.SUCCEED: 10, NodeState.FAIL: 5, NodeState.WARNING: 5}
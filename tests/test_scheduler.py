@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, NodeState, ThreadExecutor, DependencyCycleError
+
+run_log = []  # names of the nodes, in the order they started running
+
+
+class CollectStrings(Collector):
+    data_type = str
+
+    def collect(self):
+        run_log.append(self.name)
+        return ["a", "b"]
+
+
+class CollectInts(Collector):
+    data_type = int
+
+    def collect(self):
+        run_log.append(self.name)
+        return [1, 2]
+
+
+class ValidateLogged(Validator):
+    delay = 0
+
+    def run(self):
+        run_log.append(self.name)
+        time.sleep(self.delay)
+        super().run()
+
+    def validate(self, data):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_run_log():
+    run_log.clear()
+
+
+def test_depends_on_validator():
+    session = Session()
+    session.append(CollectStrings)
+    second = ValidateLogged(parent=session, name="second")
+    first = ValidateLogged(parent=session, name="first")
+    second.depends_on = [first]
+    session.run()
+
+    assert run_log == ["CollectStrings", "first", "second"]
+    assert session.get_run_order() == [session.children[0], first, second]
+
+
+def test_depends_on_data_type():
+    """a validator that depends on a data type only waits for the collectors of that type"""
+    session = Session()
+    session.append(CollectInts)
+    validator = ValidateLogged(parent=session, name="validate ints")
+    validator.depends_on = [int]
+    session.append(CollectStrings)
+
+    assert session.get_dependencies()[validator] == [session.children[0]]
+    assert session.get_run_order() == [session.children[0], validator, session.children[2]]
+
+
+def test_dependency_cycle():
+    """cycles are raised before any node runs"""
+    session = Session()
+    collector = session.append(CollectStrings)
+    first = ValidateLogged(parent=session, name="first")
+    second = ValidateLogged(parent=session, name="second")
+    first.depends_on = ["second"]
+    second.depends_on = [ValidateLogged]
+
+    with pytest.raises(DependencyCycleError, match="first -> second -> first|second -> first -> second"):
+        session.run()
+    assert run_log == []
+    assert collector.state == NodeState.INIT
+
+
+def test_independent_validators_run_in_parallel():
+    session = Session()
+    session.executor = ThreadExecutor(max_workers=4)
+    session.append(CollectStrings)
+    validators = [ValidateLogged(parent=session, name=f"slow {i}") for i in range(3)]
+    for validator in validators:
+        validator.delay = 0.3
+    last = ValidateLogged(parent=session, name="last")
+    last.depends_on = validators
+
+    start = time.perf_counter()
+    session.run()
+    duration = time.perf_counter() - start
+
+    assert duration < 0.6 + 0.3  # the 3 slow validators ran at the same time, then the last one
+    assert run_log[0] == "CollectStrings"
+    assert run_log[-1] == "last"
+    assert session.state == NodeState.SUCCEED
+
+
+def test_invalid_dependency():
+    session = Session()
+    validator = ValidateLogged(parent=session)
+    validator.depends_on = [1]
+
+    with pytest.raises(TypeError):
+        session.run()
+    validator.depends_on = None  # the session stays active for other tests
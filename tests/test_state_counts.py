@@ -0,0 +1,79 @@
+from collections import Counter
+
+from datafix.core import Session, Collector, Validator, NodeState, ThreadExecutor, ResultNode
+
+
+class CollectNumbers(Collector):
+    def collect(self):
+        return list(range(100))
+
+
+class ValidateEven(Validator):
+    def validate(self, data):
+        assert data % 2 == 0
+
+
+class ValidateSmall(Validator):
+    warning = True
+
+    def validate(self, data):
+        assert data < 50
+
+
+def count_states(nodes):
+    return dict(Counter(node.state for node in nodes))
+
+
+def check_counts(session):
+    """the maintained counts match the counts of a full walk of the tree"""
+    result_nodes = []
+    for node in session.children:
+        assert node.state_counts == count_states(node.children)
+        result_nodes.extend(n for n in node.children if isinstance(n, ResultNode))
+    assert session.state_counts == count_states(session.children)
+    assert session.result_state_counts == count_states(result_nodes)
+
+
+def test_state_counts():
+    session = Session()
+    collector = session.append(CollectNumbers)
+    session.append(ValidateEven)
+    session.append(ValidateSmall)
+    session.run()
+    check_counts(session)
+
+    assert session.result_state_counts == {NodeState.SUCCEED: 100, NodeState.FAIL: 50, NodeState.WARNING: 50}
+    assert collector.state_counts == {NodeState.SUCCEED: 25, NodeState.WARNING: 25, NodeState.FAIL: 50}
+
+    # run again, the old results are removed from the data nodes and the counts
+    session.run()
+    check_counts(session)
+    assert sum(session.result_state_counts.values()) == 200
+    assert len(collector.data_nodes[0].result_nodes) == 2
+
+
+def test_state_counts_parallel():
+    session = Session()
+    session.executor = ThreadExecutor(max_workers=2)
+    session.append(CollectNumbers)
+    session.append(ValidateEven)
+    session.append(ValidateSmall)
+    session.run()
+    check_counts(session)
+
+
+def test_state_counts_change():
+    """changing the state of a result node updates its data node, and the counts"""
+    session = Session()
+    collector = session.append(CollectNumbers)
+    validator = session.append(ValidateEven)
+    session.run()
+
+    result_node = validator.children[1]
+    assert result_node.data_node.state == NodeState.FAIL
+    result_node.warning = True
+    assert result_node.data_node.state == NodeState.WARNING
+    result_node.state = NodeState.SUCCEED
+    assert result_node.data_node.state == NodeState.SUCCEED
+    check_counts(session)
+    assert collector.state_counts[NodeState.SUCCEED] == 51
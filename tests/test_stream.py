@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, DataNode, NodeState
+
+
+class CollectNumbers(Collector):
+    collected = []  # track the order of collection & validation
+
+    def collect(self):
+        for i in range(10):
+            self.collected.append(("collect", i))
+            yield i
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        yield from ["a", "b"]
+
+
+class ValidateEven(Validator):
+    required_type = int
+
+    def validate(self, data):
+        CollectNumbers.collected.append(("validate", data))
+        assert data % 2 == 0
+
+
+class ValidateString(Validator):
+    required_type = str
+
+    def validate(self, data):
+        assert isinstance(data, str)
+
+
+class ValidateSmall(Validator):
+    required_type = int
+    continue_on_fail = False
+
+    def validate(self, data):
+        assert data < 3, f"{data} is too big"
+
+
+def setup_session(stream):
+    session = Session()
+    session.stream = stream
+    session.stream_buffer_size = 2
+    session.append(CollectNumbers)
+    session.append(CollectStrings)
+    session.append(ValidateEven)
+    session.append(ValidateString)
+    return session
+
+
+def test_stream_matches_serial():
+    serial_session = setup_session(stream=False)
+    serial_session.run()
+    stream_session = setup_session(stream=True)
+    stream_session.run()
+
+    assert stream_session.state == serial_session.state == NodeState.FAIL
+    assert stream_session.report() == serial_session.report()
+
+
+def test_stream_validates_while_collecting():
+    CollectNumbers.collected = []
+    session = setup_session(stream=True)
+    session.run()
+
+    # with a buffer of 2, the collector can't be far ahead of the validator
+    first_validation = CollectNumbers.collected.index(("validate", 0))
+    assert first_validation < CollectNumbers.collected.index(("collect", 9))
+
+
+def test_stream_stop_on_fail():
+    session = Session()
+    session.stream = True
+    session.stream_buffer_size = 1
+    session.append(CollectNumbers)
+    validator = session.append(ValidateSmall)
+
+    with pytest.raises(AssertionError, match="3 is too big"):
+        session.run()
+    assert validator.state == NodeState.FAIL
+    assert [r.data for r in validator.children] == [0, 1, 2]
+
+
+class CollectNumbersInRun(Collector):
+    """a collector that overrides run() instead of collect()"""
+
+    def run(self):
+        self.delete_children()
+        for i in range(4):
+            DataNode(data=i, parent=self, name=i)
+
+
+class CollectBroken(Collector):
+    def collect(self):
+        yield 2
+        raise ValueError("can't collect")
+
+
+def test_stream_collector_overrides_run():
+    session = Session()
+    session.stream = True
+    collector = session.append(CollectNumbersInRun)
+    validator = session.append(ValidateEven)
+    session.run()
+
+    assert collector.state == NodeState.SUCCEED
+    assert validator.state == NodeState.FAIL
+    assert [r.data for r in validator.children] == [0, 1, 2, 3]
+
+
+class CollectThread(Collector):
+    """collects the thread it runs in"""
+
+    def collect(self):
+        for _ in range(4):
+            yield threading.current_thread()
+
+
+class ValidateThread(Validator):
+    required_type = threading.Thread
+
+    def validate(self, data):
+        assert data is not threading.current_thread()
+
+
+def test_stream_collects_in_calling_thread():
+    """collectors stay in the thread that runs the session, e.g. for DCC APIs that aren't thread safe"""
+    session = Session()
+    session.stream = True
+    collector = session.append(CollectThread)
+    validator = session.append(ValidateThread)
+    session.run()
+
+    assert [data_node.data for data_node in collector.data_nodes] == [threading.current_thread()] * 4
+    assert validator.state == NodeState.SUCCEED
+    assert len(validator.children) == 4
+
+
+def test_stream_fail_fast_on_collector_fail():
+    session = Session()
+    session.stream = True
+    session.fail_fast = True
+    collector = session.append(CollectBroken)
+    other_collector = session.append(CollectStrings)
+    session.append(ValidateEven)
+    session.run()
+
+    assert collector.state == NodeState.FAIL
+    assert session.stopped_by is collector
+    assert other_collector.state == NodeState.SKIPPED
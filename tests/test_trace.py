@@ -0,0 +1,76 @@
+import os
+import json
+
+import pytest
+
+from datafix.core import Session, Collector, Validator, Adapter, ThreadExecutor, ProcessExecutor
+
+
+class CollectStrings(Collector):
+    def collect(self):
+        return ["a", "bb", "ccc"]
+
+
+class StringToInt(Adapter):
+    input_types = [str]
+    type_output = int
+
+    def adapt(self, data):
+        return len(data)
+
+
+class ValidateLength(Validator):
+    required_type = int
+
+    def validate(self, data):
+        assert data < 3
+
+
+class ValidateString(Validator):
+    required_type = str
+
+    def validate(self, data):
+        assert data
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=2), ProcessExecutor(max_workers=2)])
+def test_trace(tmp_path, executor):
+    session = Session()
+    session.executor = executor
+    session.trace_path = str(tmp_path / "trace.json")
+    session.register_adapter(StringToInt())
+    session.append(CollectStrings)
+    session.append(ValidateLength)
+    session.append(ValidateString)
+    session.run()
+
+    with open(session.trace_path) as file:
+        trace = json.load(file)
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    categories = {}
+    for span in spans:
+        categories.setdefault(span["cat"], []).append(span)
+
+    assert [span["name"] for span in categories["collector"]] == ["CollectStrings"]
+    assert categories["collector"][0]["args"]["items"] == 3
+    assert all(span["ts"] >= 0 and span["dur"] >= 0 for span in spans)
+    # thread names are saved as metadata
+    thread_names = {(e["pid"], e["tid"]): e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "thread_name"}
+    assert (os.getpid(), categories["collector"][0]["tid"]) in thread_names
+
+    if executor and executor.processes:
+        # validators in worker processes get 1 span per job
+        assert {span["name"] for span in categories["worker"]} == {"ValidateLength", "ValidateString"}
+        assert all(span["pid"] != os.getpid() for span in categories["worker"])
+    else:
+        assert len(categories["validation"]) == 6  # a span per validated DataNode
+        assert sum(span["args"]["items"] for span in categories["adapter"]) == 3  # adapted in batches
+        assert {span["name"] for span in categories["validator"]} == {"ValidateLength", "ValidateString"}
+
+
+def test_no_trace_by_default():
+    session = Session()
+    session.append(CollectStrings)
+    session.run()
+    assert session.tracer is None
+    assert session.profile is not None